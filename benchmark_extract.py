@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK EXTRACTION - Analyse HTML des pages de résultats
+==========================================================
+Compare l'extraction historique (deux analyses html.parser + regex sur le
+HTML brut) et l'extraction en une passe (lxml, un seul parcours de l'arbre)
+sur un corpus de pages de résultats enregistrées, puis le coût par page des
+motifs email/téléphone: regex littérales contre bibliothèque partagée
+(utils.contact_patterns, motifs compilés et préfiltres), et enfin le débit
+de l'analyse déportée dans le pool de processus (utils.parse_pool).
+
+Corpus, au choix:
+- --corpus DIR: fichiers .html d'un dossier;
+- --from-cache: réponses enregistrées dans le cache HTTP (data/http_cache);
+- par défaut: pages de résultats synthétiques.
+
+Usage:
+    python benchmark_extract.py --pages 200
+    python benchmark_extract.py --from-cache --pages 500
+    python benchmark_extract.py --corpus data/pages --repeat 3
+    python benchmark_extract.py --workers 4
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from scrapers.rna_contact_scraper import RnaContactScraper
+from utils.contact_patterns import DIGIT_RUN_RE, OBFUSCATION_HINTS, find_emails, find_phones
+from utils.html_extract import extract_page
+from utils.http_cache import HttpResponseCache
+from utils.parse_pool import ParsePool
+from utils.perf import peak_rss_mb
+
+BENCH_ASSOCIATION = {'nom': 'Club de Football de Bourg', 'ville': 'Bourg-en-Bresse'}
+
+
+def synthetic_result_page(index, rng):
+    """Page de résultats au format moteur: scripts, styles, résultats avec liens et extraits"""
+    # Une page sur quatre sans aucun contact (le préfiltre l'écarte)
+    contact_free = index % 4 == 3
+    results = []
+    for position in range(10):
+        slug = rng.choice(['club-football-bourg', 'mairie-bourg', 'helloasso.com/associations/cfb',
+                           'annuaire-asso', 'sport-ain'])
+        snippets = [
+            "Le club accueille les jeunes de 6 à 18 ans. Entraînements le mercredi.",
+            "Horaires d'ouverture du lundi au vendredi, 9h - 12h.",
+        ]
+        if not contact_free:
+            snippets += [
+                f"Contact: contact{index}-{position}@club-football-bourg.fr, Tél. 04 74 {position:02d} 12 34.",
+                f"Écrivez au secrétariat: secretariat{position} [at] mairie-bourg (dot) fr",
+            ]
+        snippet = rng.choice(snippets)
+        results.append(
+            f'<div class="g"><a href="/url?q=https://www.{slug}.fr/page{position}&sa=U">'
+            f'<h3>Résultat {position} - Club de Football</h3></a>'
+            f'<div class="s"><span>{snippet}</span></div>'
+            f'<a href="https://www.facebook.com/clubfoot{index % 7}">Facebook</a></div>'
+        )
+    script = "var data = {" + ",".join(f'"k{i}": "{"x" * 40}"' for i in range(300)) + "};"
+    return (f"<!DOCTYPE html><html><head><title>résultats</title><style>.g{{margin:0}}</style>"
+            f"<script>{script}</script></head><body><div id='search'>{''.join(results)}</div>"
+            f"<!-- fin des résultats --></body></html>")
+
+
+def load_corpus(args):
+    if args.corpus:
+        paths = sorted(glob.glob(os.path.join(args.corpus, '*.html')))[:args.pages]
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+        return pages, f"{len(pages)} pages de {args.corpus}"
+
+    if args.from_cache:
+        cache = HttpResponseCache(replay=True)
+        pages = [cached[1] for cached in map(cache.get, cache.cached_urls(args.pages)) if cached]
+        return pages, f"{len(pages)} pages du cache HTTP ({cache.cache_dir})"
+
+    rng = random.Random(42)
+    return [synthetic_result_page(i, rng) for i in range(args.pages)], f"{args.pages} pages synthétiques"
+
+
+def bench(extract, pages, repeat):
+    """Durée de la meilleure passe complète sur le corpus, et les résultats"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [extract(page, BENCH_ASSOCIATION, 'bench') for page in pages]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+
+def literal_patterns(text):
+    """Ancienne extraction des finders: motifs littéraux, recompilés à la demande, sans préfiltre"""
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    phones = []
+    for pattern in [r'0[1-9](?:[.\s-]?\d{2}){4}', r'\+33[.\s-]?[1-9](?:[.\s-]?\d{2}){4}',
+                    r'(?:Tel|Tél|Téléphone|Phone)[\s:]*0[1-9](?:[.\s-]?\d{2}){4}']:
+        phones += re.findall(pattern, text)
+    return emails, phones
+
+
+def shared_patterns(text):
+    return find_emails(text), find_phones(text)
+
+
+def bench_patterns(extract, texts, repeat):
+    """Meilleure passe des motifs sur les textes: durée, emails et téléphones trouvés"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [extract(text) for text in texts]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, sum(len(r[0]) for r in results), sum(len(r[1]) for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'extraction HTML des pages de résultats")
+    parser.add_argument('--corpus', help="dossier de pages .html enregistrées")
+    parser.add_argument('--from-cache', action='store_true', help="pages du cache HTTP (data/http_cache)")
+    parser.add_argument('--pages', type=int, default=200, help="nombre maximal de pages")
+    parser.add_argument('--repeat', type=int, default=3, help="passes par méthode (meilleure retenue)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processus du pool d'analyse (défaut: nombre de CPU - 1)")
+    args = parser.parse_args()
+
+    pages, label = load_corpus(args)
+    if not pages:
+        print("❌ Corpus vide")
+        sys.exit(1)
+    size_mb = sum(len(page.encode('utf-8')) for page in pages) / 1024 / 1024
+
+    scraper = RnaContactScraper()
+    print("🔬 BENCHMARK EXTRACTION HTML")
+    print("=" * 60)
+    print(f"📄 Corpus: {label}, {size_mb:.1f} Mo")
+
+    reference, reference_time = bench(scraper._extract_contacts_from_html_reference, pages, args.repeat)
+    print(f"🐢 Historique (2 x html.parser + regex): {reference_time:.2f}s "
+          f"({len(pages) / reference_time:,.0f} pages/s, {size_mb / reference_time:.1f} Mo/s)")
+
+    single, single_time = bench(scraper._extract_contacts_from_html, pages, args.repeat)
+    print(f"⚡ Une passe (lxml): {single_time:.2f}s "
+          f"({len(pages) / single_time:,.0f} pages/s, {size_mb / single_time:.1f} Mo/s)")
+
+    fields = ['email', 'phone', 'website', 'facebook']
+    same = {field: sum((a or {}).get(field, '') == (b or {}).get(field, '') for a, b in zip(reference, single))
+            for field in fields}
+
+    print(f"\n📊 RÉSULTATS:")
+    print(f"  • Accélération: x{reference_time / single_time:.1f}")
+    print(f"  • Contacts trouvés: historique {sum(1 for r in reference if r)}, une passe {sum(1 for r in single if r)}")
+    for field in fields:
+        print(f"  • {field} identique: {same[field]}/{len(pages)}")
+
+    # Coût des motifs seuls, sur le texte visible de chaque page (ce que reçoivent les finders)
+    texts = [extract_page(page).text for page in pages]
+    literal_time, literal_emails, literal_phones = bench_patterns(literal_patterns, texts, args.repeat)
+    shared_time, shared_emails, shared_phones = bench_patterns(shared_patterns, texts, args.repeat)
+    no_email = sum(1 for text in texts
+                   if '@' not in text and '%40' not in text and not any(h in text for h in OBFUSCATION_HINTS))
+    no_phone = sum(1 for text in texts if not DIGIT_RUN_RE.search(text))
+
+    print(f"\n🔎 MOTIFS EMAIL/TÉLÉPHONE (par page):")
+    print(f"  • Regex littérales: {literal_time / len(texts) * 1e6:.1f} µs/page "
+          f"({literal_emails} emails, {literal_phones} téléphones)")
+    print(f"  • contact_patterns: {shared_time / len(texts) * 1e6:.1f} µs/page "
+          f"({shared_emails} emails dont formes masquées, {shared_phones} téléphones)")
+    print(f"  • Pages écartées par le préfiltre: email {no_email}/{len(texts)}, téléphone {no_phone}/{len(texts)}")
+
+    # Analyse déportée: pages déposées dans la file bornée, résultats rendus au fil de l'eau
+    # Pool réel par défaut (PARSE_WORKERS vaut 0): mesure du gain avant de l'activer
+    workers = max(1, (os.cpu_count() or 2) - 1) if args.workers is None else args.workers
+    pool = ParsePool(workers=workers)
+    started = time.perf_counter()
+    pooled = list(pool.map(extract_page, pages))
+    pool_time = time.perf_counter() - started
+    print(f"\n⚙️ POOL DE PROCESSUS ({pool.workers} workers): {pool_time:.2f}s "
+          f"({len(pages) / pool_time:,.0f} pages/s, x{single_time / pool_time:.1f} contre une passe sur place)")
+    print(f"  • Emails identiques: {sum(a.emails == b.emails for a, b in zip(pooled, map(extract_page, pages)))}/{len(pages)}")
+    pool.report()
+    pool.close()
+    print(f"\n  • Pic RSS: {peak_rss_mb():.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK REJEU - Extraction et scoring sur un corpus enregistré
+================================================================
+Rejoue une archive de pages (PageRecorder) dans les finders, sans réseau,
+et mesure pages/s, emails trouvés et précision sur un sous-ensemble
+étiqueté (email attendu par association).
+
+Enregistrer un corpus pendant un lancement réel:
+    PAGE_ARCHIVE_RECORD=data/archives/run.jsonl.gz python smart_contact_finder.py
+
+Rejouer:
+    python benchmark_replay.py --archive data/archives/run.jsonl.gz --labels data/labels.csv
+    python benchmark_replay.py --archive data/archives/run.jsonl.gz --associations data/rna.csv --finder smart
+
+Étiquettes: CSV avec colonnes nom (ou titre), ville (ou libcom) et email
+(vide: aucun email attendu). Sans --associations, les associations
+étiquetées sont rejouées.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from modern_association_finder import ModernAssociationFinder
+from scrapers.rna_contact_scraper import RnaContactScraper
+from smart_contact_finder import SmartContactFinder
+from utils.async_search import AsyncSearchEngine
+from utils.mairie_index import MairieIndex
+from utils.page_archive import PageArchive
+from utils.perf import peak_rss_mb
+from utils.query_planner import QueryPlanner, association_sector
+from utils.site_crawler import SiteCrawler
+
+FINDERS = ['rna', 'smart', 'modern']
+
+
+def load_rows(path):
+    """Associations d'un CSV: colonnes RNA (titre, libcom) ou courtes (nom, ville)"""
+    df = pd.read_csv(path, dtype=str).fillna('')
+    rows = []
+    for row in df.to_dict('records'):
+        nom = row.get('nom') or row.get('titre', '')
+        ville = row.get('ville') or row.get('libcom', '')
+        if nom and ville:
+            rows.append({**row, 'nom': nom, 'ville': ville})
+    return rows
+
+
+def label_key(row):
+    return (row['nom'].strip().lower(), row['ville'].strip().lower())
+
+
+def build_finder(name, archive, work_dir):
+    """Finder branché sur l'archive; statistiques de requêtes et index mairie dans un dossier temporaire"""
+    planner_db = os.path.join(work_dir, f"query_stats_{name}.db")
+    if name == 'rna':
+        finder = RnaContactScraper(adaptive_queries=False)
+        finder.query_planner = QueryPlanner('rna_contact_scraper', db_path=planner_db, adaptive=False)
+        search = lambda row: finder.search_association_contacts(
+            {**row, 'secteur_nom': association_sector(row)}
+        ).get('email_principal') or None
+    elif name == 'smart':
+        finder = SmartContactFinder(adaptive_queries=False)
+        finder.query_planner = QueryPlanner('smart_finder', db_path=planner_db, adaptive=False)
+        search = lambda row: finder.smart_search_contact(row['nom'], row['ville'], association_sector(row))
+    else:
+        finder = ModernAssociationFinder(adaptive_queries=False)
+        finder.query_planner = QueryPlanner('modern_finder', db_path=planner_db, adaptive=False)
+        finder.mairie_index = MairieIndex(db_path=os.path.join(work_dir, "mairie_index.db"))
+        search = lambda row: finder.smart_search_contact(
+            row['nom'], row['ville'], row.get('date_publi', ''), row.get('adrs_codeinsee', ''),
+            association_sector(row)
+        )[0]
+    # Rejeu pur: ni cache HTTP ni politesse, toute page absente de l'archive est un échec
+    finder.engine = AsyncSearchEngine(use_cache=False, archive=archive, recorder=False)
+    if name == 'rna':
+        # Exploration des sites et robots.txt sur le moteur de rejeu (cache robots.txt neuf)
+        finder.site_crawler = SiteCrawler(finder.engine, finder.parser)
+    return finder, search
+
+
+def replay(name, archive, rows, labels, work_dir):
+    """Rejouer les associations dans un finder: métriques du lancement"""
+    finder, search = build_finder(name, archive, work_dir)
+    served_before = archive.stats['servies']
+    results = []
+    started = time.perf_counter()
+    # Sorties des finders masquées: seul le rapport compte
+    with contextlib.redirect_stdout(io.StringIO()):
+        for row in rows:
+            try:
+                results.append((row, search(row)))
+            except Exception:
+                results.append((row, None))
+    elapsed = time.perf_counter() - started
+    pages = archive.stats['servies'] - served_before
+
+    found = [(row, email) for row, email in results if email]
+    labeled = [(row, email, labels[label_key(row)]) for row, email in results if label_key(row) in labels]
+    answered = [(email, expected) for _, email, expected in labeled if email]
+    correct = sum(1 for email, expected in answered if expected and email.lower() == expected.lower())
+    expected_count = sum(1 for _, _, expected in labeled if expected)
+    return {
+        'associations': len(rows), 'pages': pages, 'elapsed': elapsed, 'emails': len(found),
+        'labeled': len(labeled), 'answered': len(answered), 'correct': correct, 'expected': expected_count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne des finders sur une archive de pages")
+    parser.add_argument('--archive', required=True, help="archive .jsonl.gz enregistrée (PAGE_ARCHIVE_RECORD)")
+    parser.add_argument('--associations', help="CSV des associations à rejouer (défaut: les étiquetées)")
+    parser.add_argument('--labels', help="CSV étiqueté: nom, ville, email attendu")
+    parser.add_argument('--finder', choices=FINDERS + ['all'], default='all', help="finder à rejouer")
+    parser.add_argument('--limit', type=int, default=None, help="nombre maximal d'associations")
+    args = parser.parse_args()
+
+    if not args.associations and not args.labels:
+        parser.error("--associations ou --labels requis")
+
+    archive = PageArchive(args.archive)
+    labels = {label_key(row): row.get('email', '').strip() for row in load_rows(args.labels)} if args.labels else {}
+    rows = load_rows(args.associations or args.labels)[:args.limit]
+
+    print("🔬 BENCHMARK REJEU (hors ligne)")
+    print("=" * 60)
+    print(f"📼 Archive: {len(archive)} pages ({args.archive})")
+    print(f"📄 Associations: {len(rows)}, dont {sum(label_key(row) in labels for row in rows)} étiquetées")
+
+    finders = FINDERS if args.finder == 'all' else [args.finder]
+    with tempfile.TemporaryDirectory() as work_dir:
+        metrics = {name: replay(name, archive, rows, labels, work_dir) for name in finders}
+
+    print(f"\n📊 RÉSULTATS:")
+    for name, m in metrics.items():
+        pages_per_s = m['pages'] / m['elapsed'] if m['elapsed'] else 0.0
+        print(f"  • {name}: {m['pages']} pages en {m['elapsed']:.2f}s ({pages_per_s:,.0f} pages/s), "
+              f"{m['emails']}/{m['associations']} associations avec email")
+        if m['labeled']:
+            precision = m['correct'] / m['answered'] if m['answered'] else 0.0
+            recall = m['correct'] / m['expected'] if m['expected'] else 0.0
+            print(f"    ↳ étiquetées: précision {precision:.0%} ({m['correct']}/{m['answered']}), "
+                  f"rappel {recall:.0%} ({m['correct']}/{m['expected']})")
+    archive.report()
+    print(f"  • Pic RSS: {peak_rss_mb():.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK RNA - Mesures de performance du pipeline RNA
+======================================================
+Jeux de données synthétiques à l'échelle d'un département (ou d'un fichier réel)
+
+Usage:
+    python benchmark_rna.py clean --rows 1000000
+    python benchmark_rna.py clean --file data/rna_import_20250701_dpt_01.csv
+    python benchmark_rna.py modern --rows 200000
+    python benchmark_rna.py memory --rows 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from modern_association_finder import ModernAssociationFinder
+from scrapers.rna_processor import RnaAssociationProcessor
+from utils.perf import frame_memory_bytes, peak_rss_mb, records_memory_bytes
+
+# Valeurs représentatives du fichier RNA (département 01)
+SAMPLE_TITLES = [
+    "ASSOCIATION SPORTIVE DE {commune}",
+    "Club de pétanque de {commune}",
+    "SOCIETE DE CHASSE DE {commune}",
+    "Comité des fêtes de {commune}",
+    "AMICALE DES PECHEURS",
+    "Les Amis de l'École de {commune}",
+    "VOIR NUMERO 123 - AMICALE DES ANCIENS",
+    "VOIR - 456 - CLUB DE {commune}",
+    "ERREUR D'ENREGISTREMENT",
+    "ASSOCIATION DISSOUTE",
+    "ab",
+]
+SAMPLE_COMMUNES = [
+    ("Bourg-en-Bresse", "01053", "01000"),
+    ("Oyonnax", "01283", "01100"),
+    ("Ambérieu-en-Bugey", "01004", "01500"),
+    ("Belley", "01034", "01300"),
+    ("Gex", "01173", "01170"),
+]
+SAMPLE_CODES = ['7000', '9030', '11000', '11035', '13005', '38105', '99999', '']
+SAMPLE_DATES = ['01/15/1985', '2005-03-02', '0001-01-01', '12/31/2012', '2019-07-14', '']
+
+
+def generate_synthetic_rna(rows, seed=42):
+    """Générer un DataFrame au format du fichier RNA (colonnes texte)"""
+    rng = np.random.default_rng(seed)
+    communes = rng.integers(0, len(SAMPLE_COMMUNES), rows)
+    titles = rng.integers(0, len(SAMPLE_TITLES), rows)
+
+    commune_names = np.array([c[0] for c in SAMPLE_COMMUNES], dtype=object)
+    insee_codes = np.array([c[1] for c in SAMPLE_COMMUNES], dtype=object)
+    postal_codes = np.array([c[2] for c in SAMPLE_COMMUNES], dtype=object)
+
+    titre = [
+        SAMPLE_TITLES[t].format(commune=SAMPLE_COMMUNES[c][0].upper())
+        for t, c in zip(titles, communes)
+    ]
+    objet_lengths = rng.integers(0, 60, rows)
+
+    return pd.DataFrame({
+        'id': [f"W{i:09d}" for i in range(rows)],
+        'date_publi': rng.choice(SAMPLE_DATES, rows),
+        'nature': 'D',
+        'titre': titre,
+        'objet': ["activités " * n for n in objet_lengths],
+        'objet_social1': rng.choice(SAMPLE_CODES, rows),
+        'objet_social2': rng.choice(SAMPLE_CODES, rows),
+        'adr1': '1 rue de la Mairie',
+        'adrs_codepostal': postal_codes[communes],
+        'libcom': commune_names[communes],
+        'adrs_codeinsee': insee_codes[communes],
+        'position': rng.choice(['A', 'A', 'A', 'D'], rows),
+        'maj_time': rng.choice(['2020-01-01', '2024-05-06'], rows),
+    }).replace('', np.nan)
+
+
+def load_benchmark_frame(args):
+    """Charger le fichier demandé ou générer un jeu synthétique"""
+    if args.file:
+        df = pd.read_csv(args.file, encoding='utf-8', dtype=str)
+        print(f"📄 Fichier: {args.file} ({len(df)} lignes)")
+    else:
+        df = generate_synthetic_rna(args.rows)
+        print(f"🧪 Jeu synthétique: {len(df)} lignes")
+    return df
+
+
+def timed(func, *args, **kwargs):
+    """Exécuter func et renvoyer (résultat, durée en secondes)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _comparable(records):
+    """Enregistrements sans l'horodatage d'extraction"""
+    return [{k: v for k, v in r.items() if k != 'date_extraction'} for r in records]
+
+
+def bench_clean(args):
+    """Comparer nettoyage ligne par ligne (iterrows) et nettoyage vectorisé"""
+    print("🧹 BENCHMARK NETTOYAGE RNA")
+    print("=" * 50)
+
+    processor = RnaAssociationProcessor()
+    df = load_benchmark_frame(args)
+
+    frame, frame_time = timed(processor.clean_rna_dataframe, df)
+    print(f"⚡ Vectorisé (DataFrame): {frame_time:.2f}s ({len(df) / frame_time:,.0f} lignes/s)")
+    vectorized, vectorized_time = timed(processor.clean_rna_data, df, verbose=False)
+    print(f"⚡ Vectorisé (liste de dicts): {vectorized_time:.2f}s ({len(df) / vectorized_time:,.0f} lignes/s)")
+
+    # La référence iterrows est lente: la mesurer sur un sous-ensemble si demandé
+    reference_df = df.head(args.reference_rows) if args.reference_rows else df
+    rowwise, rowwise_time = timed(processor.clean_rna_data_rowwise, reference_df)
+    rowwise_rate = len(reference_df) / rowwise_time
+    print(f"🐢 iterrows: {rowwise_time:.2f}s sur {len(reference_df)} lignes ({rowwise_rate:,.0f} lignes/s)")
+
+    vectorized_subset = processor.clean_rna_data(reference_df, verbose=False)
+    identical = _comparable(vectorized_subset) == _comparable(rowwise)
+
+    print(f"\n📊 RÉSULTATS:")
+    print(f"  • Associations conservées: {len(vectorized)}")
+    print(f"  • Accélération DataFrame: x{(len(df) / frame_time) / rowwise_rate:.1f}")
+    print(f"  • Accélération liste de dicts: x{(len(df) / vectorized_time) / rowwise_rate:.1f}")
+    print(f"  • Enregistrements identiques: {'✅ oui' if identical else '❌ NON'}")
+    print(f"  • Pic RSS: {peak_rss_mb():.1f} Mo")
+
+    return identical
+
+
+def bench_modern(args):
+    """Comparer le filtre moderne iterrows + strptime et le filtre vectorisé"""
+    print("📅 BENCHMARK FILTRE ASSOCIATIONS MODERNES")
+    print("=" * 50)
+
+    finder = ModernAssociationFinder()
+    df = load_benchmark_frame(args)
+
+    modern, modern_time = timed(finder.filter_modern_associations, df)
+    print(f"⚡ Vectorisé: {modern_time:.2f}s ({len(df) / modern_time:,.0f} lignes/s)")
+
+    reference_df = df.head(args.reference_rows) if args.reference_rows else df
+    rowwise, rowwise_time = timed(finder.load_modern_associations_rowwise, reference_df)
+    rowwise_rate = len(reference_df) / rowwise_time
+    print(f"🐢 iterrows: {rowwise_time:.2f}s sur {len(reference_df)} lignes ({rowwise_rate:,.0f} lignes/s)")
+
+    subset = finder.filter_modern_associations(reference_df)
+    identical = subset.index.equals(rowwise.index) and subset['date_parsed'].equals(rowwise['date_parsed'])
+
+    print(f"\n📊 RÉSULTATS:")
+    print(f"  • Associations modernes: {len(modern)} / {len(df)}")
+    print(f"  • Accélération: x{(len(df) / modern_time) / rowwise_rate:.1f}")
+    print(f"  • Sous-ensemble et ordre identiques: {'✅ oui' if identical else '❌ NON'}")
+    print(f"  • Pic RSS: {peak_rss_mb():.1f} Mo")
+
+    return identical
+
+
+def bench_memory(args):
+    """Octets par association: liste de dicts historique vs représentation compacte"""
+    print("💾 BENCHMARK MÉMOIRE ASSOCIATIONS")
+    print("=" * 50)
+
+    processor = RnaAssociationProcessor()
+    df = load_benchmark_frame(args)
+
+    # Historique: un dict par association, chaînes recréées à chaque ligne
+    reference_df = df.head(args.reference_rows) if args.reference_rows else df
+    rowwise = processor.clean_rna_data_rowwise(reference_df)
+    rowwise_bytes = records_memory_bytes(rowwise) / len(rowwise)
+
+    compact = processor.clean_rna_dataframe(df)
+    records = processor._frame_to_records(compact)
+    records_bytes = records_memory_bytes(records) / len(records)
+    frame_bytes = frame_memory_bytes(compact) / len(compact)
+    plain_bytes = frame_memory_bytes(compact.astype(object)) / len(compact)
+
+    print(f"\n📊 OCTETS PAR ASSOCIATION ({len(compact)} associations):")
+    print(f"  • Liste de dicts (iterrows): {rowwise_bytes:,.0f}")
+    print(f"  • Liste de dicts (chaînes partagées): {records_bytes:,.0f} (x{rowwise_bytes / records_bytes:.1f})")
+    print(f"  • DataFrame sans catégories: {plain_bytes:,.0f}")
+    print(f"  • DataFrame catégoriel: {frame_bytes:,.0f} (x{rowwise_bytes / frame_bytes:.1f})")
+    print(f"\n🗺️ Projection 1 million d'associations:")
+    print(f"  • Liste de dicts (iterrows): {rowwise_bytes * 1e6 / 1024 ** 3:.2f} Go")
+    print(f"  • Liste de dicts (chaînes partagées): {records_bytes * 1e6 / 1024 ** 3:.2f} Go")
+    print(f"  • DataFrame catégoriel: {frame_bytes * 1e6 / 1024 ** 3:.2f} Go")
+    if not args.file:
+        print("  ⚠️ Jeu synthétique: noms et objets très répétés, mesurer aussi avec --file")
+    print(f"  • Pic RSS: {peak_rss_mb():.1f} Mo")
+
+    return True
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline RNA")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    clean_parser = subparsers.add_parser('clean', help="nettoyage iterrows vs vectorisé")
+    clean_parser.add_argument('--rows', type=int, default=200000, help="taille du jeu synthétique")
+    clean_parser.add_argument('--file', help="fichier RNA réel à utiliser")
+    clean_parser.add_argument('--reference-rows', type=int, default=0,
+                              help="limiter la référence iterrows à N lignes (0 = tout)")
+    clean_parser.set_defaults(func=bench_clean)
+
+    modern_parser = subparsers.add_parser('modern', help="filtre associations modernes iterrows vs vectorisé")
+    modern_parser.add_argument('--rows', type=int, default=200000, help="taille du jeu synthétique")
+    modern_parser.add_argument('--file', help="fichier RNA réel à utiliser")
+    modern_parser.add_argument('--reference-rows', type=int, default=0,
+                               help="limiter la référence iterrows à N lignes (0 = tout)")
+    modern_parser.set_defaults(func=bench_modern)
+
+    memory_parser = subparsers.add_parser('memory', help="octets par association avant/après compactage")
+    memory_parser.add_argument('--rows', type=int, default=200000, help="taille du jeu synthétique")
+    memory_parser.add_argument('--file', help="fichier RNA réel à utiliser")
+    memory_parser.add_argument('--reference-rows', type=int, default=50000,
+                               help="limiter la référence iterrows à N lignes (0 = tout)")
+    memory_parser.set_defaults(func=bench_memory)
+
+    args = parser.parse_args()
+    ok = args.func(args)
+    sys.exit(0 if ok is not False else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK SCORING - Emails candidats d'une page de résultats
+============================================================
+Compare le scoring historique de SmartContactFinder (un appel par email,
+nom et ville re-découpés, texte de la page remis en minuscules et
+re-parcouru à chaque candidat) au scoring par lots (utils.email_scoring:
+profil de l'association précalculé, page analysée une fois).
+
+Usage:
+    python benchmark_scoring.py --pages 200 --candidates 40
+    python benchmark_scoring.py --page-kb 200 --candidates 100
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from smart_contact_finder import SmartContactFinder
+from utils.email_scoring import EmailScorer
+from utils.perf import peak_rss_mb
+
+NOMS = ['Club de Football de Bourg', 'Amicale des Pecheurs du Lac', 'Association Culture et Loisirs',
+        'Les Amis du Theatre de Nantua']
+VILLES = ['Bourg-en-Bresse', 'Oyonnax', 'Saint Genis Pouilly', 'Nantua']
+LOCAL_PARTS = ['contact', 'info', 'secretaire', 'president', 'asso.foot', 'club', 'jean.dupont', 'accueil']
+DOMAINS = ['mairie-oyonnax.fr', 'bourgenbresse.fr', 'club-football.asso.fr', 'orange.fr', 'cc-nantua.fr',
+           'amis-theatre.org', 'agglo.net', 'culture.com', 'wanadoo.fr']
+
+
+def synthetic_page(rng, page_kb, candidates):
+    """Texte de page (~page_kb Ko) et ses emails candidats"""
+    emails = [f"{rng.choice(LOCAL_PARTS)}{i}@{rng.choice(DOMAINS)}" for i in range(candidates)]
+    words = ['association', 'sport', 'mercredi', 'horaires', 'commune', 'inscription', 'adhésion', 'Bresse']
+    filler = ' '.join(rng.choice(words) for _ in range(page_kb * 1024 // 9))
+    return filler + ' ' + ' '.join(emails), emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du scoring des emails candidats")
+    parser.add_argument('--pages', type=int, default=200, help="nombre de pages")
+    parser.add_argument('--candidates', type=int, default=40, help="emails candidats par page")
+    parser.add_argument('--page-kb', type=int, default=50, help="taille du texte de chaque page (Ko)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    pages = [(rng.choice(NOMS), rng.choice(VILLES), *synthetic_page(rng, args.page_kb, args.candidates))
+             for _ in range(args.pages)]
+    total = args.pages * args.candidates
+
+    finder = SmartContactFinder()
+    scorer = EmailScorer('smart')
+
+    print("🔬 BENCHMARK SCORING EMAILS")
+    print("=" * 60)
+    print(f"📄 {args.pages} pages de {args.page_kb} Ko, {args.candidates} candidats/page ({total} scores)")
+
+    started = time.perf_counter()
+    reference = [[finder.score_email_reference(email, nom, ville, text) for email in emails]
+                 for nom, ville, text, emails in pages]
+    reference_time = time.perf_counter() - started
+    print(f"🐢 Historique (un appel par email): {reference_time:.2f}s "
+          f"({reference_time / total * 1e6:.1f} µs/candidat)")
+
+    started = time.perf_counter()
+    batched = [scorer.score_batch(nom, ville, [(email, text) for email in emails])
+               for nom, ville, text, emails in pages]
+    batched_time = time.perf_counter() - started
+    print(f"⚡ Par lots (profil précalculé): {batched_time:.2f}s "
+          f"({batched_time / total * 1e6:.1f} µs/candidat)")
+
+    same = sum(a == b for page_a, page_b in zip(reference, batched) for a, b in zip(page_a, page_b))
+
+    print(f"\n📊 RÉSULTATS:")
+    print(f"  • Accélération: x{reference_time / batched_time:.1f}")
+    print(f"  • Scores identiques: {same}/{total}")
+    print(f"  • Pic RSS: {peak_rss_mb():.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK RECHERCHE - Moteur asyncio contre serveurs HTTP locaux
+================================================================
+Chaque "hôte" est un serveur local (port distinct) avec une latence simulée.
+Mesure le débit de recherche séquentiel (ancienne boucle avec time.sleep)
+et celui du moteur asyncio selon le nombre d'hôtes distincts.
+
+Usage:
+    python benchmark_search.py --associations 40 --hosts 1 2 4
+    python benchmark_search.py --latency 0.2 --rate 4 --concurrency 2
+    python benchmark_search.py --cache   # relance identique servie par le cache disque
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.async_search import AsyncSearchEngine
+from utils.http_cache import HttpResponseCache
+
+
+def start_stub_hosts(count, latency):
+    """Démarrer `count` serveurs locaux; chaque page contient un email"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = f"<html><body>contact: asso{self.server.server_port}@example-asso.fr</body></html>".encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def association_urls(index, hosts, queries):
+    """Requêtes d'une association, réparties entre les hôtes (comme google/bing)"""
+    return [
+        f"http://{hosts[(index + q) % len(hosts)]}/search?q=asso{index}-{q}"
+        for q in range(queries)
+    ]
+
+
+def bench_sequential(hosts, associations, queries, delay):
+    """Ancienne boucle: une association, une requête à la fois, pause entre requêtes"""
+    session = requests.Session()
+    started = time.perf_counter()
+    for index in range(associations):
+        for url in association_urls(index, hosts, queries):
+            session.get(url, timeout=15)
+            time.sleep(delay)
+    return time.perf_counter() - started
+
+
+def bench_engine(hosts, associations, queries, rate, concurrency, max_in_flight, cache=None):
+    limits = {host: {'rate': rate, 'concurrency': concurrency} for host in hosts}
+    engine = AsyncSearchEngine(host_limits=limits, max_in_flight=max_in_flight,
+                               cache=cache, use_cache=cache is not None)
+
+    def search(index):
+        return [engine.get(url).status_code for url in association_urls(index, hosts, queries)]
+
+    results = engine.run(range(associations), search)
+    failed = sum(1 for statuses in results for status in statuses if status != 200)
+    return engine, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur de recherche asyncio")
+    parser.add_argument('--associations', type=int, default=40)
+    parser.add_argument('--queries', type=int, default=4, help="requêtes par association")
+    parser.add_argument('--hosts', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--latency', type=float, default=0.1, help="latence simulée par requête (s)")
+    parser.add_argument('--rate', type=float, default=5.0, help="requêtes/s autorisées par hôte")
+    parser.add_argument('--concurrency', type=int, default=2, help="requêtes simultanées par hôte")
+    parser.add_argument('--max-in-flight', type=int, default=16)
+    parser.add_argument('--cache', action='store_true',
+                        help="mesurer une relance servie par un cache disque temporaire")
+    parser.add_argument('--sequential-delay', type=float, default=0.2,
+                        help="pause de l'ancienne boucle (0 pour ignorer la mesure séquentielle)")
+    args = parser.parse_args()
+
+    servers = start_stub_hosts(max(args.hosts), args.latency)
+    all_hosts = [f"127.0.0.1:{server.server_port}" for server in servers]
+    total_requests = args.associations * args.queries
+
+    print("🔬 BENCHMARK MOTEUR DE RECHERCHE")
+    print("=" * 60)
+    print(f"📊 {args.associations} associations x {args.queries} requêtes = {total_requests} requêtes")
+    print(f"🌐 Latence {args.latency * 1000:.0f} ms, limite {args.rate}/s et {args.concurrency} simultanées par hôte")
+
+    if args.sequential_delay > 0:
+        elapsed = bench_sequential(all_hosts[:max(args.hosts)], args.associations, args.queries, args.sequential_delay)
+        print(f"\n🐢 Séquentiel (pause {args.sequential_delay}s): {elapsed:.2f}s "
+              f"({total_requests / elapsed:.1f} requêtes/s)")
+
+    for count in args.hosts:
+        engine, failed = bench_engine(all_hosts[:count], args.associations, args.queries,
+                                      args.rate, args.concurrency, args.max_in_flight)
+        ceiling = count * args.rate
+        print(f"\n⚡ Asyncio, {count} hôte(s): {engine.elapsed:.2f}s "
+              f"({total_requests / engine.elapsed:.1f} requêtes/s, plafond {ceiling:.0f}/s), {failed} échecs")
+        engine.report()
+
+    if args.cache:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpResponseCache(cache_dir=cache_dir)
+            for label in ("1er passage", "relance"):
+                engine, failed = bench_engine(all_hosts[:1], args.associations, args.queries,
+                                              args.rate, args.concurrency, args.max_in_flight, cache)
+                print(f"\n💾 Cache, {label}: {engine.elapsed:.2f}s, {failed} échecs")
+            cache.report()
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
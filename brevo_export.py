@@ -13,12 +13,16 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from campaign_tracker import CampaignTracker
+from utils.domain_validator import DomainValidator, UNDELIVERABLE_STATUSES
+from utils.objet_social import get_nomenclature
 
 class BrevoExporter:
     """Exporteur de contacts pour Brevo"""
     
     def __init__(self):
         self.tracker = CampaignTracker()
+        self.nomenclature = get_nomenclature()
+        self.domain_validator = DomainValidator()
         
     def export_for_brevo(self, include_all=True):
         """Exporter contacts au format Brevo"""
@@ -29,15 +33,31 @@ class BrevoExporter:
             # Charger les contacts RNA
             df = pd.read_csv("data/rna_emails_clean_20250713_1608.csv")
             
+            # Type d'association depuis le code objet social (une résolution par code)
+            if 'secteur_code' in df.columns:
+                types_nomenclature = self.nomenclature.map_codes(df['secteur_code'])['type_association']
+            else:
+                types_nomenclature = pd.Series('', index=df.index)
+            
+            # Domaines sans courrier non exportés (une résolution DNS par domaine)
+            statuses = self.domain_validator.check_emails(df['email'].astype(str))
+            
             # Format Brevo optimisé
             brevo_contacts = []
             
-            for _, contact in df.iterrows():
+            for index, contact in df.iterrows():
+                if statuses[str(contact['email'])] in UNDELIVERABLE_STATUSES:
+                    print(f"  🚫 Domaine sans courrier, non exporté: {contact['email']}")
+                    continue
+                if statuses[str(contact['email'])] == 'invalide':
+                    print(f"  🚫 Email invalide, non exporté: {contact['email']}")
+                    continue
+                
                 # Nettoyer le nom de l'association
                 nom_clean = str(contact['nom_association']).replace("'", "").replace("é", "e").replace("É", "E")
                 
-                # Déterminer le type d'association
-                type_asso = self._categorize_association(nom_clean, str(contact.get('objet', '')))
+                # Déterminer le type d'association (mots-clés si code inconnu)
+                type_asso = types_nomenclature[index] or self._categorize_association(nom_clean, str(contact.get('objet', '')))
                 
                 # Créer contact Brevo
                 brevo_contact = {
@@ -72,6 +92,7 @@ class BrevoExporter:
             print(f"\n🎉 EXPORT BREVO TERMINÉ")
             print(f"📁 Fichier: {filename}")
             print(f"📧 {len(brevo_contacts)} contacts exportés")
+            self.domain_validator.report()
             
             # Statistiques
             self._print_export_stats(brevo_contacts)
@@ -6,25 +6,34 @@ BULK CONTACT FINDER - Recherche de contacts en lot optimisée
 Recherche rapide et efficace de contacts pour associations RNA
 """
 
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 import re
-import time
 import random
 from datetime import datetime
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_search import AsyncSearchEngine
+from utils.contact_patterns import find_emails
+from utils.parse_pool import get_parse_pool
 from utils.data_manager import DataManager
+from utils.lead_store import LeadStore
+from utils.rna_cache import RnaTableCache
+from utils.run_journal import RunJournal, journal_key
+from utils.search_backends import get_backend_selector
 
 class BulkContactFinder:
     """Chercheur de contacts en lot optimisé"""
     
     def __init__(self):
         self.data_manager = DataManager()
-        self.session = requests.Session()
+        self.rna_cache = RnaTableCache()
+        self.store = LeadStore()
+        self.journal = RunJournal('bulk_finder')
+        self.engine = AsyncSearchEngine()
+        # Extraction dans un pool de processus: les threads réseau ne font que télécharger
+        self.parser = get_parse_pool()
+        self.backends = get_backend_selector()
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
@@ -34,7 +43,7 @@ class BulkContactFinder:
     def load_rna_data(self):
         """Charger données RNA directement"""
         try:
-            df = pd.read_csv("data/rna_import_20250701_dpt_01.csv", encoding='utf-8')
+            df = self.rna_cache.load_raw("data/rna_import_20250701_dpt_01.csv")
             print(f"✅ {len(df)} associations RNA chargées")
             
             # Nettoyer les données
@@ -57,28 +66,23 @@ class BulkContactFinder:
             # Requête optimisée
             query = f'"{nom_clean}" {ville_clean} email contact'
             
-            # Recherche Google
+            # Moteur au meilleur rendement observé, suivant si échec ou blocage
             headers = {'User-Agent': random.choice(self.user_agents)}
-            url = f"https://www.google.com/search?q={requests.utils.quote(query)}"
+            tried = set()
+            while True:
+                backend, valid_emails = self.backends.search(
+                    self.engine, query, self.extract_valid_emails, headers=headers, timeout=10, exclude=tried
+                )
+                if backend is None:
+                    return None
+                if valid_emails is not None:
+                    break
+                print(f"    ❌ Échec {backend.label}, moteur suivant")
+                tried.add(backend.name)
             
-            response = self.session.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                # Extraire emails simples
-                emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', response.text)
-                
-                # Filtrer emails valides
-                valid_emails = []
-                for email in emails:
-                    email_lower = email.lower()
-                    if (not any(word in email_lower for word in ['google', 'facebook', 'youtube', 'twitter', 'example']) 
-                        and email_lower.count('@') == 1 
-                        and '.' in email_lower.split('@')[1]):
-                        valid_emails.append(email_lower)
-                
-                if valid_emails:
-                    # Retourner le premier email unique
-                    return list(set(valid_emails))[0]
+            if valid_emails:
+                # Retourner le premier email unique
+                return list(set(valid_emails))[0]
             
             return None
             
@@ -86,8 +90,31 @@ class BulkContactFinder:
             print(f"    ❌ Erreur recherche: {e}")
             return None
     
-    def bulk_search(self, start_index=0, max_searches=100):
-        """Recherche en lot optimisée"""
+    def extract_valid_emails(self, html):
+        """Extraire les emails simples d'une page de résultats"""
+        emails = self.parser.run(find_emails, html)
+        
+        # Filtrer emails valides
+        valid_emails = []
+        for email in emails:
+            email_lower = email.lower()
+            if (not any(word in email_lower for word in ['google', 'facebook', 'youtube', 'twitter', 'example']) 
+                and email_lower.count('@') == 1 
+                and '.' in email_lower.split('@')[1]):
+                valid_emails.append(email_lower)
+        return valid_emails
+    
+    def bulk_search(self, start_index=0, max_searches=100, resume=False):
+        """Recherche en lot, chaque résultat journalisé (resume: reprendre le dernier lot)"""
+        if resume:
+            params, done, previous_results = self.journal.resume()
+            if params is None:
+                print(f"❌ Aucun lancement à reprendre ({self.journal.path})")
+                return None
+            start_index, max_searches = params['start_index'], params['max_searches']
+        else:
+            done, previous_results = set(), []
+        
         print(f"🚀 RECHERCHE CONTACTS RNA - MODE RAPIDE")
         print(f"=" * 60)
         
@@ -100,65 +127,85 @@ class BulkContactFinder:
         print(f"📧 Stratégie: Google simplifié + extraction email")
         
         # Sélectionner subset
+        if not resume:
+            self.journal.start_run({'start_index': start_index, 'max_searches': max_searches})
+        
         subset = associations[start_index:start_index + max_searches]
+        total_subset = len(subset)
+        subset = [asso for asso in subset if journal_key(asso) not in done]
+        # Déjà résolues par un finder (contact trouvé, ou échec non expiré): aucune requête
+        subset, resolved = self.store.partition_resolved(subset)
+        print(f"♻️ Déjà résolues: {len(resolved)} (dont {sum(r['statut'] != 'not_found' for _, r in resolved)} avec contact)")
         
-        results = []
-        found_count = 0
+        # Résultats d'avant l'arrêt: relus depuis le journal
+        results = list(previous_results)
+        found_count = len(results)
         
-        print(f"\n🔍 RECHERCHE EN COURS...")
+        print(f"\n🔍 RECHERCHE EN COURS ({self.engine.max_in_flight} associations en parallèle)...")
         
-        for i, asso in enumerate(subset, 1):
-            try:
-                nom = asso.get('titre', asso.get('nom_clean', ''))
-                ville = asso.get('libcom', asso.get('ville_clean', ''))
-                
-                print(f"  {i:3d}/{len(subset)} - {nom[:40]}... ({ville})")
-                
-                # Recherche contact
-                email = self.search_contact_simple(nom, ville)
-                
-                if email:
-                    found_count += 1
-                    result = {
-                        'nom_association': nom,
-                        'email': email,
-                        'ville': ville,
-                        'secteur': 'Loisirs/Culture',  # Par défaut pour RNA
-                        'telephone': '',
-                        'site_web': '',
-                        'adresse': asso.get('adr1', ''),
-                        'code_postal': asso.get('adrs_codepostal', ''),
-                        'objet': asso.get('objet', ''),
-                        'source': 'RNA_Bulk_Search',
-                        'date_extraction': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                        'search_method': 'Google_Simple'
-                    }
-                    
-                    results.append(result)
-                    print(f"        ✅ Email trouvé: {email}")
-                else:
-                    print(f"        ⚠️  Aucun contact")
-                
-                # Délai anti-ban
-                time.sleep(random.uniform(1, 3))
+        def search(asso):
+            nom = asso.get('titre', asso.get('nom_clean', ''))
+            ville = asso.get('libcom', asso.get('ville_clean', ''))
+            return self.search_contact_simple(nom, ville)
+        
+        def on_result(index, asso, email):
+            # Appelé dans la boucle asyncio, une association à la fois
+            nonlocal found_count
+            nom = asso.get('titre', asso.get('nom_clean', ''))
+            ville = asso.get('libcom', asso.get('ville_clean', ''))
+            
+            print(f"  {index + 1:3d}/{len(subset)} - {nom[:40]}... ({ville})")
+            
+            if email:
+                found_count += 1
+                result = {
+                    'nom_association': nom,
+                    'email': email,
+                    'ville': ville,
+                    'secteur': 'Loisirs/Culture',  # Par défaut pour RNA
+                    'telephone': '',
+                    'site_web': '',
+                    'adresse': asso.get('adr1', ''),
+                    'code_postal': asso.get('adrs_codepostal', ''),
+                    'objet': asso.get('objet', ''),
+                    'source': 'RNA_Bulk_Search',
+                    'date_extraction': datetime.now().strftime('%Y-%m-%d %H:%M'),
+                    'search_method': 'Google_Simple'
+                }
                 
-            except KeyboardInterrupt:
-                print(f"\n⏹️  Recherche interrompue par l'utilisateur")
-                break
-            except Exception as e:
-                print(f"        ❌ Erreur: {e}")
+                results.append(result)
+                self.store.record_contact({**result, 'rna_id': asso.get('id', '')}, 'bulk_finder')
+                self.journal.record(asso, 'found', result)
+                print(f"        ✅ Email trouvé: {email}")
+            else:
+                self.store.record_search(
+                    {'nom': nom, 'ville': ville, 'adresse': asso.get('adr1', ''),
+                     'objet': asso.get('objet', ''), 'rna_id': asso.get('id', '')},
+                    'bulk_finder', 'not_found', 'Google_Simple'
+                )
+                self.journal.record(asso, 'not_found')
+                print(f"        ⚠️  Aucun contact")
+        
+        # Délai anti-ban remplacé par les limites par hôte du moteur
+        try:
+            self.engine.run(subset, search, on_result=on_result)
+        except KeyboardInterrupt:
+            print(f"\n⏹️  Recherche interrompue par l'utilisateur")
+        self.engine.report()
+        self.parser.report()
+        self.backends.report()
         
         # Sauvegarder résultats
         if results:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-            filename = f"rna_bulk_contacts_{start_index}_{start_index + len(subset)}_{timestamp}.csv"
+            filename = f"rna_bulk_contacts_{start_index}_{start_index + total_subset}_{timestamp}.csv"
             
             self.data_manager.save_to_csv(results, filename)
             
             print(f"\n🎉 RECHERCHE TERMINÉE")
             print(f"📁 Fichier: data/{filename}")
-            print(f"✅ Contacts trouvés: {found_count}/{len(subset)}")
-            print(f"📊 Taux de succès: {(found_count/len(subset)*100):.1f}%")
+            print(f"✅ Contacts trouvés: {found_count}/{total_subset}")
+            print(f"📊 Taux de succès: {(found_count/total_subset*100):.1f}%")
             
             # Afficher échantillon
             print(f"\n📧 EMAILS TROUVÉS:")
@@ -185,6 +232,11 @@ def main():
     print(f"\n📋 PARAMÈTRES:")
     
     try:
+        # Reprise automatique du dernier lot (aucune saisie d'index)
+        if '--resume' in sys.argv:
+            finder.bulk_search(resume=True)
+            return
+        
         start = int(input(f"📍 Index de départ (0-654): ").strip() or "0")
         max_search = int(input(f"🔢 Nombre à traiter (max 100): ").strip() or "50")
         
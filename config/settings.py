@@ -33,6 +33,69 @@ TARGET_DEPARTMENTS = [
 
 PRIORITY_REGIONS = TARGET_DEPARTMENTS  # Alias pour compatibilité
 
+# Recherche de contacts: politesse par hôte (requêtes/seconde, rafale après inactivité, requêtes simultanées)
+SEARCH_MAX_IN_FLIGHT = 16  # associations traitées en parallèle
+SEARCH_DEFAULT_HOST_LIMIT = {"rate": 1.0, "burst": 2, "concurrency": 2}
+SEARCH_HOST_LIMITS = {
+    "www.google.com": {"rate": 0.5, "burst": 1, "concurrency": 1},
+    "www.bing.com": {"rate": 1.0, "burst": 2, "concurrency": 2},
+    "www.qwant.com": {"rate": 0.5, "burst": 1, "concurrency": 1},
+    "www.helloasso.com": {"rate": 1.0, "burst": 2, "concurrency": 2},
+    "www.net1901.org": {"rate": 1.0, "burst": 2, "concurrency": 2},
+}
+
+# Ralentissement sur 429/503/timeout: débit divisé par 2 à chaque alerte, puis retour progressif
+RATE_BACKOFF_MAX_FACTOR = 16  # débit minimal = nominal / 16
+RATE_BACKOFF_MAX_S = 300  # pause maximale sans Retry-After
+RATE_RETRY_AFTER_MAX_S = 600  # pause maximale demandée par un Retry-After (valeur hostile ou erronée)
+RATE_RECOVERY_FACTOR = 0.9  # chaque succès rapproche le débit du nominal
+SEARCH_MAX_RETRIES = 2  # nouvelles tentatives après 429/503
+
+# Choix du moteur de recherche par rendement observé (emails/s)
+SEARCH_BACKENDS = ["google", "bing", "qwant"]
+SEARCH_BACKEND_WINDOW = 50  # requêtes retenues par moteur
+SEARCH_BACKEND_MAX_FAILURES = 3  # échecs consécutifs avant mise en pause
+SEARCH_BACKEND_COOLDOWN_S = 60  # première pause, doublée à chaque récidive
+
+# Ordre des requêtes appris par modèle et par secteur (probabilités d'arrêt anticipé)
+QUERY_STOP_PROBABILITY = 0.15  # email déjà trouvé: arrêt si un meilleur est moins probable
+QUERY_HOPELESS_PROBABILITY = 0.03  # rien trouvé: arrêt si les modèles restants trouvent rarement
+QUERY_SECTOR_PRIOR_WEIGHT = 5  # poids du taux global dans le taux d'un secteur
+
+# Exploration du site d'une association (site trouvé sans email): pages de contact probables
+SITE_CRAWL_MAX_PAGES = 4  # pages par site, accueil compris
+SITE_CONTACT_PATHS = ["/contact", "/mentions-legales", "/nous-contacter", "/contactez-nous", "/a-propos"]
+SITE_CONTACT_HINTS = ["contact", "mentions", "legal", "propos", "qui-sommes", "bureau", "adhesion"]
+# Annuaires et réseaux sociaux: ce n'est pas le site de l'association
+SITE_CRAWL_SKIP_HOSTS = ["helloasso.com", "net1901.org", "loisirs.fr", "journal-officiel.gouv.fr",
+                         "associations.gouv.fr", "facebook.com", "instagram.com", "twitter.com",
+                         "linkedin.com", "pagesjaunes.fr", "google.", "bing.", "qwant."]
+ROBOTS_CACHE_TTL_HOURS = 24
+
+# Analyse HTML dans un pool de processus (0: dans le thread réseau). 0 par défaut:
+# sur les pages de résultats, l'échange avec les processus coûte plus que l'analyse
+# (voir benchmark_extract.py --workers N avant d'activer le pool)
+PARSE_WORKERS = 0
+PARSE_BATCH_SIZE = 8  # pages envoyées ensemble à un worker
+PARSE_BATCH_WAIT_S = 0.02  # attente maximale pour compléter un lot
+PARSE_QUEUE_MAX = 64  # pages en attente d'analyse (au-delà, les producteurs attendent)
+
+# Cache disque des réponses HTTP (HTTP_CACHE_REPLAY=1: rejouer sans réseau)
+HTTP_CACHE_DIR = "data/http_cache"
+HTTP_CACHE_TTL_HOURS = 24 * 7
+HTTP_CACHE_MAX_MB = 500
+
+# Cache de résolution des associations: un "rien trouvé" est retenté après ce délai
+RESOLUTION_NEGATIVE_TTL_DAYS = 30
+
+# Validation DNS des domaines d'emails avant export ou envoi (MX, à défaut A/AAAA)
+DNS_CACHE_TTL_HOURS = 24 * 7
+DNS_NEGATIVE_TTL_HOURS = 24  # domaine sans courrier: revérifié plus tôt
+DNS_CONCURRENCY = 20  # résolutions simultanées
+DNS_TIMEOUT_S = 5
+DNS_NAMESERVERS = []  # vide: serveurs du système (ex. ["127.0.0.1"] pour un résolveur de test)
+DNS_PORT = 53
+
 # Email settings
 EMAIL_PROVIDER = "sendgrid"  # ou "sendinblue"
 DAILY_EMAIL_LIMIT = 300
@@ -7,54 +7,32 @@ Fusionne tous les contacts trouvés et prépare l'export Brevo final
 
 import pandas as pd
 from datetime import datetime
-import os
+
+from utils.lead_store import LeadStore, LEGACY_CONTACT_PATTERNS
 
 def consolidate_all_contacts():
-    """Consolide tous les fichiers de contacts"""
+    """Consolide tous les contacts de la base (et les anciens fichiers CSV)"""
     print("🔗 CONSOLIDATION FINALE DES CONTACTS")
     print("=" * 50)
     
-    all_contacts = []
+    store = LeadStore()
     
-    # Fichiers à consolider
-    contact_files = [
-        "data/rna_emails_clean_20250713_1608.csv",  # 6 contacts RNA originaux
-        "data/smart_contacts_0_30_20250713_1925.csv",  # 1 contact smart search
-        "data/modern_contacts_0_12_20250713_2011.csv"  # 10 contacts modernes
-    ]
+    # Fichiers produits avant la base: importés une seule fois
+    store.import_legacy_files(LEGACY_CONTACT_PATTERNS)
     
-    for file_path in contact_files:
-        if os.path.exists(file_path):
-            print(f"📂 Chargement: {file_path}")
-            df = pd.read_csv(file_path)
-            print(f"   ✅ {len(df)} contacts")
-            
-            # Standardiser les colonnes
-            if 'nom_association' not in df.columns and 'titre' in df.columns:
-                df = df.rename(columns={'titre': 'nom_association'})
-            if 'libcom' in df.columns and 'ville' not in df.columns:
-                df = df.rename(columns={'libcom': 'ville'})
-                
-            all_contacts.append(df)
-        else:
-            print(f"❌ Fichier non trouvé: {file_path}")
+    # Un contact par email (premier trouvé), toutes étapes confondues
+    df_combined = store.email_contacts()
     
-    if not all_contacts:
-        print("❌ Aucun fichier de contact trouvé")
+    if df_combined.empty:
+        print(f"❌ Aucun contact dans la base ({store.db_path})")
         return None
-        
-    # Fusionner tous les DataFrames
-    df_combined = pd.concat(all_contacts, ignore_index=True, sort=False)
     
-    # Déduplication par email
-    initial_count = len(df_combined)
-    df_combined = df_combined.drop_duplicates(subset=['email'], keep='first')
     final_count = len(df_combined)
     
     print(f"\n📊 RÉSULTATS CONSOLIDATION:")
-    print(f"📈 Total initial: {initial_count} contacts")
-    print(f"🗑️ Doublons supprimés: {initial_count - final_count}")
     print(f"✅ Total final: {final_count} contacts uniques")
+    for etape, count in df_combined['etape'].value_counts().items():
+        print(f"   • {etape}: {count}")
     
     # Analyser les types de contacts
     if 'contact_type' in df_combined.columns:
@@ -12,20 +12,45 @@ Stratégie:
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 import re
-import time
 import random
 from datetime import datetime
 import os
-from urllib.parse import quote
+import sys
 import unicodedata
 
+from utils.async_search import AsyncSearchEngine
+from utils.contact_patterns import find_emails
+from utils.parse_pool import get_parse_pool
+from utils.email_scoring import EmailScorer
+from utils.lead_store import LeadStore
+from utils.mairie_index import MairieIndex
+from utils.query_planner import QueryPlanner, association_sector
+from utils.run_journal import RunJournal, journal_key
+from utils.search_backends import get_backend_selector
+from utils.rna_cache import RnaTableCache
+from utils.title_rules import TitleValidator
+
+# Année minimale de publication d'une association "moderne"
+MODERN_MIN_YEAR = 1990
+
 class ModernAssociationFinder:
-    def __init__(self):
+    def __init__(self, adaptive_queries=True):
         self.session = requests.Session()
         self.setup_session()
-        self.base_delay = 1.0
+        self.engine = AsyncSearchEngine()
+        # Extraction dans un pool de processus: les threads réseau ne font que télécharger
+        self.parser = get_parse_pool()
+        # Règles de scoring partagées (utils.email_scoring), candidats scorés par lots
+        self.scorer = EmailScorer('modern')
+        self.backends = get_backend_selector()
+        # Ordre des modèles de requêtes appris (adaptive_queries=False: ordre fixe de référence)
+        self.query_planner = QueryPlanner('modern_finder', adaptive=adaptive_queries)
+        self.rna_cache = RnaTableCache()
+        self.title_validator = TitleValidator('modern')
+        self.store = LeadStore()
+        self.mairie_index = MairieIndex()
+        self.journal = RunJournal('modern_finder')
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
@@ -65,22 +90,52 @@ class ModernAssociationFinder:
         titre = row.get('titre', '')
         
         # Ignorer les associations avec des titres problématiques
-        titre_upper = titre.upper()
-        problematic_keywords = [
-            'ERREUR', 'VOIR NUMERO', 'VOIR -', 'VOIR N°', 'DISSOLUTION',
-            'DISSOUTE', 'FUSION', 'TRANSFERT', 'ASSOCIATION DISSOUTE'
-        ]
-        
-        for keyword in problematic_keywords:
-            if keyword in titre_upper:
-                return False
+        if not self.title_validator.is_valid(titre):
+            return False
                 
         # Vérifier la date
         parsed_date = self.parse_date(date_publi)
-        if parsed_date and parsed_date.year >= 1990:
+        if parsed_date and parsed_date.year >= MODERN_MIN_YEAR:
             return True
             
         return False
+    
+    def parse_dates(self, dates):
+        """Version vectorisée de parse_date sur une colonne (NaT si non reconnue)"""
+        dates = dates.fillna('').astype(str)
+        slash = dates.str.contains('/', regex=False)
+        dash = ~slash & dates.str.contains('-', regex=False) & (dates != '0001-01-01')
+        
+        parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+        parsed[slash] = pd.to_datetime(dates[slash], format='%m/%d/%Y', errors='coerce')
+        parsed[dash] = pd.to_datetime(dates[dash], format='%Y-%m-%d', errors='coerce')
+        return parsed
+    
+    def modern_mask(self, df, parsed_dates=None):
+        """Version vectorisée de is_modern_association sur tout le DataFrame"""
+        if parsed_dates is None:
+            parsed_dates = self.parse_dates(df['date_publi'])
+        valid_titles = self.title_validator.valid_mask(df['titre'])
+        return valid_titles & (parsed_dates.dt.year >= MODERN_MIN_YEAR)
+        
+    def load_modern_associations_rowwise(self, df):
+        """Filtrage ligne par ligne (référence historique, utilisée par les benchmarks)"""
+        modern_associations = []
+        for _, row in df.iterrows():
+            if self.is_modern_association(row):
+                modern_associations.append(row)
+                
+        df_modern = pd.DataFrame(modern_associations)
+        df_modern['date_parsed'] = df_modern['date_publi'].apply(self.parse_date)
+        return df_modern.sort_values('date_parsed', ascending=False, kind='stable')
+        
+    def filter_modern_associations(self, df):
+        """Sous-ensemble moderne trié (plus récentes en premier), en une passe vectorisée"""
+        parsed_dates = self.parse_dates(df['date_publi'])
+        mask = self.modern_mask(df, parsed_dates)
+        
+        df_modern = df[mask].assign(date_parsed=parsed_dates[mask])
+        return df_modern.sort_values('date_parsed', ascending=False, kind='stable')
         
     def clean_association_name(self, nom):
         """Nettoie le nom de l'association pour la recherche"""
@@ -108,67 +163,68 @@ class ModernAssociationFinder:
         return ' '.join(mots_filtres).strip()
         
     def generate_modern_queries(self, nom, ville):
-        """Génère des requêtes adaptées aux associations modernes"""
+        """Génère des requêtes adaptées aux associations modernes: couples (modèle, requête)"""
         nom_clean = self.clean_association_name(nom)
-        queries = []
         
         if not nom_clean or not ville:
-            return queries
+            return []
             
         ville_clean = ville.replace('-', ' ')
-        
-        # Requêtes modernes (plus de chances d'avoir sites web/réseaux sociaux)
-        queries.extend([
-            f'"{nom_clean}" {ville_clean} email contact',
-            f'"{nom_clean}" {ville_clean} site web',
-            f'"{nom_clean}" {ville_clean} facebook',
-            f'"{nom_clean}" {ville_clean} association contact',
-            f'{nom_clean} {ville_clean} "@" email',
-            f'association "{nom_clean}" {ville_clean} contact',
-            f'{nom_clean} {ville_clean} president secretaire',
-            f'"{nom_clean}" {ville_clean} site:facebook.com',
-        ])
-        
-        # Recherches sur sites officiels locaux
         ville_slug = ville_clean.lower().replace(' ', '-')
-        queries.extend([
-            f'site:mairie-{ville_slug}.fr "{nom_clean}"',
-            f'site:{ville_slug}.fr "{nom_clean}"',
-            f'site:cc-{ville_slug}.fr "{nom_clean}"'
-        ])
         
-        return queries[:10]  # Limiter à 10 requêtes max
+        templates = [
+            # Requêtes modernes (plus de chances d'avoir sites web/réseaux sociaux)
+            '"{nom}" {ville} email contact',
+            '"{nom}" {ville} site web',
+            '"{nom}" {ville} facebook',
+            '"{nom}" {ville} association contact',
+            '{nom} {ville} "@" email',
+            'association "{nom}" {ville} contact',
+            '{nom} {ville} president secretaire',
+            '"{nom}" {ville} site:facebook.com',
+            # Recherches sur sites officiels locaux
+            'site:mairie-{ville_slug}.fr "{nom}"',
+            'site:{ville_slug}.fr "{nom}"',
+            'site:cc-{ville_slug}.fr "{nom}"',
+        ]
         
-    def search_engine_request(self, query, engine="google"):
-        """Effectue une recherche sur un moteur donné"""
-        try:
-            # Rotation des user agents
-            self.session.headers['User-Agent'] = random.choice(self.user_agents)
-            
-            if engine == "google":
-                url = f"https://www.google.com/search?q={quote(query)}&num=15"
-            elif engine == "bing":
-                url = f"https://www.bing.com/search?q={quote(query)}&count=15"
-            else:
-                return None
-                
-            response = self.session.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.text
+        return [
+            (template, template.format(nom=nom_clean, ville=ville_clean, ville_slug=ville_slug))
+            for template in templates
+        ]
+        
+    def search_engine_request(self, query, marker="        📡"):
+        """Recherche sur le moteur au meilleur rendement observé (suivant si échec ou blocage)"""
+        # Rotation des user agents (en-têtes par requête: plusieurs recherches en parallèle)
+        headers = dict(self.session.headers)
+        headers['User-Agent'] = random.choice(self.user_agents)
+        
+        tried = set()
+        while True:
+            try:
+                backend, emails = self.backends.search(
+                    self.engine, query, self.extract_emails, headers=headers, max_results=15,
+                    timeout=10, exclude=tried
+                )
+            except Exception as e:
+                print(f"        ❌ Erreur recherche: {str(e)[:50]}...")
+                return []
+            if backend is None:
+                return []
                 
-        except Exception as e:
-            print(f"        ❌ Erreur {engine}: {str(e)[:50]}...")
-            
-        return None
+            print(f"{marker} {backend.label}: {query[:55]}...")
+            if emails is not None:
+                return emails
+            print(f"        ❌ Échec {backend.label}, moteur suivant")
+            tried.add(backend.name)
         
     def extract_emails(self, html_content):
         """Extrait les emails du contenu HTML"""
         if not html_content:
             return []
             
-        # Pattern email amélioré
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, html_content)
+        # Motif partagé, préfiltré, formes masquées comprises; calculé dans un worker du pool
+        emails = self.parser.run(find_emails, html_content)
         
         # Filtrer les emails valides
         valid_emails = []
@@ -191,50 +247,20 @@ class ModernAssociationFinder:
         return valid_emails
         
     def score_email(self, email, nom_association, ville):
-        """Score un email selon sa pertinence"""
-        score = 0
-        email_lower = email.lower()
-        nom_lower = nom_association.lower()
-        ville_lower = ville.lower()
-        
-        # Score basé sur le domaine
-        domain = email.split('@')[1]
-        
-        # Domaines officiels/municipaux (score élevé)
-        if any(x in domain for x in ['mairie', 'ville', 'commune', 'cc-', ville_lower.replace(' ', '-')]):
-            score += 40
-            
-        # Domaines associatifs
-        if any(x in domain for x in ['asso', 'association', 'club', 'org']):
-            score += 35
-            
-        # Domaines professionnels
-        if domain.endswith(('.fr', '.org', '.net')):
-            score += 20
-        elif domain.endswith('.com'):
-            score += 15
-            
-        # Correspondance avec le nom de l'association
-        nom_mots = [mot for mot in nom_lower.split() if len(mot) > 3]
-        for mot in nom_mots:
-            if mot in email_lower:
-                score += 25
-                
-        # Correspondance avec la ville
-        ville_clean = ville_lower.replace('-', '').replace(' ', '')
-        if ville_clean in domain:
-            score += 20
-            
-        # Types d'emails prioritaires
-        priority_keywords = ['contact', 'info', 'secretaire', 'president', 'bureau']
-        for keyword in priority_keywords:
-            if keyword in email_lower:
-                score += 15
-                
-        return score
-        
-    def search_mairie_email(self, ville):
-        """Recherche l'email de la mairie comme fallback"""
+        """Score un email selon sa pertinence (règles partagées, voir utils.email_scoring)"""
+        return self.scorer.score(nom_association, ville, email)
+        
+    def search_mairie_email(self, ville, code_insee=''):
+        """Email de la mairie comme fallback: index par commune, recherche une seule fois par commune"""
+        entry = self.mairie_index.get_or_search(
+            code_insee, ville, lambda: (self._search_mairie_email_online(ville), '')
+        )
+        if entry['email']:
+            print(f"        🏛️ Email mairie ({entry.get('source', 'recherche')}): {entry['email']}")
+        return entry['email'] or None
+
+    def _search_mairie_email_online(self, ville):
+        """Recherche en ligne de l'email de la mairie"""
         print(f"        🏛️ Recherche email mairie de {ville}...")
         
         ville_clean = ville.replace('-', ' ').lower()
@@ -251,15 +277,7 @@ class ModernAssociationFinder:
         all_emails = []
         
         for query in mairie_queries[:3]:  # Limiter à 3 requêtes pour la mairie
-            for engine in ['google', 'bing']:
-                print(f"          📧 {engine.title()}: {query[:50]}...")
-                
-                html = self.search_engine_request(query, engine)
-                if html:
-                    emails = self.extract_emails(html)
-                    all_emails.extend(emails)
-                    
-                time.sleep(self.base_delay + random.uniform(0.2, 0.8))
+            all_emails.extend(self.search_engine_request(query, marker="          📧"))
                 
         # Filtrer et scorer les emails de mairie
         mairie_emails = []
@@ -285,47 +303,41 @@ class ModernAssociationFinder:
             
         return None
 
-    def smart_search_contact(self, nom, ville, date_creation):
+    def smart_search_contact(self, nom, ville, date_creation, code_insee='', secteur=''):
         """Recherche intelligente d'un contact pour association moderne"""
         print(f"    🔍 {nom[:40]}... ({date_creation}) à {ville}")
         
         all_emails = []
-        queries = self.generate_modern_queries(nom, ville)
-        
-        for i, query in enumerate(queries):
-            # Alterner entre moteurs
-            engine = 'google' if i % 2 == 0 else 'bing'
-            print(f"        📡 {engine.title()}: {query[:55]}...")
-            
-            html = self.search_engine_request(query, engine)
-            if html:
-                emails = self.extract_emails(html)
-                all_emails.extend(emails)
+        # Modèles au meilleur taux de réussite d'abord, arrêt quand un meilleur email devient improbable
+        plan = self.query_planner.plan(self.generate_modern_queries(nom, ville), secteur, limit=10)
+        
+        for template, query in plan:
+            # Moteur choisi par rendement observé (emails/s)
+            emails = self.search_engine_request(query)
+            plan.record(template, emails)
+            all_emails.extend(emails)
                 
-                # Si on trouve des emails rapidement, on peut réduire les recherches
-                if len(set(all_emails)) >= 3:
-                    break
-                    
-            # Délai anti-détection adaptatif
-            delay = self.base_delay + random.uniform(0.3, 1.0)
-            time.sleep(delay)
+            # Si on trouve des emails rapidement, on peut réduire les recherches
+            if len(set(all_emails)) >= 3:
+                break
             
         # Déduplication et scoring
         unique_emails = list(set(all_emails))
         if unique_emails:
             # Scorer et trier
-            scored_emails = [(email, self.score_email(email, nom, ville)) for email in unique_emails]
-            scored_emails.sort(key=lambda x: x[1], reverse=True)
+            scored_emails = self.scorer.best(nom, ville, unique_emails)
             
             # Prendre le meilleur email
             best_email, best_score = scored_emails[0]
+            plan.finish(best_email)
             print(f"        ✅ Email association trouvé: {best_email} (score: {best_score})")
             return best_email, "Association"
         else:
+            plan.finish()
             print(f"        ❌ Aucun email association trouvé")
             
             # Fallback: rechercher l'email de la mairie
-            mairie_email = self.search_mairie_email(ville)
+            mairie_email = self.search_mairie_email(ville, code_insee)
             if mairie_email:
                 return mairie_email, "Mairie"
             else:
@@ -335,31 +347,37 @@ class ModernAssociationFinder:
     def load_modern_associations(self, file_path):
         """Charge et filtre les associations modernes (2000+)"""
         print("📂 Chargement des données RNA...")
-        df = pd.read_csv(file_path)
+        df = self.rna_cache.load_raw(file_path)
         
         initial_count = len(df)
         print(f"📊 {initial_count} associations dans le fichier")
         
-        # Filtrer les associations modernes
-        modern_associations = []
-        for _, row in df.iterrows():
-            if self.is_modern_association(row):
-                modern_associations.append(row)
-                
-        df_modern = pd.DataFrame(modern_associations)
+        # Filtrer et trier les associations modernes (plus récentes en premier)
+        df_modern = self.filter_modern_associations(df)
         
         modern_count = len(df_modern)
         print(f"✅ {modern_count} associations modernes (1990+)")
         print(f"🗑️ {initial_count - modern_count} associations anciennes filtrées")
         
-        # Trier par date (plus récentes en premier)
-        df_modern['date_parsed'] = df_modern['date_publi'].apply(self.parse_date)
-        df_modern = df_modern.sort_values('date_parsed', ascending=False)
-        
         return df_modern
         
-    def run_modern_search(self, target_results=10, start_index=0, max_attempts=100):
-        """Lance la recherche jusqu'à obtenir le nombre de résultats souhaité"""
+    def run_modern_search(self, target_results=10, start_index=0, max_attempts=100, resume=False):
+        """Lance la recherche jusqu'à obtenir le nombre de résultats souhaité
+
+        resume: reprendre le dernier lancement journalisé (mêmes paramètres),
+        sans refaire les associations déjà traitées.
+        """
+        if resume:
+            params, done, previous_results = self.journal.resume()
+            if params is None:
+                print(f"❌ Aucun lancement à reprendre ({self.journal.path})")
+                return []
+            target_results, start_index, max_attempts = (
+                params['target_results'], params['start_index'], params['max_attempts']
+            )
+        else:
+            done, previous_results = set(), []
+        
         print("🎯 SMART CONTACT FINDER - ASSOCIATIONS MODERNES")
         print("=" * 65)
         print(f"📅 {datetime.now().strftime('%d/%m/%Y %H:%M')}")
@@ -390,14 +408,27 @@ class ModernAssociationFinder:
         print("🚀 Lancement recherche ciblée...")
         print("-" * 65)
         
-        results = []
-        found_count = 0
-        attempts = 0
-        current_index = start_index
-        
-        while found_count < target_results and attempts < max_attempts and current_index < len(df):
+        if not resume:
+            self.journal.start_run({'target_results': target_results, 'start_index': start_index,
+                                    'max_attempts': max_attempts})
+        
+        results = list(previous_results)
+        found_count = len(results)
+        attempts = len(done)
+        window = df.iloc[start_index:start_index + max_attempts].to_dict('records')
+        candidates = [row for row in window if journal_key(row) not in done]
+        # Déjà résolues par un finder (contact trouvé, ou échec non expiré): aucune requête
+        rows, resolved = self.store.partition_resolved(candidates)
+        print(f"♻️ Déjà résolues: {len(resolved)} (dont {sum(r['statut'] != 'not_found' for _, r in resolved)} avec contact)")
+        
+        def search(row):
+            return self.smart_search_contact(row['titre'], row['libcom'], row.get('date_publi', ''),
+                                             row.get('adrs_codeinsee', ''), association_sector(row))
+        
+        def on_result(index, row, email_result):
+            # Appelé dans la boucle asyncio, une association à la fois
+            nonlocal found_count, attempts
             attempts += 1
-            row = df.iloc[current_index]
             
             nom = row['titre']
             ville = row['libcom']
@@ -405,11 +436,9 @@ class ModernAssociationFinder:
             objet = row.get('objet', '')
             date_creation = row.get('date_publi', '')
             
-            print(f"{attempts:4d}. Recherche: {found_count}/{target_results} trouvés - ", end="")
-            
-            email_result = self.smart_search_contact(nom, ville, date_creation)
+            print(f"{attempts:4d}. {nom[:40]}... ({ville}) - {found_count}/{target_results} trouvés")
             
-            if email_result[0]:  # Si un email a été trouvé
+            if email_result and email_result[0]:  # Si un email a été trouvé
                 email, contact_type = email_result
                 found_count += 1
                 contact_data = {
@@ -426,20 +455,42 @@ class ModernAssociationFinder:
                     'secteur': 'À analyser'
                 }
                 results.append(contact_data)
+                # Enregistrement immédiat dans la base (remplace les sauvegardes temporaires)
+                self.store.record_contact({**contact_data, 'rna_id': row.get('id', '')}, 'modern_finder')
+                self.journal.record(row, 'found', contact_data)
                 
                 print(f"        🎉 OBJECTIF: {found_count}/{target_results} atteint! ({contact_type})")
                 
-                # Sauvegarde incrémentale tous les 3 contacts
-                if found_count % 3 == 0:
-                    self.save_results(results, start_index, current_index, temp=True)
-                    print(f"        💾 Sauvegarde: {found_count} contacts")
-                
                 # Vérifier si l'objectif est atteint
-                if found_count >= target_results:
+                if found_count == target_results:
                     print(f"        ✅ OBJECTIF ATTEINT! {target_results} contacts trouvés")
-                    break
-                    
-            current_index += 1
+            else:
+                self.store.record_search(
+                    {'nom': nom, 'ville': ville, 'adresse': adresse, 'objet': objet,
+                     'date_publication': date_creation, 'rna_id': row.get('id', '')},
+                    'modern_finder', 'not_found', 'Modern_Smart_Search_With_Fallback'
+                )
+                self.journal.record(row, 'not_found')
+        
+        # Plus aucune association lancée une fois l'objectif atteint;
+        # celles déjà en vol sont terminées et enregistrées
+        launched = self.engine.run(rows, search, on_result=on_result,
+                                   should_stop=lambda: found_count >= target_results)
+        # Reprise après la dernière association lancée (les déjà résolues sont passées)
+        if len(launched) == len(rows):
+            current_index = start_index + len(window)
+        elif not launched:
+            # Objectif déjà atteint (reprise): rien lancé, la fenêtre reste à traiter
+            current_index = start_index
+        else:
+            last = rows[len(launched) - 1]
+            current_index = start_index + next(i for i, row in enumerate(window) if row is last) + 1
+        self.engine.report()
+        self.parser.report()
+        self.backends.report()
+        self.mairie_index.report()
+        self.query_planner.save_run()
+        self.query_planner.report()
                     
         # Sauvegarde finale
         output_file = self.save_results(results, start_index, current_index)
@@ -492,12 +543,18 @@ class ModernAssociationFinder:
         return filepath
 
 if __name__ == "__main__":
-    finder = ModernAssociationFinder()
+    # --fixed-queries: ordre fixe des requêtes (mesure de référence avant apprentissage)
+    finder = ModernAssociationFinder(adaptive_queries='--fixed-queries' not in sys.argv)
     
     print("🏛️ Source: RNA Département 01 (associations modernes seulement)")
     print("📅 Critère: Créées après 1990")
     print("🔬 Méthode: Recherche ciblée par nombre de résultats")
     
+    # Reprise automatique du dernier lancement (aucune saisie d'index)
+    if '--resume' in sys.argv:
+        finder.run_modern_search(resume=True)
+        sys.exit(0)
+    
     # Paramètres par défaut
     target = input("🎯 Nombre de contacts souhaités (défaut: 10): ").strip()
     target = int(target) if target else 10
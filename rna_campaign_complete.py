@@ -20,6 +20,7 @@ import configparser
 # Importer le tracker
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from campaign_tracker import CampaignTracker
+from utils.domain_validator import DomainValidator
 
 class RNACampaignComplete:
     """Campagne email RNA complète avec suivi"""
@@ -29,6 +30,7 @@ class RNACampaignComplete:
         self.smtp_config = self._load_smtp_config()
         self.email_template = self._load_email_template()
         self.contacts = self._load_contacts()
+        self.domain_validator = DomainValidator()
         
         # Importer contacts dans le tracker
         self.tracker.import_rna_contacts()
@@ -145,6 +147,12 @@ class RNACampaignComplete:
         if test_mode:
             print(f"⚠️  MODE TEST - Emails vers matt@mattkonnect.com")
         
+        # Domaines sans courrier écartés avant l'envoi: un rebond consomme le quota
+        contacts, rejected = self.domain_validator.filter_contacts(self.contacts)
+        for contact in rejected:
+            print(f"  🚫 Domaine sans courrier, contact écarté: {contact['email']}")
+        self.domain_validator.report()
+        
         # Confirmation
         if not test_mode:
             confirm = input(f"\n❓ Confirmer envoi réel ? (oui/non): ")
@@ -171,7 +179,7 @@ class RNACampaignComplete:
         # Envoi avec tracking
         sent_count = 0
         error_count = 0
-        contacts_to_send = self.contacts[:max_emails] if max_emails else self.contacts
+        contacts_to_send = contacts[:max_emails] if max_emails else contacts
         
         print(f"\n📤 ENVOI EN COURS...")
         
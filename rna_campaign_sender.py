@@ -17,6 +17,9 @@ import sys
 import os
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.domain_validator import DomainValidator
+
 # Configuration
 DATA_FILE = "data/rna_emails_clean_20250713_1608.csv"
 TEMPLATE_FILE = "templates/email_template_rna_20250713_1608.txt"
@@ -29,6 +32,7 @@ class RNACampaignSender:
         self.smtp_config = self._load_smtp_config()
         self.email_template = self._load_email_template()
         self.contacts = self._load_contacts()
+        self.domain_validator = DomainValidator()
         
     def _load_smtp_config(self):
         """Charger configuration SMTP"""
@@ -110,9 +114,15 @@ class RNACampaignSender:
         if test_mode:
             print(f"⚠️  MODE TEST - Emails envoyés à matt@mattkonnect.com")
         
+        # Domaines sans courrier écartés avant l'envoi: un rebond consomme le quota
+        contacts, rejected = self.domain_validator.filter_contacts(self.contacts)
+        for contact in rejected:
+            print(f"  🚫 Domaine sans courrier, contact écarté: {contact['email']}")
+        self.domain_validator.report()
+        
         # Confirmation
         if not test_mode:
-            confirm = input(f"\n❓ Confirmer envoi réel à {len(self.contacts)} associations ? (oui/non): ")
+            confirm = input(f"\n❓ Confirmer envoi réel à {len(contacts)} associations ? (oui/non): ")
             if confirm.lower() not in ['oui', 'o', 'yes', 'y']:
                 print("❌ Campagne annulée")
                 return
@@ -134,7 +144,7 @@ class RNACampaignSender:
         sent_count = 0
         error_count = 0
         
-        contacts_to_send = self.contacts[:max_emails] if max_emails else self.contacts
+        contacts_to_send = contacts[:max_emails] if max_emails else contacts
         
         for i, contact in enumerate(contacts_to_send, 1):
             try:
@@ -6,12 +6,15 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.data_manager import DataManager
+from utils.contact_patterns import NON_DIGIT_RE, is_email
+from utils.domain_validator import DomainValidator, email_domain
 
 class EmailCleaner:
     """Nettoyeur d'emails RNA"""
     
-    def __init__(self):
+    def __init__(self, domain_validator=None):
         self.data_manager = DataManager()
+        self.domain_validator = domain_validator or DomainValidator()
     
     def clean_email_file(self, filename):
         """Nettoyer fichier d'emails"""
@@ -51,10 +54,17 @@ class EmailCleaner:
                     }
                     
                     cleaned_emails.append(contact)
-                    print(f"  ✅ {contact['nom_association'][:35]}... → {contact['email']}")
                 else:
                     print(f"  ❌ Email invalide supprimé: {email}")
             
+            # Domaines sans courrier (inexistants, sans MX): une résolution DNS par domaine
+            cleaned_emails, rejected = self.domain_validator.filter_contacts(cleaned_emails)
+            for contact in rejected:
+                print(f"  ❌ Domaine sans courrier supprimé: {contact['email']} ({email_domain(contact['email'])})")
+            for contact in cleaned_emails:
+                print(f"  ✅ {contact['nom_association'][:35]}... → {contact['email']}")
+            self.domain_validator.report()
+            
             # Sauvegarder emails nettoyés
             if cleaned_emails:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M')
@@ -108,7 +118,7 @@ class EmailCleaner:
         phone = str(phone).replace('.0', '')
         
         # Formater téléphone français
-        phone = re.sub(r'[^\d]', '', phone)
+        phone = NON_DIGIT_RE.sub('', phone)
         
         if len(phone) == 9:
             phone = '0' + phone
@@ -123,8 +133,7 @@ class EmailCleaner:
         if not email:
             return False
         
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return is_email(email)
     
     def _display_summary(self, contacts):
         """Afficher résumé final"""
@@ -1,56 +1,43 @@
-import pandas as pd
 import os
-import glob
 from datetime import datetime
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.data_manager import DataManager
+from utils.lead_store import RNA_CONTACT_ETAPES, LeadStore
+from utils.objet_social import get_nomenclature
 
 class RnaContactConsolidator:
     """Consolidateur des contacts RNA trouvés"""
     
     def __init__(self):
         self.data_manager = DataManager()
+        self.nomenclature = get_nomenclature()
+        self.store = LeadStore()
     
     def consolidate_rna_contacts(self):
         """Consolider tous les fichiers RNA avec contacts"""
         print("🎯 CONSOLIDATION CONTACTS RNA")
         print("=" * 50)
         
-        # Rechercher tous les fichiers RNA avec contacts
-        contact_files = glob.glob("data/rna_with_contacts_*.csv")
+        # Anciens fichiers rna_with_contacts_* pas encore dans la base
+        self.store.import_legacy_files(["data/rna_with_contacts_*.csv"])
         
-        if not contact_files:
-            print("❌ Aucun fichier de contacts RNA trouvé")
-            return []
-        
-        print(f"📁 {len(contact_files)} fichiers trouvés:")
-        for file in contact_files:
-            print(f"  • {os.path.basename(file)}")
-        
-        # Charger et consolider
-        all_associations = []
+        # Une ligne par association (clé nom + ville), contacts les plus récents du scraper RNA
+        df = self.store.associations_with_contacts(etapes=RNA_CONTACT_ETAPES, contact_types=('Association',))
+        df['secteur_nom'] = df['secteur_nom'].replace('', 'Autre')
+        unique_associations = df.to_dict('records')
         
-        for file in contact_files:
-            try:
-                df = pd.read_csv(file)
-                associations = df.to_dict('records')
-                all_associations.extend(associations)
-                print(f"  ✅ {len(associations)} associations depuis {os.path.basename(file)}")
-            except Exception as e:
-                print(f"  ❌ Erreur {file}: {e}")
-        
-        # Déduplication
-        unique_associations = self._deduplicate_by_name_city(all_associations)
+        if not unique_associations:
+            print(f"❌ Aucun contact RNA dans la base ({self.store.db_path})")
+            return []
         
         # Filtrer celles avec contacts
         with_contacts = [a for a in unique_associations if a.get('email_principal') or a.get('site_web')]
         
         print(f"\n📊 RÉSULTATS CONSOLIDATION:")
-        print(f"  • Total brut: {len(all_associations)}")
-        print(f"  • Après déduplication: {len(unique_associations)}")
-        print(f"  • Avec contacts: {len(with_contacts)}")
+        print(f"  • Associations avec un contact enregistré: {len(unique_associations)}")
+        print(f"  • Avec email ou site web: {len(with_contacts)}")
         
         # Sauvegarder consolidation
         if unique_associations:
@@ -75,20 +62,6 @@ class RnaContactConsolidator:
         
         return []
     
-    def _deduplicate_by_name_city(self, associations):
-        """Déduplication par nom et ville"""
-        unique = []
-        seen = set()
-        
-        for assoc in associations:
-            key = f"{assoc.get('nom', '').lower().strip()}_{assoc.get('ville', '').lower().strip()}"
-            
-            if key not in seen:
-                seen.add(key)
-                unique.append(assoc)
-        
-        return unique
-    
     def _generate_contact_stats(self, associations_with_contacts):
         """Générer statistiques détaillées des contacts"""
         print(f"\n📈 STATISTIQUES CONTACTS RNA:")
@@ -188,7 +161,15 @@ class RnaContactConsolidator:
         return campaign_data
     
     def _determine_campaign_segment(self, association):
-        """Déterminer segment de campagne"""
+        """Déterminer segment de campagne (nomenclature, à défaut mots-clés)"""
+        segment = association.get('segment_campagne')
+        if isinstance(segment, str) and segment:
+            return segment
+        
+        segment = self.nomenclature.categories(association.get('secteur_code'))['segment_campagne']
+        if segment:
+            return segment
+        
         secteur = association.get('secteur_nom', '').lower()
         objet = association.get('objet', '').lower()
         
@@ -1,23 +1,38 @@
 import pandas as pd
-import requests
-import time
 import re
 import sys
 import os
-from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import quote_plus, urljoin
 import random
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_search import AsyncSearchEngine
 from utils.data_manager import DataManager
+from utils.email_scoring import EmailScorer
+from utils.contact_patterns import find_emails, find_phones
+from utils.html_extract import extract_page
+from utils.lead_store import LeadStore
+from utils.parse_pool import get_parse_pool
+from utils.query_planner import QueryPlanner, association_sector
+from utils.run_journal import RunJournal, journal_key
+from utils.search_backends import get_backend_selector
+from utils.site_crawler import SiteCrawler
 
 class RnaContactScraper:
     """Scraper pour trouver les contacts des associations RNA par nom et ville"""
     
-    def __init__(self):
+    def __init__(self, adaptive_queries=True):
         self.data_manager = DataManager()
-        self.session = requests.Session()
+        self.store = LeadStore()
+        self.engine = AsyncSearchEngine()
+        # Analyse des pages dans un pool de processus: les threads réseau ne font que télécharger
+        self.parser = get_parse_pool()
+        # Règles de scoring partagées (utils.email_scoring)
+        self.scorer = EmailScorer('rna')
+        # Site trouvé sans email: pages de contact du site de l'association
+        self.site_crawler = SiteCrawler(self.engine, self.parser)
+        self.journal = RunJournal('rna_contact_scraper')
         
         # Rotation User-Agents
         self.user_agents = [
@@ -27,11 +42,10 @@ class RnaContactScraper:
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0'
         ]
         
-        self.search_engines = [
-            self._search_google,
-            self._search_qwant, 
-            self._search_bing
-        ]
+        # Moteurs choisis par rendement observé (emails/s), partagés entre finders
+        self.backends = get_backend_selector()
+        # Modèle de requête au meilleur taux de réussite (adaptive_queries=False: ordre fixe)
+        self.query_planner = QueryPlanner('rna_contact_scraper', adaptive=adaptive_queries)
         
         self.association_sites = [
             "helloasso.com",
@@ -59,8 +73,10 @@ class RnaContactScraper:
         
         print(f"🔍 {nom[:40]}... ({ville})")
         
-        # Préparer requêtes de recherche
+        # Préparer requêtes de recherche: une seule, le modèle au meilleur taux de réussite
         search_queries = self._build_search_queries(nom, ville, secteur)
+        plan = self.query_planner.plan(search_queries, association_sector(association), limit=1)
+        template, query = plan.queries[0]
         
         contacts = {
             'email_principal': '',
@@ -71,53 +87,83 @@ class RnaContactScraper:
             'search_success': False
         }
         
-        # Essayer chaque moteur de recherche
-        for search_engine in self.search_engines:
-            if contacts['search_success']:
-                break
-                
+        # Essayer les moteurs du meilleur au moins bon rendement observé
+        tried = set()
+        while not contacts['search_success']:
             try:
-                engine_contacts = search_engine(search_queries, association)
-                if engine_contacts and (engine_contacts.get('email') or engine_contacts.get('website')):
-                    contacts.update({
-                        'email_principal': engine_contacts.get('email', ''),
-                        'telephone': engine_contacts.get('phone', ''),
-                        'site_web': engine_contacts.get('website', ''),
-                        'facebook': engine_contacts.get('facebook', ''),
-                        'search_success': True
-                    })
-                    contacts['contacts_sources'].append(engine_contacts.get('source', 'unknown'))
-                    break
-                    
+                backend, engine_contacts = self._search_backend(query, association, tried)
             except Exception as e:
-                continue
+                break
+            if backend is None:
+                break
+            tried.add(backend.name)
+
+            if engine_contacts and (engine_contacts.get('email') or engine_contacts.get('website')):
+                contacts.update({
+                    'email_principal': engine_contacts.get('email', ''),
+                    'telephone': engine_contacts.get('phone', ''),
+                    'site_web': engine_contacts.get('website', ''),
+                    'facebook': engine_contacts.get('facebook', ''),
+                    'search_success': True
+                })
+                contacts['contacts_sources'].append(engine_contacts.get('source', 'unknown'))
+        
+        plan.record(template, [contacts['email_principal']] if contacts['email_principal'] else [])
+        plan.finish(contacts['email_principal'])
         
         # Si pas de résultat, essayer recherche directe sur sites spécialisés
         if not contacts['search_success']:
             contacts.update(self._search_specialized_sites(nom, ville))
         
+        # Site web sans email: ses pages de contact rapportent plus qu'une autre requête de recherche
+        if contacts['site_web'] and not contacts['email_principal']:
+            site_contacts = self._crawl_association_site(contacts['site_web'], association)
+            if site_contacts:
+                contacts['email_principal'] = site_contacts['email']
+                contacts['telephone'] = contacts['telephone'] or site_contacts['phone']
+                contacts['contacts_sources'].append('Site web')
+                contacts['search_success'] = True
+        
         return contacts
     
+    def _crawl_association_site(self, website, association):
+        """Explorer le site de l'association (accueil et pages de contact): email et téléphone"""
+        headers = {'User-Agent': random.choice(self.user_agents)}
+        try:
+            result = self.site_crawler.crawl(website, headers=headers, engine=self.engine)
+        except Exception as e:
+            return None
+        # Sur son propre site, une adresse sans le nom (gmail...) reste celle de l'association
+        email = self._extract_best_email(result.emails, association) or next(
+            (email.lower() for email in result.emails if self._is_valid_email_format(email)), ''
+        )
+        if not email:
+            return None
+        return {'email': email, 'phone': result.phones[0] if result.phones else ''}
+    
     def _build_search_queries(self, nom, ville, secteur):
-        """Construire les requêtes de recherche optimisées"""
+        """Construire les requêtes de recherche optimisées: couples (modèle, requête)"""
         # Nettoyer le nom d'association
         nom_clean = self._clean_association_name(nom)
         ville_clean = ville.replace('-', ' ')
         
-        queries = [
-            f'"{nom_clean}" {ville_clean} contact email',
-            f'"{nom_clean}" {ville_clean} site internet',
-            f'"{nom_clean}" {ville_clean} association contact',
-            f'{nom_clean} {ville_clean} helloasso',
-            f'{nom_clean} {ville_clean} facebook',
-            f'association "{nom_clean}" {ville_clean}',
+        templates = [
+            '"{nom}" {ville} contact email',
+            '"{nom}" {ville} site internet',
+            '"{nom}" {ville} association contact',
+            '{nom} {ville} helloasso',
+            '{nom} {ville} facebook',
+            'association "{nom}" {ville}',
         ]
         
         # Ajouter requête secteur si pertinent
         if secteur and secteur != 'Autre':
-            queries.append(f'{nom_clean} {ville_clean} {secteur.lower()}')
+            templates.append('{nom} {ville} {secteur}')
         
-        return queries
+        return [
+            (template, template.format(nom=nom_clean, ville=ville_clean, secteur=str(secteur).lower()))
+            for template in templates
+        ]
     
     def _clean_association_name(self, nom):
         """Nettoyer nom association pour recherche"""
@@ -132,252 +178,146 @@ class RnaContactScraper:
         
         return ' '.join(words[:4])  # Max 4 mots
     
-    def _search_google(self, queries, association):
-        """Recherche via Google"""
-        try:
-            # Prendre la meilleure requête
-            query = queries[0]
-            
-            # Headers anti-détection
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            # URL Google
-            google_url = f"https://www.google.com/search?q={quote_plus(query)}&num=20"
-            
-            response = self.session.get(google_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                return self._extract_contacts_from_html(response.text, association, 'Google')
-            
-        except Exception as e:
-            pass
-        
-        return None
-    
-    def _search_qwant(self, queries, association):
-        """Recherche via Qwant (plus respectueux)"""
-        try:
-            query = queries[0]
-            
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml',
-                'Accept-Language': 'fr-FR,fr;q=0.9'
-            }
-            
-            qwant_url = f"https://www.qwant.com/?q={quote_plus(query)}&t=web"
-            
-            response = self.session.get(qwant_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                return self._extract_contacts_from_html(response.text, association, 'Qwant')
-                
-        except Exception as e:
-            pass
+    def _search_backend(self, query, association, tried):
+        """Recherche via le meilleur moteur non encore essayé: (moteur, contacts)"""
+        # Headers anti-détection
+        headers = {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
         
-        return None
+        backend, contacts = self.backends.search(
+            self.engine, query, lambda html: self._extract_contacts_from_html(html, association, '', self.parser),
+            headers=headers, max_results=20, exclude=tried,
+            count=lambda found: 1 if found.get('email') else 0
+        )
+        if contacts:
+            contacts['source'] = backend.label
+        return backend, contacts
     
-    def _search_bing(self, queries, association):
-        """Recherche via Bing"""
+    def _extract_contacts_from_html(self, html, association, source, parser=None):
+        """Extraire contacts depuis HTML de résultats (une seule analyse de la page)
+
+        parser: pool de processus (ParsePool) où analyser la page, sinon sur place.
+        """
         try:
-            query = queries[0]
-            
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml'
-            }
-            
-            bing_url = f"https://www.bing.com/search?q={quote_plus(query)}"
-            
-            response = self.session.get(bing_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                return self._extract_contacts_from_html(response.text, association, 'Bing')
-                
+            page = parser.run(extract_page, html) if parser else extract_page(html)
+            return self._contacts_from_candidates(
+                association, source, page.emails, page.phones, page.links, page.social.get('facebook', '')
+            )
         except Exception as e:
-            pass
-        
-        return None
+            return None
     
-    def _extract_contacts_from_html(self, html, association, source):
-        """Extraire contacts depuis HTML de résultats"""
+    def _extract_contacts_from_html_reference(self, html, association, source):
+        """Version historique (deux analyses html.parser + regex sur le HTML brut), pour benchmark_extract.py"""
         try:
             soup = BeautifulSoup(html, 'html.parser')
             text = soup.get_text()
-            
-            # Extraire email
-            email = self._extract_best_email(text, association)
-            
-            # Extraire téléphone
-            phone = self._extract_phone(text)
-            
-            # Extraire site web
-            website = self._extract_best_website(html, association)
-            
-            # Extraire Facebook
-            facebook = self._extract_facebook(html, association)
-            
-            if email or website:
-                return {
-                    'email': email,
-                    'phone': phone,
-                    'website': website,
-                    'facebook': facebook,
-                    'source': source
-                }
-                
+            links = [link.get('href', '') for link in BeautifulSoup(html, 'html.parser').find_all('a', href=True)]
+            facebook = re.findall(r'https://(?:www\.)?facebook\.com/[^/\s"<>]+', html)
+            return self._contacts_from_candidates(
+                association, source, re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
+                self._extract_phone_reference(text), links,
+                facebook[0] if facebook else ''
+            )
         except Exception as e:
-            pass
+            return None
+    
+    def _contacts_from_candidates(self, association, source, emails, phones, links, facebook):
+        """Choisir email, téléphone et site parmi les candidats extraits d'une page"""
+        # Extraire email
+        email = self._extract_best_email(emails, association)
+        
+        # Extraire téléphone
+        phone = phones[0] if phones else ""
+        
+        # Extraire site web
+        website = self._extract_best_website(links, association)
+        
+        if email or website:
+            return {
+                'email': email,
+                'phone': phone,
+                'website': website,
+                'facebook': facebook,
+                'source': source
+            }
         
         return None
     
-    def _extract_best_email(self, text, association):
-        """Extraire le meilleur email pour l'association"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        
+    def _extract_best_email(self, emails, association):
+        """Choisir le meilleur email pour l'association parmi les emails de la page"""
         if not emails:
             return ""
         
-        nom_words = association['nom'].lower().split()[:3]
-        ville_clean = association['ville'].lower().replace('-', '')
-        
-        # Scorer les emails
-        scored_emails = []
-        
-        for email in emails:
-            if not self._is_valid_email_format(email):
-                continue
-                
-            email_lower = email.lower()
-            score = 0
-            
-            # Points pour mots du nom d'association
-            for word in nom_words:
-                if len(word) > 3 and word in email_lower:
-                    score += 10
-            
-            # Points pour ville
-            if len(ville_clean) > 4 and ville_clean in email_lower:
-                score += 8
-            
-            # Points pour domaines associations
-            if '.asso.fr' in email_lower:
-                score += 15
-            elif '.org' in email_lower:
-                score += 10
-            elif '.fr' in email_lower:
-                score += 5
-            
-            # Points pour patterns association
-            if any(pattern in email_lower for pattern in ['association', 'asso', 'club', 'amicale']):
-                score += 5
-            
-            # Pénalités pour emails génériques
-            if any(generic in email_lower for generic in ['contact@gmail', 'info@gmail', 'webmaster', 'noreply']):
-                score -= 20
-            
-            if score > 0:
-                scored_emails.append((email, score))
+        # Tous les emails de la page scorés en un lot; seuls les scores positifs sont retenus
+        valid = [email for email in emails if self._is_valid_email_format(email)]
+        scored_emails = self.scorer.best(association['nom'], association['ville'], valid, minimum=0)
         
         if scored_emails:
             # Retourner email avec meilleur score
-            best_email = sorted(scored_emails, key=lambda x: x[1], reverse=True)[0][0]
-            return best_email.lower()
+            return scored_emails[0][0].lower()
         
         return ""
     
     def _extract_phone(self, text):
         """Extraire numéro de téléphone français"""
-        # Patterns téléphone français
-        phone_patterns = [
-            r'0[1-9](?:[.\s-]?\d{2}){4}',
-            r'\+33[.\s-]?[1-9](?:[.\s-]?\d{2}){4}',
-            r'(?:Tel|Tél|Téléphone|Phone)[\s:]*0[1-9](?:[.\s-]?\d{2}){4}'
-        ]
-        
-        for pattern in phone_patterns:
-            match = re.search(pattern, text)
-            if match:
-                phone = match.group()
-                # Nettoyer le numéro
-                phone = re.sub(r'[^\d+]', '', phone)
-                if len(phone) >= 10:
-                    return phone
-        
-        return ""
+        phones = find_phones(text)
+        return phones[0] if phones else ""
     
-    def _extract_best_website(self, html, association):
-        """Extraire le meilleur site web"""
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
+    def _extract_phone_reference(self, text):
+        """Version historique (motifs recompilés, sans préfiltre), pour benchmark_extract.py"""
+        phones = []
+        for pattern in [r'0[1-9](?:[.\s-]?\d{2}){4}', r'\+33[.\s-]?[1-9](?:[.\s-]?\d{2}){4}',
+                        r'(?:Tel|Tél|Téléphone|Phone)[\s:]*0[1-9](?:[.\s-]?\d{2}){4}']:
+            for match in re.findall(pattern, text):
+                phone = re.sub(r'[^\d+]', '', match)
+                if len(phone) >= 10 and phone not in phones:
+                    phones.append(phone)
+        return phones
+    
+    def _extract_best_website(self, links, association):
+        """Choisir le meilleur site web parmi les liens de la page"""
+        nom_words = association['nom'].lower().split()[:2]
+        scored_websites = []
+        
+        for url in links:
+            if not url.startswith('http'):
+                continue
             
-            # Chercher liens dans les résultats
-            links = soup.find_all('a', href=True)
+            # Filtrer URLs non pertinentes
+            if any(exclude in url.lower() for exclude in ['google.', 'bing.', 'qwant.', 'wikipedia.', 'facebook.com/tr']):
+                continue
             
-            nom_words = association['nom'].lower().split()[:2]
-            scored_websites = []
+            url_lower = url.lower()
+            score = 0
             
-            for link in links:
-                url = link.get('href', '')
-                if not url.startswith('http'):
-                    continue
-                
-                # Filtrer URLs non pertinentes
-                if any(exclude in url.lower() for exclude in ['google.', 'bing.', 'qwant.', 'wikipedia.', 'facebook.com/tr']):
-                    continue
-                
-                url_lower = url.lower()
-                score = 0
-                
-                # Points pour nom association dans URL
-                for word in nom_words:
-                    if len(word) > 3 and word in url_lower:
-                        score += 10
-                
-                # Points pour sites spécialisés associations
-                if any(site in url_lower for site in self.association_sites):
-                    score += 15
-                
-                # Points pour domaines français
-                if '.fr' in url_lower:
-                    score += 5
-                
-                if '.org' in url_lower:
-                    score += 3
-                
-                if score > 5:
-                    scored_websites.append((url, score))
+            # Points pour nom association dans URL
+            for word in nom_words:
+                if len(word) > 3 and word in url_lower:
+                    score += 10
             
-            if scored_websites:
-                best_website = sorted(scored_websites, key=lambda x: x[1], reverse=True)[0][0]
-                return best_website
-                
-        except Exception as e:
-            pass
-        
-        return ""
-    
-    def _extract_facebook(self, html, association):
-        """Extraire page Facebook"""
-        try:
-            # Pattern Facebook
-            fb_pattern = r'https://(?:www\.)?facebook\.com/[^/\s"<>]+'
-            matches = re.findall(fb_pattern, html)
+            # Points pour sites spécialisés associations
+            if any(site in url_lower for site in self.association_sites):
+                score += 15
             
-            if matches:
-                # Prendre la première page Facebook trouvée
-                return matches[0]
-                
-        except Exception as e:
-            pass
+            # Points pour domaines français
+            if '.fr' in url_lower:
+                score += 5
+            
+            if '.org' in url_lower:
+                score += 3
+            
+            if score > 5:
+                scored_websites.append((url, score))
+        
+        if scored_websites:
+            best_website = sorted(scored_websites, key=lambda x: x[1], reverse=True)[0][0]
+            return best_website
         
         return ""
     
@@ -418,7 +358,7 @@ class RnaContactScraper:
             url = f"https://www.helloasso.com/associations/recherche?q={quote_plus(query)}"
             
             headers = {'User-Agent': random.choice(self.user_agents)}
-            response = self.session.get(url, headers=headers, timeout=10)
+            response = self.engine.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -429,21 +369,25 @@ class RnaContactScraper:
                 if asso_links:
                     # Suivre le premier lien
                     detail_url = urljoin("https://www.helloasso.com", asso_links[0].get('href'))
-                    detail_response = self.session.get(detail_url, headers=headers, timeout=10)
+                    detail_response = self.engine.get(detail_url, headers=headers, timeout=10)
                     
                     if detail_response.status_code == 200:
-                        detail_soup = BeautifulSoup(detail_response.text, 'html.parser')
-                        detail_text = detail_soup.get_text()
+                        detail = self.parser.run(extract_page, detail_response.text)
                         
                         # Extraire contacts de la page de détail
-                        email = self._extract_email_from_text(detail_text)
-                        phone = self._extract_phone(detail_text)
+                        email = self._extract_email_from_text(detail.text)
+                        phone = self._extract_phone(detail.text)
+                        # Site propre de l'association s'il est indiqué (exploré ensuite si pas d'email)
+                        website = self._extract_best_website(
+                            [link for link in detail.links if self.site_crawler.should_crawl(link)],
+                            {'nom': nom, 'ville': ville}
+                        )
                         
-                        if email or phone:
+                        if email or phone or website:
                             return {
                                 'email_principal': email,
                                 'telephone': phone,
-                                'site_web': detail_url
+                                'site_web': website or detail_url
                             }
             
         except Exception as e:
@@ -459,7 +403,7 @@ class RnaContactScraper:
             url = f"https://www.net1901.org/recherche?q={quote_plus(query)}"
             
             headers = {'User-Agent': random.choice(self.user_agents)}
-            response = self.session.get(url, headers=headers, timeout=10)
+            response = self.engine.get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -483,10 +427,7 @@ class RnaContactScraper:
     
     def _extract_email_from_text(self, text):
         """Extraire email depuis texte simple"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        
-        for email in emails:
+        for email in find_emails(text):
             if self._is_valid_email_format(email):
                 return email.lower()
         
@@ -507,8 +448,21 @@ class RnaContactScraper:
         email_lower = email.lower()
         return not any(pattern in email_lower for pattern in invalid_patterns)
     
-    def process_rna_contacts(self, filepath, max_associations=100, start_index=0):
-        """Traitement complet recherche contacts RNA"""
+    def process_rna_contacts(self, filepath=None, max_associations=100, start_index=0, resume=False):
+        """Traitement complet recherche contacts RNA (resume: reprendre le dernier lancement journalisé)"""
+        if resume:
+            params, done, _ = self.journal.resume()
+            if params is None:
+                print(f"❌ Aucun lancement à reprendre ({self.journal.path})")
+                return []
+            filepath, max_associations, start_index = (
+                params['filepath'], params['max_associations'], params['start_index']
+            )
+        else:
+            done = set()
+            self.journal.start_run({'filepath': filepath, 'max_associations': max_associations,
+                                    'start_index': start_index})
+        
         print("🎯 RECHERCHE CONTACTS ASSOCIATIONS RNA")
         print("=" * 60)
         print("📋 Source: Associations RNA officielles")
@@ -524,7 +478,10 @@ class RnaContactScraper:
         total_associations = len(associations)
         end_index = min(start_index + max_associations, total_associations)
         
-        associations_to_process = associations[start_index:end_index]
+        associations_to_process = [
+            association for association in associations[start_index:end_index]
+            if journal_key(association) not in done
+        ]
         
         print(f"\n📊 TRAITEMENT:")
         print(f"  • Total RNA: {total_associations}")
@@ -532,51 +489,68 @@ class RnaContactScraper:
         print(f"  • À traiter: {len(associations_to_process)}")
         print(f"  • Index fin: {end_index}")
         
-        # Traitement avec recherche
+        # Traitement avec recherche: plusieurs associations en vol,
+        # délais remplacés par les limites par hôte du moteur
+        print(f"  • En parallèle: {self.engine.max_in_flight}")
         updated_associations = []
         found_contacts = 0
         
-        for i, association in enumerate(associations_to_process):
-            try:
-                print(f"\n{start_index + i + 1}/{total_associations} - ", end="")
-                
-                # Rechercher contacts
-                contacts = self.search_association_contacts(association)
-                
-                # Mettre à jour association
-                association.update(contacts)
-                
-                if contacts.get('email_principal') or contacts.get('site_web'):
-                    found_contacts += 1
-                    print(f"  ✅ Contacts trouvés!")
-                else:
-                    print(f"  ⚠️ Aucun contact")
-                
+        # Déjà résolues par un finder (contact trouvé, ou échec non expiré): aucune requête
+        associations_to_process, resolved = self.store.partition_resolved(associations_to_process)
+        for association, resolution in resolved:
+            association.update({
+                'email_principal': resolution['email'],
+                'telephone': resolution['telephone'],
+                'site_web': resolution['site_web'],
+                'contacts_sources': [resolution['etape']],
+                'search_success': resolution['statut'] != 'not_found'
+            })
+            updated_associations.append(association)
+        print(f"  • Déjà résolues: {len(resolved)} (dont {sum(r['statut'] != 'not_found' for _, r in resolved)} avec contact)")
+        
+        def on_result(index, association, contacts):
+            # Appelé dans la boucle asyncio, une association à la fois
+            nonlocal found_contacts
+            print(f"{index + 1}/{len(associations_to_process)} - {association['nom'][:40]}... ", end="")
+            
+            if contacts is None:  # Erreur déjà signalée par le moteur
+                self.journal.record(association, 'error')
                 updated_associations.append(association)
-                
-                # Délais pour éviter blocage
-                if i % 5 == 0 and i > 0:
-                    print(f"  ⏳ Pause courte...")
-                    time.sleep(3)
-                else:
-                    time.sleep(random.uniform(1, 2))
-                
-            except Exception as e:
-                print(f"  ❌ Erreur: {e}")
-                updated_associations.append(association)
-        
-        # Sauvegarder résultats
+                return
+            
+            # Mettre à jour association
+            association.update(contacts)
+            
+            found = bool(contacts.get('email_principal') or contacts.get('site_web'))
+            if found:
+                found_contacts += 1
+                print(f"✅ Contacts trouvés!")
+            else:
+                print(f"⚠️ Aucun contact")
+            
+            self.store.record_search(
+                association, 'rna_contact_scraper', 'found' if found else 'not_found',
+                ', '.join(contacts.get('contacts_sources', [])), contacts if found else None
+            )
+            self.journal.record(association, 'found' if found else 'not_found', contacts if found else None)
+            
+            updated_associations.append(association)
+        
+        self.engine.run(associations_to_process, self.search_association_contacts, on_result=on_result)
+        self.engine.report()
+        self.parser.report()
+        self.site_crawler.report()
+        self.backends.report()
+        self.query_planner.save_run()
+        self.query_planner.report()
+        
+        # Résultats enregistrés au fil de l'eau dans la base
         if updated_associations:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-            filename = f"rna_with_contacts_{start_index}_{end_index}_{timestamp}.csv"
-            
-            self.data_manager.save_to_csv(updated_associations, filename)
-            
             # Statistiques
             success_rate = (found_contacts / len(updated_associations) * 100) if updated_associations else 0
             
             print(f"\n🎉 RECHERCHE TERMINÉE")
-            print(f"📁 Fichier: data/{filename}")
+            print(f"🗄️ Base: {self.store.db_path}")
             print(f"📊 Traités: {len(updated_associations)}")
             print(f"📧 Contacts trouvés: {found_contacts}")
             print(f"📈 Taux de succès: {success_rate:.1f}%")
@@ -594,7 +568,8 @@ class RnaContactScraper:
 
 def main():
     """Fonction principale"""
-    scraper = RnaContactScraper()
+    # --fixed-queries: ordre fixe des requêtes (mesure de référence avant apprentissage)
+    scraper = RnaContactScraper(adaptive_queries='--fixed-queries' not in sys.argv)
     
     print("🎯 RECHERCHE CONTACTS RNA")
     print("=" * 60)
@@ -602,6 +577,12 @@ def main():
     print("🔍 Recherche intelligente par nom + ville")
     print("📧 Extraction emails réels")
     
+    # Reprise automatique du dernier lancement (aucune saisie d'index)
+    if '--resume' in sys.argv:
+        associations = scraper.process_rna_contacts(resume=True)
+        print(f"\n🎉 Reprise terminée: {len(associations)} associations traitées")
+        return
+    
     # Paramètres
     filepath = "data/rna_associations_processed_20250713_1548.csv"
     
@@ -0,0 +1,233 @@
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import TARGET_DEPARTMENTS
+from scrapers.rna_processor import RnaAssociationProcessor
+from utils.perf import ThroughputMeter, peak_rss_mb
+from utils.rna_cache import RnaTableCache
+
+
+def _clean_department(task):
+    """Worker: nettoyer un département (les recherches restent dans le processus parent)
+
+    Fonction de module pour être transmissible aux processus du pool.
+    """
+    departement, filepath, output_dir = task
+    start = time.perf_counter()
+
+    processor = RnaAssociationProcessor(search=False)
+    df = processor.cache.load_cleaned(filepath, processor, departement)
+
+    partition_dir = os.path.join(output_dir, f"departement={departement}")
+    os.makedirs(partition_dir, exist_ok=True)
+    partition_path = os.path.join(partition_dir, "associations.csv")
+
+    df[sorted(df.columns)].to_csv(partition_path, index=False, encoding='utf-8')
+    counts = processor.count_statistics(df)
+
+    return {
+        'departement': departement,
+        'fichier': partition_path,
+        'counts': counts,
+        'duree': time.perf_counter() - start,
+        'pic_rss_mo': peak_rss_mb()
+    }
+
+
+class RnaDepartmentPool:
+    """Traitement RNA multi-départements réparti sur un pool de processus
+
+    Le nettoyage est réparti sur les processus; la recherche de contacts
+    reste dans le processus parent, avec un seul moteur et un seul limiteur
+    de débit: le débit envoyé à chaque hôte ne dépend pas du nombre de
+    processus.
+    """
+
+    def __init__(self, data_dir="data", workers=None):
+        self.data_dir = data_dir
+        self.workers = workers or os.cpu_count() or 1
+
+    def discover_department_files(self, directory, departements=None):
+        """Fichiers RNA par département d'un dossier (..._dpt_XX.csv)"""
+        files = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+            match = re.search(r'dpt_?(\w{2,3})\.csv$', os.path.basename(path))
+            if not match:
+                continue
+            departement = match.group(1)
+            if departements is None or departement in departements:
+                files[departement] = path
+        return files
+
+    def partition_national_file(self, filepath, departements=None, chunksize=200000):
+        """Découper un export national en un fichier par département (lecture en streaming)"""
+        print(f"✂️ PARTITIONNEMENT PAR DÉPARTEMENT")
+        print("-" * 40)
+
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        partition_dir = os.path.join(self.data_dir, "partitions", stem)
+        os.makedirs(partition_dir, exist_ok=True)
+        for old in glob.glob(os.path.join(partition_dir, "*.csv")):
+            os.remove(old)
+
+        meter = ThroughputMeter("partitionnement")
+        files = {}
+
+        for chunk in RnaAssociationProcessor.iter_rna_chunks(filepath, chunksize):
+            departements_chunk = RnaAssociationProcessor.departement_column(chunk)
+            kept = 0
+
+            for departement, rows in chunk.groupby(departements_chunk.values, sort=False):
+                if not departement or (departements is not None and departement not in departements):
+                    continue
+                path = os.path.join(partition_dir, f"{stem}_dpt_{departement}.csv")
+                rows.to_csv(path, mode='a', header=departement not in files, index=False, encoding='utf-8')
+                files[departement] = path
+                kept += len(rows)
+
+            meter.add(len(chunk), kept)
+
+        meter.report()
+        print(f"✅ {len(files)} départements partitionnés dans {partition_dir}")
+        return dict(sorted(files.items()))
+
+    def process_departments(self, source, departements=TARGET_DEPARTMENTS, search_contacts=False, max_searches=0):
+        """Nettoyer tous les départements en parallèle, sortie partitionnée par département
+
+        source: dossier de fichiers par département ou export national unique.
+        departements=None: tous les départements présents.
+        """
+        print("🗺️ TRAITEMENT RNA MULTI-DÉPARTEMENTS")
+        print("=" * 60)
+        print(f"📄 Source: {source}")
+        print(f"⚙️ Processus: {self.workers}")
+
+        if os.path.isdir(source):
+            files = self.discover_department_files(source, departements)
+        else:
+            files = self.partition_national_file(source, departements)
+
+        if not files:
+            print("❌ Aucun fichier départemental trouvé")
+            return None
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+        output_dir = os.path.join(self.data_dir, f"rna_departements_{timestamp}")
+        tasks = [(departement, path, output_dir) for departement, path in files.items()]
+
+        # Empreintes calculées ici: les workers ne font que lire l'index partagé du cache
+        cache = RnaTableCache()
+        for path in files.values():
+            cache.file_hash(path)
+
+        print(f"🚀 {len(tasks)} départements à traiter")
+        start = time.perf_counter()
+        results = []
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(_clean_department, task): task[0] for task in tasks}
+            for future in as_completed(futures):
+                departement = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"  ❌ Département {departement}: {e}")
+                    continue
+                results.append(result)
+                print(f"  ✅ Département {departement}: {result['counts']['total']} associations "
+                      f"({result['duree']:.1f}s)")
+
+        wall_time = time.perf_counter() - start
+        search_time = 0.0
+        if search_contacts and max_searches > 0 and results:
+            started = time.perf_counter()
+            self.search_departments(results, max_searches)
+            search_time = time.perf_counter() - started
+        summary = self._write_summary(results, output_dir, wall_time, search_time)
+
+        print(f"\n🎉 TRAITEMENT MULTI-DÉPARTEMENTS TERMINÉ")
+        print(f"📁 Dossier: {output_dir}")
+        print(f"\n📈 STATISTIQUES FUSIONNÉES:")
+        for key, value in summary['statistiques'].items():
+            print(f"  • {key}: {value}")
+        print(f"\n⚡ PERFORMANCES:")
+        for key, value in summary['performances'].items():
+            print(f"  • {key}: {value}")
+
+        return summary
+
+    def search_departments(self, results, max_searches):
+        """Rechercher les contacts département par département (max_searches chacun)
+
+        Un seul processeur pour tous: moteur, limiteur de débit et base de
+        leads partagés. Chaque partition est réécrite avec les contacts trouvés.
+        """
+        processor = RnaAssociationProcessor()
+        for result in sorted(results, key=lambda r: r['departement']):
+            print(f"\n🔍 Département {result['departement']}")
+            df = pd.read_csv(result['fichier'], encoding='utf-8', dtype=str, keep_default_na=False)
+            associations = processor.search_association_contacts(processor._frame_to_records(df), max_searches)
+            processor.data_manager.save_to_csv_direct(associations, result['fichier'])
+            result['counts'] = processor.count_statistics(associations)
+
+    def _write_summary(self, results, output_dir, wall_time, search_time=0.0):
+        """Résumé fusionné (generate_statistics) et mesures de parallélisme"""
+        merged = RnaAssociationProcessor.merge_statistics([r['counts'] for r in results])
+        busy_time = sum(r['duree'] for r in results)
+
+        summary = {
+            'statistiques': RnaAssociationProcessor.format_statistics(merged),
+            'par_departement': {
+                r['departement']: RnaAssociationProcessor.format_statistics(r['counts'])
+                for r in sorted(results, key=lambda r: r['departement'])
+            },
+            'performances': {
+                'Durée totale': f"{wall_time + search_time:.1f}s",
+                'Durée des recherches (processus parent)': f"{search_time:.1f}s",
+                'Temps cumulé des workers': f"{busy_time:.1f}s",
+                # Proche du nombre de processus quand le travail se répartit bien
+                'Parallélisme effectif': f"x{busy_time / wall_time:.1f}" if wall_time > 0 else "n/a",
+                'Associations/s': f"{merged['total'] / wall_time:,.0f}" if wall_time > 0 else "n/a"
+            }
+        }
+
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "summary.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        return summary
+
+
+def main():
+    """Fonction principale"""
+    print("🗺️ PROCESSEUR RNA MULTI-DÉPARTEMENTS")
+    print("=" * 60)
+    print(f"🏛️ {len(TARGET_DEPARTMENTS)} départements cibles")
+
+    print(f"Dossier de fichiers départementaux ou export national: ", end="")
+    source = input().strip()
+    if not source or not os.path.exists(source):
+        print("🚪 Source introuvable, traitement annulé")
+        return
+
+    print(f"Nombre de processus (défaut: {os.cpu_count()}): ", end="")
+    workers = int(input().strip() or os.cpu_count() or 1)
+
+    print(f"Tous les départements présents ? (oui/non, défaut: départements cibles): ", end="")
+    departements = None if input().strip().lower() in ['oui', 'o', 'yes', 'y'] else TARGET_DEPARTMENTS
+
+    pool = RnaDepartmentPool(workers=workers)
+    pool.process_departments(source, departements)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,58 @@
-import pandas as pd
 import os
-import glob
 from datetime import datetime
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.data_manager import DataManager
+from utils.lead_store import RNA_CONTACT_ETAPES, LeadStore
 
 class RnaEmailExtractor:
     """Extracteur final d'emails RNA pour campagne"""
     
     def __init__(self):
         self.data_manager = DataManager()
+        self.store = LeadStore()
     
     def extract_valid_emails(self):
-        """Extraire uniquement les emails valides des fichiers RNA"""
+        """Extraire uniquement les emails valides de la base de leads"""
         print("📧 EXTRACTION EMAILS VALIDES RNA")
         print("=" * 50)
         
-        # Rechercher fichiers avec contacts
-        contact_files = glob.glob("data/rna_with_contacts_*.csv")
+        # Anciens fichiers rna_with_contacts_* pas encore dans la base
+        self.store.import_legacy_files(["data/rna_with_contacts_*.csv"])
         
-        if not contact_files:
-            print("❌ Aucun fichier de contacts trouvé")
+        # Un contact par email, directement depuis la base (contacts du scraper RNA seulement)
+        df = self.store.email_contacts(etapes=RNA_CONTACT_ETAPES, contact_types=('Association',))
+        
+        if df.empty:
+            print(f"❌ Aucun contact dans la base ({self.store.db_path})")
             return []
         
-        valid_contacts = []
+        # Vérifier format email
+        valid_emails = df[df['email'].str.contains('@', regex=False)
+                          & df['email'].str.contains('.', regex=False)
+                          & (df['email'].str.len() > 5)]
+        print(f"🗄️ {len(valid_emails)} emails valides dans la base")
         
-        for file in contact_files:
-            try:
-                df = pd.read_csv(file)
-                
-                # Filtrer emails valides (non vides, non nan)
-                valid_emails = df[
-                    (df['email_principal'].notna()) & 
-                    (df['email_principal'] != '') & 
-                    (df['email_principal'] != 'nan')
-                ]
-                
-                print(f"📁 {os.path.basename(file)}: {len(valid_emails)} emails valides")
-                
-                for _, row in valid_emails.iterrows():
-                    email = str(row['email_principal']).strip()
-                    
-                    # Vérifier format email
-                    if '@' in email and '.' in email and len(email) > 5:
-                        contact = {
-                            'nom_association': str(row['nom']).strip(),
-                            'email': email.lower(),
-                            'ville': str(row['ville']).strip(),
-                            'secteur': str(row.get('secteur_nom', 'Autre')).strip(),
-                            'telephone': str(row.get('telephone', '')).strip(),
-                            'site_web': str(row.get('site_web', '')).strip(),
-                            'adresse': str(row.get('adresse', '')).strip(),
-                            'code_postal': str(row.get('code_postal', '')).strip(),
-                            'objet': str(row.get('objet', ''))[:200],
-                            'departement': '01',
-                            'source': 'RNA_Scraping_Dpt01',
-                            'date_extraction': str(row.get('date_extraction', '')),
-                            'search_method': ', '.join(eval(str(row.get('contacts_sources', '[]'))) if str(row.get('contacts_sources', '[]')) != 'nan' else [])
-                        }
-                        
-                        valid_contacts.append(contact)
-                        print(f"  ✅ {contact['nom_association'][:40]}... → {contact['email']}")
-                
-            except Exception as e:
-                print(f"❌ Erreur {file}: {e}")
+        valid_contacts = []
+        for row in valid_emails.to_dict('records'):
+            contact = {
+                'nom_association': row['nom_association'],
+                'email': row['email'],
+                'ville': row['ville'],
+                'secteur': row['secteur'] or 'Autre',
+                'telephone': row['telephone'],
+                'site_web': row['site_web'],
+                'adresse': row['adresse'],
+                'code_postal': row['code_postal'],
+                'objet': row['objet'][:200],
+                'departement': row['departement'] or '01',
+                'source': row['source'] or 'RNA_Scraping_Dpt01',
+                'date_extraction': row['date_extraction'],
+                'search_method': row['search_method']
+            }
+            valid_contacts.append(contact)
+            print(f"  ✅ {contact['nom_association'][:40]}... → {contact['email']}")
         
         # Déduplication par email
         unique_contacts = self._deduplicate_by_email(valid_contacts)
@@ -0,0 +1,230 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.rna_processor import RnaAssociationProcessor
+from utils.rna_state import RnaIngestionState, STATUT_ACTIVE, STATUT_DISSOUTE, STATUT_EN_ATTENTE, STATUT_RETIREE
+
+# Colonne de date de mise à jour selon la version de l'export RNA
+DATE_MAJ_COLUMNS = ['date_maj', 'maj_time']
+
+# Position RNA: D = dissoute, S = supprimée
+DISSOLVED_POSITIONS = {'D', 'S'}
+
+# date_disso sans dissolution: vide, NaN lu en texte ('nan') ou date sentinelle
+NO_DISSOLUTION_DATES = {'', 'nan', 'nat', 'none'}
+NO_DISSOLUTION_SENTINEL = '0001-01-01'
+
+# Contacts d'une association gardés quand une nouvelle version la remplace
+CONTACT_COLUMNS = ['email', 'phone', 'website', 'email_principal', 'telephone', 'site_web']
+
+# Associations du delta sans recherche aboutie: à reprendre au passage suivant
+UNSEARCHED_STATUTS = {'pending', 'error'}
+
+
+class RnaIncrementalIngestor:
+    """Ingestion incrémentale des instantanés RNA
+
+    Seules les associations nouvelles ou modifiées (date_maj / date_publi)
+    depuis le dernier passage sont nettoyées et envoyées à la recherche de
+    contacts. Les dissolutions et les disparitions du fichier sont reportées
+    dans la table courante du périmètre (colonne statut_rna).
+    """
+
+    def __init__(self, data_dir="data", state=None):
+        self.data_dir = data_dir
+        self.processor = RnaAssociationProcessor()
+        self.state = state or RnaIngestionState(os.path.join(data_dir, "rna_ingestion.db"))
+
+    def snapshot_versions(self, raw):
+        """Version de chaque association de l'instantané: rna_id, date_maj, date_publi, dissoute"""
+        text = self.processor._text_column
+        date_maj_column = next((c for c in DATE_MAJ_COLUMNS if c in raw.columns), None)
+
+        snapshot = pd.DataFrame({
+            'rna_id': text(raw, 'id'),
+            'date_maj': text(raw, date_maj_column) if date_maj_column else '',
+            'date_publi': text(raw, 'date_publi'),
+        })
+        # La position fait foi; date_disso ne sert que si la position est absente
+        position = text(raw, 'position').str.upper()
+        has_position = ~position.isin({'', 'NAN'})
+        date_disso = text(raw, 'date_disso')
+        dated = ~(date_disso.str.lower().isin(NO_DISSOLUTION_DATES)
+                  | date_disso.str.startswith(NO_DISSOLUTION_SENTINEL))
+        snapshot['dissoute'] = (position.isin(DISSOLVED_POSITIONS) | (~has_position & dated)).values
+
+        # Identifiant absent: impossible à suivre, traité comme nouveau à chaque fois
+        return snapshot[snapshot['rna_id'] != ''].drop_duplicates('rna_id', keep='last')
+
+    def compute_delta(self, snapshot, previous):
+        """Classer l'instantané par rapport à l'état connu
+
+        Retourne (masque à traiter, masque dissoutes à marquer, ids retirés).
+        """
+        known = snapshot.merge(
+            previous, on='rna_id', how='left', suffixes=('', '_prec'), indicator=True
+        )
+        is_new = (known['_merge'] == 'left_only').values
+        changed = ~is_new & (
+            (known['date_maj'] != known['date_maj_prec'])
+            | (known['date_publi'] != known['date_publi_prec'])
+            | (known['statut'] != STATUT_ACTIVE)
+        ).values
+        dissoute = snapshot['dissoute'].values
+
+        to_process = (is_new | changed) & ~dissoute
+        to_dissolve = dissoute & (is_new | (known['statut'] != STATUT_DISSOUTE).values)
+
+        active_before = previous[previous['statut'] != STATUT_RETIREE]['rna_id']
+        removed = active_before[~active_before.isin(snapshot['rna_id'])].tolist()
+
+        return to_process, to_dissolve, removed
+
+    def ingest(self, filepath, departement=None, search_contacts=True, max_searches=50):
+        """Traiter uniquement le delta d'un instantané RNA"""
+        print("🔁 INGESTION RNA INCRÉMENTALE")
+        print("=" * 60)
+        print(f"📄 Instantané: {filepath}")
+
+        start = time.perf_counter()
+        departement = departement or self.processor.cache._guess_departement(filepath)
+        raw = self.processor.cache.load_raw(filepath, departement)
+
+        snapshot = self.snapshot_versions(raw)
+        previous = self.state.load(departement)
+        to_process, to_dissolve, removed = self.compute_delta(snapshot, previous)
+
+        print(f"📊 {len(snapshot)} associations dans l'instantané, {len(previous)} déjà connues")
+        print(f"  • Nouvelles ou modifiées: {int(to_process.sum())}")
+        print(f"  • Dissoutes: {int(to_dissolve.sum())}")
+        print(f"  • Retirées du RNA: {len(removed)}")
+
+        # Nettoyage et recherche limités au delta
+        delta_ids = set(snapshot['rna_id'][to_process])
+        raw_ids = self.processor._text_column(raw, 'id')
+        delta_raw = raw[(raw_ids.isin(delta_ids) | (raw_ids == '')).values]
+        clean_departement = None if departement == 'all' else departement
+        associations = self.processor._frame_to_records(
+            self.processor.clean_rna_dataframe(delta_raw, clean_departement)
+        )
+
+        if search_contacts and associations:
+            associations = self.processor.search_association_contacts(associations, max_searches)
+
+        current_path = self.update_current_table(
+            departement, associations,
+            dissolved_ids=snapshot['rna_id'][to_dissolve].tolist(),
+            removed_ids=removed
+        )
+
+        # État mis à jour en dernier: une interruption rejoue le même delta.
+        # Les associations non recherchées restent en attente (reprises au passage suivant)
+        processed = to_process | to_dissolve
+        pending_ids = {assoc['rna_id'] for assoc in associations
+                       if assoc.get('statut_recherche') in UNSEARCHED_STATUTS}
+        statuts = pd.Series(STATUT_ACTIVE, index=snapshot.index).where(~snapshot['dissoute'], STATUT_DISSOUTE)
+        statuts = statuts.where(~snapshot['rna_id'].isin(pending_ids), STATUT_EN_ATTENTE)
+        self.state.record(departement, snapshot[processed], statuts[processed])
+        self.state.mark(departement, removed, STATUT_RETIREE)
+
+        duration = time.perf_counter() - start
+        summary = {
+            'Associations dans l\'instantané': len(snapshot),
+            'Nouvelles ou modifiées': int(to_process.sum()),
+            'Nettoyées (delta)': len(associations),
+            'En attente de recherche': len(pending_ids),
+            'Dissoutes marquées': int(to_dissolve.sum()),
+            'Retirées marquées': len(removed),
+            'Inchangées ignorées': int(len(snapshot) - processed.sum()),
+            'Part du département retraitée': f"{to_process.mean() * 100:.1f}%" if len(snapshot) else "0%",
+            'Durée': f"{duration:.1f}s"
+        }
+
+        print(f"\n🎉 INGESTION INCRÉMENTALE TERMINÉE")
+        print(f"📁 Table courante: {current_path}")
+        for key, value in summary.items():
+            print(f"  • {key}: {value}")
+
+        return summary
+
+    def update_current_table(self, departement, associations, dissolved_ids=(), removed_ids=()):
+        """Fusionner le delta dans la table courante du périmètre
+
+        Les lignes du delta remplacent les versions précédentes (même rna_id)
+        en reprenant les contacts déjà trouvés que la nouvelle recherche n'a
+        pas retrouvés; les autres lignes sont inchangées.
+        """
+        current_path = os.path.join(self.data_dir, f"rna_associations_current_dpt{departement}.csv")
+
+        if os.path.exists(current_path):
+            current = pd.read_csv(current_path, encoding='utf-8', dtype=str, keep_default_na=False)
+        else:
+            current = pd.DataFrame(columns=['rna_id', 'statut_rna'])
+
+        delta = pd.DataFrame(associations)
+        if not delta.empty:
+            delta['statut_rna'] = STATUT_ACTIVE
+            delta = self._keep_known_contacts(delta, current)
+            current = pd.concat(
+                [current[~current['rna_id'].isin(delta['rna_id'])], delta], ignore_index=True
+            )
+
+        current.loc[current['rna_id'].isin(set(dissolved_ids)), 'statut_rna'] = STATUT_DISSOUTE
+        current.loc[current['rna_id'].isin(set(removed_ids)), 'statut_rna'] = STATUT_RETIREE
+        current['date_statut'] = current.get('date_statut', '')
+        changed = current['rna_id'].isin(set(dissolved_ids) | set(removed_ids))
+        if not delta.empty:
+            changed |= current['rna_id'].isin(delta['rna_id'])
+        current.loc[changed, 'date_statut'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        tmp_path = current_path + ".tmp"
+        current.to_csv(tmp_path, index=False, encoding='utf-8')
+        os.replace(tmp_path, current_path)
+        return current_path
+
+    @staticmethod
+    def _keep_known_contacts(delta, current):
+        """Contacts vides du delta complétés par ceux de la version précédente (même rna_id)"""
+        previous = current.drop_duplicates('rna_id', keep='last').set_index('rna_id')
+        carried = pd.Series(False, index=delta.index)
+        for column in CONTACT_COLUMNS:
+            if column not in previous.columns:
+                continue
+            known = delta['rna_id'].map(previous[column]).fillna('').astype(str)
+            value = delta[column].fillna('').astype(str) if column in delta.columns else pd.Series('', index=delta.index)
+            missing = (value == '') & (known != '')
+            delta[column] = value.where(~missing, known)
+            carried |= missing
+        # Contact repris sans nouvelle recherche: statut de la version précédente
+        if 'statut_recherche' in previous.columns and 'statut_recherche' in delta.columns:
+            known = delta['rna_id'].map(previous['statut_recherche']).fillna('')
+            keep = carried & delta['statut_recherche'].isin(UNSEARCHED_STATUTS) & (known != '')
+            delta['statut_recherche'] = delta['statut_recherche'].where(~keep, known)
+        return delta
+
+
+def main():
+    """Fonction principale"""
+    print("🔁 INGESTION RNA INCRÉMENTALE")
+    print("=" * 60)
+
+    print(f"Instantané RNA (défaut: data/rna_import_20250701_dpt_01.csv): ", end="")
+    filepath = input().strip() or "data/rna_import_20250701_dpt_01.csv"
+
+    print(f"Recherche contacts sur le delta ? (oui/non): ", end="")
+    search_contacts = input().strip().lower() in ['oui', 'o', 'yes', 'y']
+    max_searches = 0
+    if search_contacts:
+        print(f"Nombre de recherches contacts (max 50): ", end="")
+        max_searches = int(input().strip() or "20")
+
+    RnaIncrementalIngestor().ingest(filepath, search_contacts=search_contacts, max_searches=max_searches)
+
+
+if __name__ == "__main__":
+    main()
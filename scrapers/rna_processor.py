@@ -1,39 +1,62 @@
 import pandas as pd
+import numpy as np
+import hashlib
+import inspect
 import re
 import sys
 import os
 from datetime import datetime
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import quote_plus
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_search import AsyncSearchEngine
+from utils.contact_patterns import DIGIT_RUN_RE, PHONE_RES, WEBSITE_RE, find_emails
 from utils.data_manager import DataManager
+from utils.lead_store import LeadStore
+from utils.perf import ThroughputMeter
+from utils.rna_cache import RnaTableCache
+from utils import title_rules
+from utils.title_rules import TitleValidator
+from utils.objet_social import get_nomenclature
+
+# Colonnes à faible cardinalité stockées en catégories (chaînes partagées)
+COMPACT_COLUMNS = [
+    'departement', 'source', 'extraction_method', 'statut_recherche', 'ville', 'code_postal',
+    'secteur_code', 'secteur_nom', 'segment_campagne', 'nature', 'date_publication', 'date_extraction'
+]
+
+
+def departement_from_codes(code_insee, code_postal=''):
+    """Code département (01, 2A, 974...) depuis le code INSEE, à défaut le code postal"""
+    code_insee = str(code_insee).strip() if pd.notna(code_insee) else ''
+    if len(code_insee) == 5:
+        return code_insee[:3] if code_insee.startswith('97') else code_insee[:2]
+    
+    code_postal = str(code_postal).strip() if pd.notna(code_postal) else ''
+    if len(code_postal) == 5 and code_postal.isdigit():
+        if code_postal.startswith('97'):
+            return code_postal[:3]
+        if code_postal.startswith('20'):
+            return '2A' if code_postal < '20200' else '2B'
+        return code_postal[:2]
+    
+    return ''
 
 class RnaAssociationProcessor:
     """Processeur pour transformer le fichier RNA en base de leads avec contacts"""
     
-    def __init__(self):
+    def __init__(self, search=True):
         self.data_manager = DataManager()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        # Mapping codes secteurs
-        self.secteur_mapping = {
-            '7000': 'Loisirs/Culture',
-            '9030': 'Festivités/Spectacles', 
-            '11000': 'Sports',
-            '11035': 'Sports/Boules',
-            '11105': 'Sports/Gymnastique',
-            '13005': 'Chasse/Pêche',
-            '15000': 'Education/Formation',
-            '24000': 'Chasse',
-            '38000': 'Anciens Combattants',
-            '38105': 'Anciens Combattants/Entraide',
-            '50000': 'Divers/Dissous'
-        }
+        self.cache = RnaTableCache()
+        self.title_validator = TitleValidator('rna')
+        # search=False: nettoyage seul (workers d'un pool), sans base de leads ni moteur de recherche
+        self.store = LeadStore() if search else None
+        # Débit par hôte (seau à jetons, ralentissement sur 429/503) et cache disque
+        self.engine = AsyncSearchEngine() if search else None
+        
+        # Nomenclature des objets sociaux (secteur, segment de campagne)
+        self.nomenclature = get_nomenclature()
     
     def load_rna_file(self, filepath):
         """Charger et analyser le fichier RNA"""
@@ -54,11 +77,140 @@ class RnaAssociationProcessor:
             print(f"❌ Erreur chargement: {e}")
             return None
     
-    def clean_rna_data(self, df):
-        """Nettoyer et structurer les données RNA"""
-        print(f"\n🧹 NETTOYAGE DONNÉES RNA")
-        print("-" * 40)
+    def load_cleaned_associations(self, filepath):
+        """Associations nettoyées lues depuis le cache (construit au premier appel)"""
+        print(f"📄 CHARGEMENT FICHIER RNA (cache)")
+        print("=" * 40)
+        
+        try:
+            df = self.cache.load_cleaned(filepath, self)
+        except Exception as e:
+            print(f"❌ Erreur chargement: {e}")
+            return []
+        
+        print(f"✅ {len(df)} associations nettoyées")
+        return self._frame_to_records(df)
+    
+    @classmethod
+    def cleaning_code_version(cls):
+        """Empreinte du code de nettoyage: toute modification invalide le cache"""
+        digest = hashlib.sha256(inspect.getsource(title_rules).encode('utf-8'))
+        digest.update(get_nomenclature().version.encode('utf-8'))
+        digest.update(repr(COMPACT_COLUMNS).encode('utf-8'))
+        for name in ('__init__', 'clean_rna_dataframe', 'compact_frame', '_clean_title',
+                     '_text_column', '_map_unique', 'departement_column'):
+            digest.update(inspect.getsource(getattr(cls, name)).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def clean_rna_data(self, df, verbose=True):
+        """Nettoyer et structurer les données RNA (chemin vectorisé)"""
+        if verbose:
+            print(f"\n🧹 NETTOYAGE DONNÉES RNA")
+            print("-" * 40)
+        
+        cleaned_associations = self._frame_to_records(self.clean_rna_dataframe(df))
         
+        if verbose:
+            print(f"✅ {len(cleaned_associations)} associations nettoyées")
+        return cleaned_associations
+    
+    def clean_rna_dataframe(self, df, departement='01'):
+        """Nettoyage colonne par colonne, mêmes enregistrements que clean_rna_data_rowwise
+        
+        Les transformations Python (strip, _clean_title...) ne sont appliquées
+        qu'une fois par valeur distincte puis redistribuées sur toute la colonne.
+        departement=None: département déduit de chaque ligne (fichier national).
+        """
+        # Filtrer les associations valides
+        titre = self._text_column(df, 'titre')
+        keep = self.title_validator.valid_mask(titre)
+        rows = df[keep.values]
+        titre = titre[keep]
+        
+        nom = self._map_unique(titre, self._clean_title)
+        
+        def column(name):
+            return self._text_column(rows, name)
+        
+        secteur_code = column('objet_social1')
+        categories = self.nomenclature.map_codes(secteur_code, column('objet_social2'))
+        
+        if departement is None:
+            departement = self.departement_column(rows)
+            source = 'RNA_Officiel_Dpt' + departement
+        else:
+            source = f'RNA_Officiel_Dpt{departement}'
+        
+        cleaned = pd.DataFrame({
+            'rna_id': column('id'),
+            'nom': nom,
+            'objet': self._map_unique(column('objet'), lambda objet: objet[:300]),
+            'adresse': column('adr1'),
+            'code_postal': column('adrs_codepostal'),
+            'ville': column('libcom'),
+            'secteur_code': secteur_code,
+            'secteur_nom': categories['secteur_nom'],
+            'segment_campagne': categories['segment_campagne'],
+            'date_publication': column('date_publi'),
+            'nature': column('nature'),
+            'departement': departement,
+            'source': source,
+            'extraction_method': 'rna_file_processing',
+            'date_extraction': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'email_principal': '',  # À rechercher
+            'telephone': '',  # À rechercher
+            'site_web': '',  # À rechercher
+            'statut_recherche': 'pending'
+        }, index=titre.index)
+        
+        # Valider les données minimales
+        valid = (cleaned['nom'].str.len() >= 5) & (cleaned['ville'] != '')
+        return self.compact_frame(cleaned[valid].reset_index(drop=True))
+    
+    @staticmethod
+    def compact_frame(df):
+        """Colonnes répétitives en catégories: une seule copie de chaque chaîne
+        
+        Les enregistrements produits par _frame_to_records partagent alors
+        les mêmes objets str (communes, secteurs, statuts...).
+        """
+        for column in COMPACT_COLUMNS:
+            if column in df.columns and df[column].dtype == object:
+                df[column] = df[column].astype('category')
+        return df
+    
+    @classmethod
+    def departement_column(cls, df):
+        """Département de chaque ligne RNA (code INSEE, à défaut code postal)"""
+        codes = pd.DataFrame({
+            'insee': df['adrs_codeinsee'] if 'adrs_codeinsee' in df.columns else '',
+            'postal': df['adrs_codepostal'] if 'adrs_codepostal' in df.columns else ''
+        }, index=df.index)
+        keys = pd.Series(list(zip(codes['insee'], codes['postal'])), index=df.index, dtype=object)
+        return cls._map_unique(keys, lambda key: departement_from_codes(*key))
+    
+    @staticmethod
+    def _frame_to_records(df):
+        """Convertir un DataFrame en liste de dicts (plus rapide que to_dict('records'))"""
+        columns = list(df.columns)
+        return [dict(zip(columns, values)) for values in zip(*(df[col].tolist() for col in columns))]
+    
+    @staticmethod
+    def _map_unique(series, func):
+        """Appliquer func une seule fois par valeur distincte de la colonne"""
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        mapped = np.array([func(value) for value in uniques], dtype=object)
+        return pd.Series(mapped[codes], index=series.index)
+    
+    @classmethod
+    def _text_column(cls, df, name):
+        """str(valeur).strip() appliqué à toute une colonne ('nan' compris)"""
+        if name in df.columns:
+            return cls._map_unique(df[name], lambda value: str(value).strip())
+        return pd.Series('', index=df.index, dtype=object)
+    
+    def clean_rna_data_rowwise(self, df, departement='01'):
+        """Nettoyage ligne par ligne (référence historique, utilisée par les benchmarks)"""
         cleaned_associations = []
         
         for index, row in df.iterrows():
@@ -72,18 +224,21 @@ class RnaAssociationProcessor:
                     continue
                 
                 # Nettoyer et structurer
+                categories = self.nomenclature.categories(row.get('objet_social1', ''), row.get('objet_social2', ''))
                 association = {
+                    'rna_id': str(row.get('id', '')).strip(),
                     'nom': self._clean_title(titre),
                     'objet': str(row.get('objet', '')).strip()[:300],
                     'adresse': str(row.get('adr1', '')).strip(),
                     'code_postal': str(row.get('adrs_codepostal', '')).strip(),
                     'ville': str(row.get('libcom', '')).strip(),
                     'secteur_code': str(row.get('objet_social1', '')).strip(),
-                    'secteur_nom': self.secteur_mapping.get(str(row.get('objet_social1', '')).strip(), 'Autre'),
+                    'secteur_nom': categories['secteur_nom'],
+                    'segment_campagne': categories['segment_campagne'],
                     'date_publication': str(row.get('date_publi', '')).strip(),
                     'nature': str(row.get('nature', '')).strip(),
-                    'departement': '01',
-                    'source': 'RNA_Officiel_Dpt01',
+                    'departement': departement,
+                    'source': f'RNA_Officiel_Dpt{departement}',
                     'extraction_method': 'rna_file_processing',
                     'date_extraction': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'email_principal': '',  # À rechercher
@@ -99,9 +254,66 @@ class RnaAssociationProcessor:
             except Exception as e:
                 continue
         
-        print(f"✅ {len(cleaned_associations)} associations nettoyées")
         return cleaned_associations
     
+    @staticmethod
+    def iter_rna_chunks(filepath, chunksize=50000):
+        """Lire le fichier RNA par blocs de taille bornée (colonnes en texte)"""
+        # dtype=str: types identiques d'un bloc à l'autre (codes postaux, codes secteurs)
+        return pd.read_csv(filepath, encoding='utf-8', dtype=str, chunksize=chunksize)
+    
+    def stream_rna_frames(self, filepath, chunksize=50000, meter=None, departement=None):
+        """Générateur: nettoyer le fichier RNA bloc par bloc, mémoire constante
+        
+        Produit un DataFrame d'associations nettoyées par bloc lu. Département
+        déduit du nom de fichier, à défaut de chaque ligne (fichier national).
+        """
+        meter = meter or ThroughputMeter("streaming RNA")
+        departement = departement or self.cache._guess_departement(filepath)
+        clean_departement = None if departement == 'all' else departement
+        
+        for chunk in self.iter_rna_chunks(filepath, chunksize):
+            cleaned = self.clean_rna_dataframe(chunk, clean_departement)
+            meter.add(len(chunk), len(cleaned))
+            yield cleaned
+    
+    def stream_rna_file(self, filepath, chunksize=50000, meter=None):
+        """Générateur: liste d'associations nettoyées (dicts) par bloc lu"""
+        for cleaned in self.stream_rna_frames(filepath, chunksize, meter):
+            yield self._frame_to_records(cleaned)
+    
+    def process_rna_file_streaming(self, filepath, output_filename=None, chunksize=50000):
+        """Nettoyer un export RNA volumineux en écrivant le résultat au fil de l'eau"""
+        print("🌊 TRAITEMENT RNA EN STREAMING")
+        print("=" * 60)
+        print(f"📄 Fichier: {filepath}")
+        print(f"📦 Taille des blocs: {chunksize} lignes")
+        
+        if output_filename is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+            output_filename = f"rna_associations_processed_{timestamp}.csv"
+        
+        output_path = os.path.join(self.data_manager.data_dir, output_filename)
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        
+        meter = ThroughputMeter("streaming RNA")
+        
+        try:
+            for cleaned in self.stream_rna_frames(filepath, chunksize, meter):
+                self.data_manager.append_frame_to_csv(cleaned, output_filename)
+                print(f"  📦 Bloc {meter.chunks}: {meter.rows} lignes lues, "
+                      f"{meter.kept} conservées ({meter.rows_per_second:,.0f} lignes/s)")
+        except Exception as e:
+            print(f"❌ Erreur streaming: {e}")
+            return None
+        
+        print(f"\n🎉 STREAMING TERMINÉ")
+        print(f"📁 Fichier: {output_path}")
+        meter.report()
+        
+        return meter.summary()
+    
     def _clean_title(self, titre):
         """Nettoyer le titre d'association"""
         # Supprimer prefixes
@@ -124,9 +336,18 @@ class RnaAssociationProcessor:
         
         updated_associations = []
         
-        for i, assoc in enumerate(associations[:max_searches]):
+        # Déjà résolues par un finder (contact trouvé, ou échec non expiré): aucune requête
+        to_search, resolved = self.store.partition_resolved(associations[:max_searches])
+        for assoc, resolution in resolved:
+            assoc.update({'email': resolution['email'], 'phone': resolution['telephone'],
+                          'website': resolution['site_web'],
+                          'statut_recherche': 'not_found' if resolution['statut'] == 'not_found' else 'found'})
+            updated_associations.append(assoc)
+        print(f"♻️ Déjà résolues: {len(resolved)} (dont {sum(r['statut'] != 'not_found' for _, r in resolved)} avec contact)")
+        
+        for i, assoc in enumerate(to_search):
             try:
-                print(f"\n{i+1}/{min(len(associations), max_searches)} - {assoc['nom'][:50]}...")
+                print(f"\n{i+1}/{len(to_search)} - {assoc['nom'][:50]}...")
                 
                 # Recherche Google
                 contacts = self._search_google_contacts(assoc)
@@ -139,16 +360,9 @@ class RnaAssociationProcessor:
                     assoc['statut_recherche'] = 'not_found'
                     print(f"  ⚠️ Aucun contact trouvé")
                 
-                updated_associations.append(assoc)
+                self.store.record_search(assoc, 'rna_processor', assoc['statut_recherche'], 'google', contacts)
                 
-                # Délai pour éviter blocage
-                if i % 10 == 0 and i > 0:
-                    print(f"  ⏳ Pause de 5 secondes...")
-                    import time
-                    time.sleep(5)
-                else:
-                    import time
-                    time.sleep(2)
+                updated_associations.append(assoc)
                 
             except Exception as e:
                 print(f"  ❌ Erreur recherche: {e}")
@@ -159,6 +373,7 @@ class RnaAssociationProcessor:
         for assoc in associations[max_searches:]:
             updated_associations.append(assoc)
         
+        self.engine.report()
         return updated_associations
     
     def _search_google_contacts(self, association):
@@ -179,30 +394,26 @@ class RnaAssociationProcessor:
                 'Connection': 'keep-alive',
             }
             
-            response = self.session.get(google_url, headers=headers, timeout=10)
+            # Politesse gérée par le limiteur de débit partagé (plus de pauses fixes)
+            response = self.engine.get(google_url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
                 text = soup.get_text()
                 
-                # Extraire email
-                email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                emails = re.findall(email_pattern, text)
-                
-                for email in emails:
+                # Extraire email (motifs partagés et préfiltrés, utils.contact_patterns)
+                for email in find_emails(text):
                     if self._is_valid_association_email(email, association):
                         contacts['email'] = email.lower()
                         break
                 
                 # Extraire téléphone
-                phone_pattern = r'0[1-9](?:[.\s-]?\d{2}){4}'
-                phones = re.findall(phone_pattern, text)
-                if phones:
-                    contacts['phone'] = phones[0]
+                phone = PHONE_RES[0].search(text) if DIGIT_RUN_RE.search(text) else None
+                if phone:
+                    contacts['phone'] = phone.group()
                 
                 # Extraire site web
-                website_pattern = r'https?://[^\s<>"]+(?:\.fr|\.org|\.com|\.net)'
-                websites = re.findall(website_pattern, text)
+                websites = WEBSITE_RE.findall(text) if 'http' in text else []
                 
                 for website in websites:
                     if self._is_valid_association_website(website, association):
@@ -262,15 +473,27 @@ class RnaAssociationProcessor:
         
         return True
     
-    def generate_statistics(self, associations):
-        """Générer statistiques des associations RNA"""
-        total = len(associations)
-        
-        # Statistiques contacts
-        with_email = sum(1 for a in associations if a.get('email_principal'))
-        with_phone = sum(1 for a in associations if a.get('telephone'))
-        with_website = sum(1 for a in associations if a.get('site_web'))
-        searched = sum(1 for a in associations if a.get('statut_recherche') != 'pending')
+    def count_statistics(self, associations):
+        """Compteurs bruts (fusionnables) sur une liste d'associations ou un DataFrame"""
+        if isinstance(associations, pd.DataFrame):
+            df = associations
+            
+            def filled(column):
+                if column not in df.columns:
+                    return 0
+                values = df[column]
+                return int((values.notna() & (values.astype(str) != '')).sum())
+            
+            searched = int((df['statut_recherche'] != 'pending').sum()) if 'statut_recherche' in df.columns else len(df)
+            return {
+                'total': len(df),
+                'with_email': filled('email_principal'),
+                'with_phone': filled('telephone'),
+                'with_website': filled('site_web'),
+                'searched': searched,
+                'by_sector': self._value_counts(df, 'secteur_nom'),
+                'by_city': self._value_counts(df, 'ville')
+            }
         
         # Statistiques secteurs
         by_sector = {}
@@ -284,18 +507,62 @@ class RnaAssociationProcessor:
             city = assoc.get('ville', 'Inconnue')
             by_city[city] = by_city.get(city, 0) + 1
         
+        return {
+            'total': len(associations),
+            'with_email': sum(1 for a in associations if a.get('email_principal')),
+            'with_phone': sum(1 for a in associations if a.get('telephone')),
+            'with_website': sum(1 for a in associations if a.get('site_web')),
+            'searched': sum(1 for a in associations if a.get('statut_recherche') != 'pending'),
+            'by_sector': by_sector,
+            'by_city': by_city
+        }
+    
+    @staticmethod
+    def _value_counts(df, column):
+        """Comptage par valeur (catégories absentes exclues)"""
+        if column not in df.columns:
+            return {}
+        counts = df[column].value_counts()
+        return counts[counts > 0].to_dict()
+    
+    @staticmethod
+    def merge_statistics(counts_list):
+        """Fusionner les compteurs de plusieurs départements"""
+        merged = {'total': 0, 'with_email': 0, 'with_phone': 0, 'with_website': 0,
+                  'searched': 0, 'by_sector': {}, 'by_city': {}}
+        
+        for counts in counts_list:
+            for key in ('total', 'with_email', 'with_phone', 'with_website', 'searched'):
+                merged[key] += counts[key]
+            for key in ('by_sector', 'by_city'):
+                for name, count in counts[key].items():
+                    merged[key][name] = merged[key].get(name, 0) + count
+        
+        return merged
+    
+    @staticmethod
+    def format_statistics(counts):
+        """Mise en forme des compteurs (format historique de generate_statistics)"""
+        total = counts['total']
+        with_email = counts['with_email']
+        with_phone = counts['with_phone']
+        
         return {
             'Total associations': total,
             'Avec email': with_email,
             'Avec téléphone': with_phone,
-            'Avec site web': with_website,
-            'Recherches effectuées': searched,
+            'Avec site web': counts['with_website'],
+            'Recherches effectuées': counts['searched'],
             'Taux email': f"{(with_email/total*100):.1f}%" if total > 0 else "0%",
             'Taux téléphone': f"{(with_phone/total*100):.1f}%" if total > 0 else "0%",
-            'Top secteurs': dict(sorted(by_sector.items(), key=lambda x: x[1], reverse=True)[:5]),
-            'Top villes': dict(sorted(by_city.items(), key=lambda x: x[1], reverse=True)[:10])
+            'Top secteurs': dict(sorted(counts['by_sector'].items(), key=lambda x: x[1], reverse=True)[:5]),
+            'Top villes': dict(sorted(counts['by_city'].items(), key=lambda x: x[1], reverse=True)[:10])
         }
     
+    def generate_statistics(self, associations):
+        """Générer statistiques des associations RNA"""
+        return self.format_statistics(self.count_statistics(associations))
+    
     def process_rna_file(self, filepath="data/rna_import_20250701_dpt_01.csv", search_contacts=True, max_searches=50):
         """Traitement complet du fichier RNA"""
         print("🎯 TRAITEMENT FICHIER RNA DÉPARTEMENT 01")
@@ -304,13 +571,8 @@ class RnaAssociationProcessor:
         print("🏛️ Département: 01 (Ain)")
         print("📧 Recherche contacts automatique")
         
-        # 1. Charger données
-        df = self.load_rna_file(filepath)
-        if df is None:
-            return []
-        
-        # 2. Nettoyer données
-        associations = self.clean_rna_data(df)
+        # 1-2. Charger données nettoyées (cache colonnaire)
+        associations = self.load_cleaned_associations(filepath)
         if not associations:
             print("❌ Aucune association valide trouvée")
             return []
@@ -358,7 +620,8 @@ def main():
     print(f"\n❓ Options:")
     print(f"1. Traitement sans recherche contacts (rapide)")
     print(f"2. Traitement avec recherche contacts (lent)")
-    print(f"\nChoix (1/2): ", end="")
+    print(f"3. Traitement streaming d'un export volumineux (national)")
+    print(f"\nChoix (1/2/3): ", end="")
     
     choice = input().strip()
     
@@ -368,6 +631,13 @@ def main():
         print(f"Nombre de recherches contacts (max 50): ", end="")
         max_searches = int(input().strip() or "20")
         associations = processor.process_rna_file(search_contacts=True, max_searches=max_searches)
+    elif choice == "3":
+        print(f"Fichier RNA (défaut: data/rna_import_20250701_dpt_01.csv): ", end="")
+        filepath = input().strip() or "data/rna_import_20250701_dpt_01.csv"
+        print(f"Taille des blocs (défaut: 50000): ", end="")
+        chunksize = int(input().strip() or "50000")
+        processor.process_rna_file_streaming(filepath, chunksize=chunksize)
+        return
     else:
         print("🚪 Traitement annulé")
         return
@@ -6,27 +6,39 @@ SMART CONTACT FINDER - Recherche intelligente optimisée
 Recherche avancée nom + ville avec analyse contextuelle
 """
 
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
 import random
 from datetime import datetime
 import sys
 import os
-from urllib.parse import quote_plus
-import json
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_search import AsyncSearchEngine
+from utils.contact_patterns import find_emails
+from utils.parse_pool import get_parse_pool
+from utils.email_scoring import EmailScorer
 from utils.data_manager import DataManager
+from utils.lead_store import LeadStore
+from utils.query_planner import QueryPlanner, association_sector
+from utils.rna_cache import RnaTableCache
+from utils.run_journal import RunJournal, journal_key
+from utils.search_backends import get_backend_selector
 
 class SmartContactFinder:
     """Chercheur de contacts intelligent"""
     
-    def __init__(self):
+    def __init__(self, adaptive_queries=True):
         self.data_manager = DataManager()
-        self.session = requests.Session()
+        self.rna_cache = RnaTableCache()
+        self.store = LeadStore()
+        self.journal = RunJournal('smart_finder')
+        self.engine = AsyncSearchEngine()
+        # Extraction dans un pool de processus: les threads réseau ne font que télécharger
+        self.parser = get_parse_pool()
+        # Règles de scoring partagées (utils.email_scoring), candidats scorés par lots
+        self.scorer = EmailScorer('smart')
+        self.backends = get_backend_selector()
+        # Ordre des modèles de requêtes appris (adaptive_queries=False: ordre fixe de référence)
+        self.query_planner = QueryPlanner('smart_finder', adaptive=adaptive_queries)
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/119.0',
@@ -120,7 +132,7 @@ class SmartContactFinder:
         return ville_clean.strip()
     
     def generate_search_queries(self, nom, ville):
-        """Générer requêtes de recherche intelligentes"""
+        """Générer requêtes de recherche intelligentes: couples (modèle, requête)"""
         nom_clean = self.clean_association_name(nom)
         ville_clean = self.clean_ville_name(ville)
         ville_simple = ville_clean.replace('-', '').replace(' ', '')
@@ -134,7 +146,7 @@ class SmartContactFinder:
                     ville=ville_clean,
                     ville_clean=ville_simple.lower()
                 )
-                queries.append(query)
+                queries.append((pattern, query))
             except KeyError:
                 # Si le pattern n'a pas toutes les variables
                 continue
@@ -146,38 +158,29 @@ class SmartContactFinder:
         if not html_content:
             return []
         
-        # Pattern email amélioré
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails_found = re.findall(email_pattern, html_content, re.IGNORECASE)
+        # Motif partagé, préfiltré, formes masquées comprises; calculé dans un worker du pool
+        emails_found = self.parser.run(find_emails, html_content)
         
         if not emails_found:
             return []
         
-        # Filtrer et scorer les emails
-        scored_emails = []
-        
-        for email in set(emails_found):  # Dédupliquer
-            email_lower = email.lower()
-            
-            # Exclure emails non pertinents
-            if any(domain in email_lower for domain in [
+        # Filtrer puis scorer tous les emails de la page en un lot (page parcourue une seule fois)
+        candidates = [
+            (email, html_content) for email in dict.fromkeys(emails_found)  # Dédupliquer
+            if not any(domain in email.lower() for domain in [
                 'google', 'facebook', 'youtube', 'twitter', 'instagram',
                 'example', 'test', 'noreply', 'no-reply', 'donotreply'
-            ]):
-                continue
-            
-            # Scorer l'email
-            score = self.score_email(email, nom_association, ville, html_content)
-            
-            if score > 10:  # Seuil minimum
-                scored_emails.append((email, score))
-        
-        # Trier par score et retourner les meilleurs
-        scored_emails.sort(key=lambda x: x[1], reverse=True)
+            ])
+        ]
+        scored_emails = self.scorer.best(nom_association, ville, candidates, minimum=10)  # Seuil minimum
         return [email for email, score in scored_emails[:3]]  # Top 3
     
     def score_email(self, email, nom_association, ville, context=""):
-        """Scorer un email selon pertinence"""
+        """Scorer un email selon pertinence (règles partagées, voir utils.email_scoring)"""
+        return self.scorer.score(nom_association, ville, email, context)
+    
+    def score_email_reference(self, email, nom_association, ville, context=""):
+        """Version historique (un appel par email, texte de page re-parcouru), pour benchmark_scoring.py"""
         score = 0
         email_lower = email.lower()
         nom_lower = nom_association.lower()
@@ -219,68 +222,57 @@ class SmartContactFinder:
         
         return score
     
-    def search_with_engine(self, query, engine="google", max_results=10):
-        """Recherche avec moteur spécifique"""
-        try:
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.7',
-                'Accept-Encoding': 'gzip, deflate',
-                'DNT': '1',
-                'Connection': 'keep-alive'
-            }
-            
-            if engine == "google":
-                url = f"https://www.google.com/search?q={quote_plus(query)}&num={max_results}"
-            elif engine == "bing":
-                url = f"https://www.bing.com/search?q={quote_plus(query)}&count={max_results}"
-            elif engine == "qwant":
-                url = f"https://www.qwant.com/?q={quote_plus(query)}&count={max_results}"
-            else:
-                return ""
-            
-            response = self.session.get(url, headers=headers, timeout=15)
+    def search_with_engine(self, query, extract, max_results=10):
+        """Recherche sur le moteur au meilleur rendement observé, suivant si échec ou blocage"""
+        headers = {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.7',
+            'Accept-Encoding': 'gzip, deflate',
+            'DNT': '1',
+            'Connection': 'keep-alive'
+        }
+        
+        tried = set()
+        while True:
+            try:
+                # Débit et parallélisme limités par hôte dans le moteur (plus de time.sleep)
+                backend, emails = self.backends.search(
+                    self.engine, query, extract, headers=headers, max_results=max_results, exclude=tried
+                )
+            except Exception as e:
+                print(f"        ⚠️ Erreur recherche: {e}")
+                return []
+            if backend is None:
+                return []
             
-            if response.status_code == 200:
-                return response.text
-            else:
-                return ""
-                
-        except Exception as e:
-            print(f"        ⚠️ Erreur {engine}: {e}")
-            return ""
+            print(f"        📡 {backend.label}: {query[:50]}...")
+            if emails is not None:
+                return emails
+            print(f"        ⚠️ Échec {backend.label}, moteur suivant")
+            tried.add(backend.name)
     
-    def smart_search_contact(self, nom_association, ville):
+    def smart_search_contact(self, nom_association, ville, secteur=''):
         """Recherche intelligente multi-étapes"""
         try:
             print(f"    🔍 Recherche: {nom_association[:30]}... à {ville}")
             
-            # Générer requêtes
+            # Générer requêtes, les modèles au meilleur taux de réussite d'abord
             queries = self.generate_search_queries(nom_association, ville)
+            plan = self.query_planner.plan(queries, secteur, limit=6)  # Limiter à 6 requêtes max
             
             all_emails = []
-            engines = ["google", "bing"]  # Qwant souvent bloque
             
-            # Recherche progressive
-            for i, query in enumerate(queries[:6]):  # Limiter à 6 requêtes max
-                for engine in engines:
-                    if len(all_emails) >= 3:  # Stop si assez d'emails
-                        break
-                    
-                    print(f"        📡 {engine.title()}: {query[:50]}...")
-                    
-                    html_content = self.search_with_engine(query, engine)
-                    
-                    if html_content:
-                        emails = self.extract_emails_advanced(html_content, nom_association, ville)
-                        all_emails.extend(emails)
-                    
-                    # Délai progressif
-                    delay = random.uniform(1, 3) + (i * 0.5)
-                    time.sleep(delay)
+            # Recherche progressive: chaque requête sur le moteur au meilleur rendement,
+            # arrêt quand un meilleur email devient improbable
+            for template, query in plan:
+                emails = self.search_with_engine(
+                    query, lambda html: self.extract_emails_advanced(html, nom_association, ville)
+                )
+                plan.record(template, emails)
+                all_emails.extend(emails)
                 
-                if len(all_emails) >= 3:
+                if len(all_emails) >= 3:  # Stop si assez d'emails
                     break
             
             # Retourner meilleur email unique
@@ -292,14 +284,13 @@ class SmartContactFinder:
                     best_email = unique_emails[0]
                 else:
                     # Re-scorer avec contexte complet
-                    scored = [(email, self.score_email(email, nom_association, ville)) 
-                             for email in unique_emails]
-                    scored.sort(key=lambda x: x[1], reverse=True)
-                    best_email = scored[0][0]
+                    best_email = self.scorer.best(nom_association, ville, unique_emails)[0][0]
                 
+                plan.finish(best_email)
                 print(f"        ✅ Email trouvé: {best_email}")
                 return best_email
             else:
+                plan.finish()
                 print(f"        ❌ Aucun email trouvé")
                 return None
                 
@@ -307,14 +298,23 @@ class SmartContactFinder:
             print(f"        ⚠️ Erreur recherche: {e}")
             return None
     
-    def batch_search(self, start_index=0, batch_size=50):
-        """Recherche par lot avec sauvegarde incrémentale"""
+    def batch_search(self, start_index=0, batch_size=50, resume=False):
+        """Recherche par lot, chaque résultat journalisé (resume: reprendre le dernier lot)"""
+        if resume:
+            params, done, previous_results = self.journal.resume()
+            if params is None:
+                print(f"❌ Aucun lancement à reprendre ({self.journal.path})")
+                return None
+            start_index, batch_size = params['start_index'], params['batch_size']
+        else:
+            done, previous_results = set(), []
+        
         print(f"🚀 SMART CONTACT FINDER - RECHERCHE AVANCÉE")
         print(f"=" * 70)
         
         # Charger données RNA
         try:
-            df = pd.read_csv("data/rna_import_20250701_dpt_01.csv", encoding='utf-8')
+            df = self.rna_cache.load_raw("data/rna_import_20250701_dpt_01.csv")
             print(f"✅ {len(df)} associations RNA chargées")
         except Exception as e:
             print(f"❌ Erreur chargement: {e}")
@@ -326,57 +326,80 @@ class SmartContactFinder:
         
         print(f"📊 Traitement: {start_index} → {end_index} ({len(subset)} associations)")
         print(f"🎯 Méthode: Nom + Ville + Analyse contextuelle")
-        print(f"⚡ Moteurs: Google + Bing")
+        print(f"⚡ Moteurs: choix par rendement observé ({self.engine.max_in_flight} associations en parallèle)")
         
-        results = []
-        found_count = 0
+        if not resume:
+            self.journal.start_run({'start_index': start_index, 'batch_size': batch_size})
+        
+        results = list(previous_results)
+        found_count = len(results)
+        rows = [row for row in subset.to_dict('records') if journal_key(row) not in done]
+        # Déjà résolues par un finder (contact trouvé, ou échec non expiré): aucune requête
+        rows, resolved = self.store.partition_resolved(rows)
+        print(f"♻️ Déjà résolues: {len(resolved)} (dont {sum(r['statut'] != 'not_found' for _, r in resolved)} avec contact)")
         
         print(f"\n🔍 RECHERCHE EN COURS...")
         print(f"-" * 50)
         
-        for i, (_, row) in enumerate(subset.iterrows(), 1):
-            try:
-                nom = row.get('titre', '')
-                ville = row.get('libcom', '')
-                
-                if not nom or not ville:
-                    print(f"  {i:3d}/{len(subset)} - ⚠️ Données manquantes")
-                    continue
-                
-                print(f"  {i:3d}/{len(subset)} - {nom[:40]}...")
-                
-                # Recherche intelligente
-                email = self.smart_search_contact(nom, ville)
-                
-                if email:
-                    found_count += 1
-                    
-                    result = {
-                        'nom_association': nom,
-                        'email': email,
-                        'ville': ville,
-                        'secteur': 'Loisirs/Culture',
-                        'telephone': '',
-                        'site_web': '',
-                        'adresse': row.get('adr1', ''),
-                        'code_postal': row.get('adrs_codepostal', ''),
-                        'objet': row.get('objet', ''),
-                        'source': 'Smart_Search',
-                        'date_extraction': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                        'search_method': 'Multi_Engine_Smart'
-                    }
-                    
-                    results.append(result)
+        def search(row):
+            nom = row.get('titre', '')
+            ville = row.get('libcom', '')
+            if not nom or not ville:
+                return None
+            return self.smart_search_contact(nom, ville, association_sector(row))
+        
+        def on_result(index, row, email):
+            # Appelé dans la boucle asyncio: enregistrements séquentiels
+            nonlocal found_count
+            nom = row.get('titre', '')
+            ville = row.get('libcom', '')
+            
+            if not nom or not ville:
+                print(f"  {index + 1:3d}/{len(rows)} - ⚠️ Données manquantes")
+                self.journal.record(row, 'skipped')
+                return
+            
+            print(f"  {index + 1:3d}/{len(rows)} - {nom[:40]}... → {email or '❌'}")
+            
+            if email:
+                found_count += 1
                 
-                # Sauvegarde incrémentale tous les 10
-                if i % 10 == 0 and results:
-                    self._save_incremental(results, start_index, i)
+                result = {
+                    'nom_association': nom,
+                    'email': email,
+                    'ville': ville,
+                    'secteur': 'Loisirs/Culture',
+                    'telephone': '',
+                    'site_web': '',
+                    'adresse': row.get('adr1', ''),
+                    'code_postal': row.get('adrs_codepostal', ''),
+                    'objet': row.get('objet', ''),
+                    'source': 'Smart_Search',
+                    'date_extraction': datetime.now().strftime('%Y-%m-%d %H:%M'),
+                    'search_method': 'Multi_Engine_Smart'
+                }
                 
-            except KeyboardInterrupt:
-                print(f"\n⏹️ Recherche interrompue par l'utilisateur")
-                break
-            except Exception as e:
-                print(f"    ❌ Erreur: {e}")
+                results.append(result)
+                # Enregistrement immédiat dans la base (remplace les sauvegardes temporaires)
+                self.store.record_contact({**result, 'rna_id': row.get('id', '')}, 'smart_finder')
+                self.journal.record(row, 'found', result)
+            else:
+                self.store.record_search(
+                    {'nom': nom, 'ville': ville, 'adresse': row.get('adr1', ''),
+                     'objet': row.get('objet', ''), 'rna_id': row.get('id', '')},
+                    'smart_finder', 'not_found', 'Multi_Engine_Smart'
+                )
+                self.journal.record(row, 'not_found')
+        
+        try:
+            self.engine.run(rows, search, on_result=on_result)
+        except KeyboardInterrupt:
+            print(f"\n⏹️ Recherche interrompue par l'utilisateur")
+        self.engine.report()
+        self.parser.report()
+        self.backends.report()
+        self.query_planner.save_run()
+        self.query_planner.report()
         
         # Sauvegarde finale
         if results:
@@ -403,17 +426,11 @@ class SmartContactFinder:
         else:
             print(f"\n😞 Aucun contact trouvé")
             return None
-    
-    def _save_incremental(self, results, start_index, current_index):
-        """Sauvegarde incrémentale"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        filename = f"smart_contacts_temp_{start_index}_{current_index}_{timestamp}.csv"
-        self.data_manager.save_to_csv(results, filename)
-        print(f"        💾 Sauvegarde: {len(results)} contacts")
 
 def main():
     """Fonction principale"""
-    finder = SmartContactFinder()
+    # --fixed-queries: ordre fixe des requêtes (mesure de référence avant apprentissage)
+    finder = SmartContactFinder(adaptive_queries='--fixed-queries' not in sys.argv)
     
     print(f"🎯 SMART CONTACT FINDER")
     print(f"=" * 50)
@@ -429,6 +446,11 @@ def main():
     print(f"  ✅ Anti-détection renforcé")
     
     try:
+        # Reprise automatique du dernier lot (aucune saisie d'index)
+        if '--resume' in sys.argv:
+            finder.batch_search(resume=True)
+            return
+        
         start = int(input(f"\n📍 Index de départ (0-654): ").strip() or "0")
         batch_size = int(input(f"🔢 Nombre à traiter (recommandé: 30): ").strip() or "30")
         
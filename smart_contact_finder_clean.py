@@ -13,20 +13,40 @@ Améliorations:
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 import re
-import time
 import random
 from datetime import datetime
 import os
-from urllib.parse import quote
+import sys
 import unicodedata
 
+from utils.async_search import AsyncSearchEngine
+from utils.contact_patterns import find_emails
+from utils.parse_pool import get_parse_pool
+from utils.email_scoring import EmailScorer
+from utils.lead_store import LeadStore
+from utils.query_planner import QueryPlanner, association_sector
+from utils.rna_cache import RnaTableCache
+from utils.run_journal import RunJournal, journal_key
+from utils.search_backends import get_backend_selector
+from utils.title_rules import TitleValidator
+
 class SmartContactFinderClean:
-    def __init__(self):
+    def __init__(self, adaptive_queries=True):
         self.session = requests.Session()
         self.setup_session()
-        self.base_delay = 1.5
+        self.engine = AsyncSearchEngine()
+        # Extraction dans un pool de processus: les threads réseau ne font que télécharger
+        self.parser = get_parse_pool()
+        # Règles de scoring partagées (utils.email_scoring), candidats scorés par lots
+        self.scorer = EmailScorer('clean')
+        self.backends = get_backend_selector()
+        # Ordre des modèles de requêtes appris (adaptive_queries=False: ordre fixe de référence)
+        self.query_planner = QueryPlanner('smart_finder_clean', adaptive=adaptive_queries)
+        self.rna_cache = RnaTableCache()
+        self.title_validator = TitleValidator('clean')
+        self.store = LeadStore()
+        self.journal = RunJournal('smart_finder_clean')
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
@@ -44,39 +64,8 @@ class SmartContactFinderClean:
         })
         
     def is_valid_association(self, nom):
-        """Filtre les associations problématiques"""
-        nom_clean = nom.upper().strip()
-        
-        # Préfixes problématiques à ignorer
-        problematic_prefixes = [
-            'ERREUR D\'ENREGIST',
-            'VOIR NUMERO',
-            'VOIR -',
-            'VOIR N°',
-            'DISSOLUTION',
-            'ASSOCIATION DISSOUTE',
-            '(',
-            'ERREUR D',
-            'VOIR NRO',
-            'TRANSFERT',
-            'FUSION'
-        ]
-        
-        # Vérifier les préfixes problématiques
-        for prefix in problematic_prefixes:
-            if nom_clean.startswith(prefix):
-                return False
-                
-        # Ignorer les noms trop courts ou bizarres
-        if len(nom_clean) < 3:
-            return False
-            
-        # Ignorer les noms avec trop de caractères spéciaux
-        special_chars = sum(1 for char in nom_clean if not char.isalnum() and char != ' ')
-        if special_chars > len(nom_clean) * 0.3:
-            return False
-            
-        return True
+        """Filtre les associations problématiques (préfixes, longueur, caractères spéciaux)"""
+        return self.title_validator.is_valid(nom)
         
     def clean_association_name(self, nom):
         """Nettoie le nom de l'association pour la recherche"""
@@ -104,65 +93,66 @@ class SmartContactFinderClean:
         return ' '.join(mots_filtres).strip()
         
     def generate_search_queries(self, nom, ville):
-        """Génère des requêtes de recherche intelligentes"""
+        """Génère des requêtes de recherche intelligentes: couples (modèle, requête)"""
         nom_clean = self.clean_association_name(nom)
-        queries = []
         
         if not nom_clean or not ville:
-            return queries
+            return []
             
         ville_clean = ville.replace('-', ' ')
+        ville_slug = ville_clean.lower().replace(" ", "-")
+        
+        templates = [
+            # Requêtes de base avec email/contact
+            '"{nom}" {ville} email',
+            '"{nom}" {ville} contact',
+            '"{nom}" {ville} site',
+            '{nom} {ville} association email',
+            '{nom} {ville} association contact',
+            '{nom} {ville} secretaire',
+            '{nom} {ville} president',
+            # Recherche sur les sites officiels
+            'site:mairie-{ville_slug}.fr {nom}',
+            'site:{ville_slug}.fr {nom}',
+            'site:cc-{ville_slug}.fr {nom}',
+        ]
         
-        # Requêtes de base avec email/contact
-        queries.extend([
-            f'"{nom_clean}" {ville_clean} email',
-            f'"{nom_clean}" {ville_clean} contact',
-            f'"{nom_clean}" {ville_clean} site',
-            f'{nom_clean} {ville_clean} association email',
-            f'{nom_clean} {ville_clean} association contact',
-            f'{nom_clean} {ville_clean} secretaire',
-            f'{nom_clean} {ville_clean} president'
-        ])
-        
-        # Recherche sur les sites officiels
-        queries.extend([
-            f'site:mairie-{ville_clean.lower().replace(" ", "-")}.fr {nom_clean}',
-            f'site:{ville_clean.lower().replace(" ", "-")}.fr {nom_clean}',
-            f'site:cc-{ville_clean.lower().replace(" ", "-")}.fr {nom_clean}'
-        ])
-        
-        return queries[:8]  # Limiter à 8 requêtes max
-        
-    def search_engine_request(self, query, engine="google"):
-        """Effectue une recherche sur un moteur donné"""
-        try:
-            # Rotation des user agents
-            self.session.headers['User-Agent'] = random.choice(self.user_agents)
-            
-            if engine == "google":
-                url = f"https://www.google.com/search?q={quote(query)}&num=10"
-            elif engine == "bing":
-                url = f"https://www.bing.com/search?q={quote(query)}&count=10"
-            else:
-                return None
-                
-            response = self.session.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.text
+        return [
+            (template, template.format(nom=nom_clean, ville=ville_clean, ville_slug=ville_slug))
+            for template in templates
+        ]
+        
+    def search_engine_request(self, query):
+        """Recherche sur le moteur au meilleur rendement observé (suivant si échec ou blocage)"""
+        # Rotation des user agents (en-têtes par requête: plusieurs recherches en parallèle)
+        headers = dict(self.session.headers)
+        headers['User-Agent'] = random.choice(self.user_agents)
+        
+        tried = set()
+        while True:
+            try:
+                backend, emails = self.backends.search(
+                    self.engine, query, self.extract_emails, headers=headers, timeout=10, exclude=tried
+                )
+            except Exception as e:
+                print(f"        ❌ Erreur recherche: {e}")
+                return []
+            if backend is None:
+                return []
                 
-        except Exception as e:
-            print(f"        ❌ Erreur {engine}: {e}")
-            
-        return None
+            print(f"        📡 {backend.label}: {query[:60]}...")
+            if emails is not None:
+                return emails
+            print(f"        ❌ Échec {backend.label}, moteur suivant")
+            tried.add(backend.name)
         
     def extract_emails(self, html_content):
         """Extrait les emails du contenu HTML"""
         if not html_content:
             return []
             
-        # Pattern email amélioré
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, html_content)
+        # Motif partagé, préfiltré, formes masquées comprises; calculé dans un worker du pool
+        emails = self.parser.run(find_emails, html_content)
         
         # Filtrer les emails valides
         valid_emails = []
@@ -183,93 +173,70 @@ class SmartContactFinderClean:
         return valid_emails
         
     def score_email(self, email, nom_association, ville):
-        """Score un email selon sa pertinence"""
-        score = 0
-        email_lower = email.lower()
-        nom_lower = nom_association.lower()
-        ville_lower = ville.lower()
-        
-        # Score basé sur le domaine
-        domain = email.split('@')[1]
-        
-        # Domaines officiels/municipaux
-        if any(x in domain for x in ['mairie', 'ville', 'commune', 'cc-', ville_lower.replace(' ', '-')]):
-            score += 30
-            
-        # Domaines associatifs
-        if any(x in domain for x in ['asso', 'association', 'club']):
-            score += 25
-            
-        # Correspondance avec le nom de l'association
-        nom_mots = nom_lower.split()
-        for mot in nom_mots:
-            if len(mot) > 3 and mot in email_lower:
-                score += 20
-                
-        # Correspondance avec la ville
-        if ville_lower.replace('-', '').replace(' ', '') in domain:
-            score += 15
-            
-        # Types d'emails prioritaires
-        if any(x in email_lower for x in ['contact', 'info', 'secretaire', 'president']):
-            score += 10
-            
-        return score
+        """Score un email selon sa pertinence (règles partagées, voir utils.email_scoring)"""
+        return self.scorer.score(nom_association, ville, email)
         
-    def smart_search_contact(self, nom, ville, index=0):
+    def smart_search_contact(self, nom, ville, index=0, secteur=''):
         """Recherche intelligente d'un contact"""
         print(f"    🔍 Recherche: {nom[:30]}... à {ville}")
         
         all_emails = []
-        queries = self.generate_search_queries(nom, ville)
+        # Modèles au meilleur taux de réussite d'abord, arrêt quand un meilleur email devient improbable
+        plan = self.query_planner.plan(self.generate_search_queries(nom, ville), secteur, limit=8)
         
-        for query in queries:
-            for engine in ['google', 'bing']:
-                print(f"        📡 {engine.title()}: {query[:60]}...")
-                
-                html = self.search_engine_request(query, engine)
-                if html:
-                    emails = self.extract_emails(html)
-                    all_emails.extend(emails)
-                    
-                # Délai anti-détection
-                time.sleep(self.base_delay + random.uniform(0.5, 1.5))
+        for template, query in plan:
+            emails = self.search_engine_request(query)
+            plan.record(template, emails)
+            all_emails.extend(emails)
                 
         # Déduplication et scoring
         unique_emails = list(set(all_emails))
         if unique_emails:
             # Scorer et trier
-            scored_emails = [(email, self.score_email(email, nom, ville)) for email in unique_emails]
-            scored_emails.sort(key=lambda x: x[1], reverse=True)
+            scored_emails = self.scorer.best(nom, ville, unique_emails)
             
             best_email = scored_emails[0][0]
+            plan.finish(best_email)
             print(f"        ✅ Email trouvé: {best_email}")
             return best_email
         else:
+            plan.finish()
             print(f"        ❌ Aucun email trouvé")
             return None
             
     def load_rna_data(self, file_path):
         """Charge et filtre les données RNA"""
         print("📂 Chargement et filtrage des données RNA...")
-        df = pd.read_csv(file_path)
+        df = self.rna_cache.load_raw(file_path)
         
         initial_count = len(df)
         print(f"📊 {initial_count} associations dans le fichier")
         
-        # Filtrer les associations valides
-        df_valid = df[df['titre'].apply(self.is_valid_association)].copy()
+        # Filtrer les associations valides (une passe sur toute la colonne)
+        reasons = self.title_validator.classify(df['titre'])
+        df_valid = df[(reasons == '').values].copy()
         
         valid_count = len(df_valid)
         filtered_count = initial_count - valid_count
         
         print(f"✅ {valid_count} associations valides")
         print(f"🗑️ {filtered_count} associations filtrées (erreurs, dissolutions, etc.)")
+        for reason, count in self.title_validator.reason_counts(reasons).items():
+            print(f"  • {reason}: {count}")
         
         return df_valid
         
-    def run_smart_search(self, start_index=0, count=20):
-        """Lance la recherche intelligente"""
+    def run_smart_search(self, start_index=0, count=20, resume=False):
+        """Lance la recherche intelligente (resume: reprendre le dernier lancement journalisé)"""
+        if resume:
+            params, done, previous_results = self.journal.resume()
+            if params is None:
+                print(f"❌ Aucun lancement à reprendre ({self.journal.path})")
+                return None
+            start_index, count = params['start_index'], params['count']
+        else:
+            done, previous_results = set(), []
+        
         print("🎯 SMART CONTACT FINDER - VERSION PROPRE")
         print("=" * 60)
         print(f"📅 {datetime.now().strftime('%d/%m/%Y %H:%M')}")
@@ -295,18 +262,28 @@ class SmartContactFinderClean:
         print("🚀 Lancement recherche propre...")
         print("-" * 60)
         
-        results = []
-        found_count = 0
+        if not resume:
+            self.journal.start_run({'start_index': start_index, 'count': count})
+        
+        results = list(previous_results)
+        found_count = len(results)
+        rows = [row for row in associations_to_process.to_dict('records') if journal_key(row) not in done]
+        # Déjà résolues par un finder (contact trouvé, ou échec non expiré): aucune requête
+        rows, resolved = self.store.partition_resolved(rows)
+        print(f"♻️ Déjà résolues: {len(resolved)} (dont {sum(r['statut'] != 'not_found' for _, r in resolved)} avec contact)")
         
-        for idx, (_, row) in enumerate(associations_to_process.iterrows(), 1):
+        def search(row):
+            return self.smart_search_contact(row['titre'], row['libcom'], secteur=association_sector(row))
+        
+        def on_result(index, row, email):
+            # Appelé dans la boucle asyncio, une association à la fois
+            nonlocal found_count
             nom = row['titre']
             ville = row['libcom']
             adresse = row.get('adr1', '')
             objet = row.get('objet', '')
             
-            print(f"{idx:4d}/{len(associations_to_process)} - {nom[:40]}...")
-            
-            email = self.smart_search_contact(nom, ville, start_index + idx - 1)
+            print(f"{index + 1:4d}/{len(rows)} - {nom[:40]}... → {email or '❌'}")
             
             if email:
                 found_count += 1
@@ -322,11 +299,22 @@ class SmartContactFinderClean:
                     'secteur': 'À analyser'
                 }
                 results.append(contact_data)
-                
-                # Sauvegarde incrémentale tous les 5 contacts
-                if found_count % 5 == 0:
-                    self.save_results(results, start_index, start_index + idx, temp=True)
-                    print(f"        💾 Sauvegarde: {found_count} contacts")
+                # Enregistrement immédiat dans la base (remplace les sauvegardes temporaires)
+                self.store.record_contact({**contact_data, 'rna_id': row.get('id', '')}, 'smart_finder_clean')
+                self.journal.record(row, 'found', contact_data)
+            else:
+                self.store.record_search(
+                    {'nom': nom, 'ville': ville, 'adresse': adresse, 'objet': objet, 'rna_id': row.get('id', '')},
+                    'smart_finder_clean', 'not_found', 'Multi_Engine_Intelligent'
+                )
+                self.journal.record(row, 'not_found')
+        
+        self.engine.run(rows, search, on_result=on_result)
+        self.engine.report()
+        self.parser.report()
+        self.backends.report()
+        self.query_planner.save_run()
+        self.query_planner.report()
                     
         # Sauvegarde finale
         output_file = self.save_results(results, start_index, end_index)
@@ -373,11 +361,17 @@ class SmartContactFinderClean:
         return filepath
 
 if __name__ == "__main__":
-    finder = SmartContactFinderClean()
+    # --fixed-queries: ordre fixe des requêtes (mesure de référence avant apprentissage)
+    finder = SmartContactFinderClean(adaptive_queries='--fixed-queries' not in sys.argv)
     
     print("🏛️ Source: RNA Département 01 (associations filtrées)")
     print("🔬 Méthode: Recherche intelligente + Filtrage des erreurs")
     
+    # Reprise automatique du dernier lancement (aucune saisie d'index)
+    if '--resume' in sys.argv:
+        finder.run_smart_search(resume=True)
+        sys.exit(0)
+    
     # Paramètres par défaut
     start = input("📍 Index de départ (défaut: 0): ").strip()
     start = int(start) if start else 0
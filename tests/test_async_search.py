@@ -0,0 +1,206 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_search import AsyncSearchEngine
+from utils.http_cache import HttpResponseCache
+from utils.search_backends import BackendSelector
+
+BLOCK_PAGE = "<html><body>Our systems have detected unusual traffic from your computer</body></html>"
+RESULT_PAGE = "<html><body>contact@club-foot.fr</body></html>"
+
+
+class FakeResponse:
+
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeSession:
+    """Session HTTP hors ligne: page servie par URL, appels comptés"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        return FakeResponse(self.pages[url])
+
+
+class BlockPageCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HttpResponseCache(cache_dir=self.tmp.name, replay=False)
+        self.session = FakeSession({'https://www.google.com/search?q=a': BLOCK_PAGE,
+                                    'https://www.bing.com/search?q=a': RESULT_PAGE})
+        self.engine = AsyncSearchEngine(host_limits={}, default_limit={'rate': 1000, 'burst': 1000},
+                                        cache=self.cache, recorder=False, archive=False)
+        self.engine._local.session = self.session
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_block_page_not_cached(self):
+        first = self.engine.get('https://www.google.com/search?q=a')
+        second = self.engine.get('https://www.google.com/search?q=a')
+        self.assertFalse(second.from_cache)
+        self.assertTrue(BackendSelector.is_failure(first))
+        self.assertEqual(self.session.calls, 2)
+        self.assertIsNone(self.cache.get('https://www.google.com/search?q=a'))
+
+    def test_result_page_cached(self):
+        self.engine.get('https://www.bing.com/search?q=a')
+        second = self.engine.get('https://www.bing.com/search?q=a')
+        self.assertTrue(second.from_cache)
+        self.assertEqual(self.session.calls, 1)
+
+    def test_cached_block_page_is_evicted(self):
+        # Entrée écrite avant le filtrage des pages de blocage
+        self.cache.put('https://www.google.com/search?q=a', 200, BLOCK_PAGE)
+        response = self.engine.get('https://www.google.com/search?q=a')
+        self.assertFalse(response.from_cache)
+        self.assertEqual(self.session.calls, 1)
+        self.assertIsNone(self.cache.get('https://www.google.com/search?q=a'))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serveur de recherche local: /page (lente), /limite (429 puis 200)"""
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.hits.append((url.path, time.perf_counter()))
+            throttled = url.path == '/limite' and server.throttles > 0
+            if throttled:
+                server.throttles -= 1
+        try:
+            time.sleep(server.delay)
+            if throttled:
+                self.send_response(429)
+                self.send_header('Retry-After', '1')
+                self.end_headers()
+                return
+            body = f"resultat {parse_qs(url.query).get('q', [''])[0]}".encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EngineLocalServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server.lock = threading.Lock()
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.host = f"127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.hits = []
+        self.server.throttles = 0
+        self.server.delay = 0.05
+
+    def engine(self, rate=0, concurrency=2, **kwargs):
+        return AsyncSearchEngine(host_limits={self.host: {'rate': rate, 'burst': 1, 'concurrency': concurrency}},
+                                 default_limit={'rate': 0, 'burst': 1, 'concurrency': 1}, max_in_flight=8,
+                                 use_cache=False, recorder=False, archive=False, **kwargs)
+
+    def url(self, path, query=''):
+        return f"http://{self.host}{path}?q={query}"
+
+    def test_run_thread_workers_respect_host_concurrency(self):
+        engine = self.engine(concurrency=2)
+        results = engine.run(range(8), lambda i: engine.get(self.url('/page', i)).text)
+        self.assertEqual(results, [f"resultat {i}" for i in range(8)])
+        self.assertEqual(self.server.max_in_flight, 2)
+        self.assertEqual(engine.stats[self.host]['requetes'], 8)
+
+    def test_run_coroutine_workers(self):
+        engine = self.engine(concurrency=4)
+
+        async def worker(i):
+            response = await engine.fetch(self.url('/page', i))
+            return response.status_code
+
+        self.assertEqual(engine.run(range(6), worker), [200] * 6)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+
+    def test_host_rate(self):
+        # 20 requêtes/s, sans avance: 6 requêtes prennent au moins 5 intervalles
+        self.server.delay = 0
+        engine = self.engine(rate=20, concurrency=6)
+        started = time.perf_counter()
+        engine.run(range(6), lambda i: engine.get(self.url('/page', i)).status_code)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.24)
+
+    def test_429_retry_after(self):
+        self.server.throttles = 1
+        engine = self.engine(max_retries=2)
+        response = engine.run(['x'], lambda q: engine.get(self.url('/limite', q)))[0]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(engine.stats[self.host]['ralentissements'], 1)
+        (_, first), (_, second) = self.server.hits
+        # Nouvelle tentative seulement après le délai Retry-After
+        self.assertGreaterEqual(second - first, 0.95)
+
+    def test_should_stop(self):
+        engine = self.engine(concurrency=1)
+        done = []
+        results = engine.run(range(20), lambda i: engine.get(self.url('/page', i)).status_code,
+                             on_result=lambda index, item, result: done.append(item),
+                             should_stop=lambda: len(done) >= 3)
+        # Les éléments déjà en vol se terminent; aucun nouveau n'est lancé ensuite
+        self.assertLess(len(results), 20)
+        self.assertEqual(len(results), len(done))
+        self.assertGreaterEqual(len(done), 3)
+
+    def test_on_result_error_does_not_abort_run(self):
+        engine = self.engine(concurrency=4)
+        recorded = []
+
+        def on_result(index, item, result):
+            if item == 2:
+                raise ValueError("enregistrement invalide")
+            recorded.append(item)
+
+        results = engine.run(range(6), lambda i: engine.get(self.url('/page', i)).status_code, on_result=on_result)
+        self.assertEqual(results, [200] * 6)
+        self.assertEqual(sorted(recorded), [0, 1, 3, 4, 5])
+
+    def test_get_outside_run(self):
+        engine = self.engine()
+        self.assertEqual(engine.get(self.url('/page', 'seul')).text, "resultat seul")
+        self.assertEqual(asyncio.run(engine.fetch(self.url('/page', 'boucle'))).text, "resultat boucle")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import closing
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.domain_validator import DomainValidator, StubResolver, SystemResolver, email_domain
+
+RECORDS = {
+    'club-foot.fr': {'mx': ['mx1.club-foot.fr']},
+    'asso-sans-mx.fr': {'a': ['192.0.2.10']},
+    'refuse.fr': {'mx': ['.']},
+    'vide.fr': {},
+}
+
+
+class FailingResolver(StubResolver):
+    """Serveur DNS en panne: chaque requête échoue"""
+
+    async def mx(self, domain):
+        self.queries += 1
+        raise OSError("serveur DNS injoignable")
+
+
+class DomainValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'domain_cache.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def validator(self, resolver=None, **kwargs):
+        return DomainValidator(resolver or StubResolver(RECORDS), db_path=self.db_path, **kwargs)
+
+    def test_statuses(self):
+        statuses = self.validator().check_domains(
+            ['club-foot.fr', 'asso-sans-mx.fr', 'refuse.fr', 'vide.fr', 'inexistant.fr'])
+        self.assertEqual(statuses, {
+            'club-foot.fr': 'mx',
+            'asso-sans-mx.fr': 'a',
+            'refuse.fr': 'null_mx',
+            'vide.fr': 'sans_mx',
+            'inexistant.fr': 'nxdomain',
+        })
+
+    def test_invalid_emails_are_not_dns_failures(self):
+        validator = self.validator()
+        statuses = validator.check_emails(['', 'nan', 'sans-arobase.fr', '@club-foot.fr', 'contact@'])
+        self.assertEqual(set(statuses.values()), {'invalide'})
+        self.assertEqual(validator.stats['rejetes'], 0)
+        self.assertEqual(validator.stats['invalides'], 5)
+        self.assertEqual(validator.resolver.queries, 0)
+
+    def test_filter_contacts(self):
+        contacts = [{'email': 'Contact@Club-Foot.fr'}, {'email': 'info@inexistant.fr'}, {'email': 'nan'}]
+        kept, rejected = self.validator().filter_contacts(contacts)
+        self.assertEqual(kept, [{'email': 'Contact@Club-Foot.fr'}])
+        self.assertEqual(rejected, [{'email': 'info@inexistant.fr'}, {'email': 'nan'}])
+
+    def test_each_domain_resolved_once_and_cached(self):
+        resolver = StubResolver(RECORDS)
+        validator = self.validator(resolver)
+        validator.check_emails(['a@club-foot.fr', 'b@club-foot.fr', 'c@inexistant.fr'])
+        queries = resolver.queries
+        self.assertEqual(validator.stats['resolus'], 2)
+
+        # Nouvelle instance: le cache en base évite toute résolution
+        resolver = StubResolver(RECORDS)
+        validator = self.validator(resolver)
+        statuses = validator.check_emails(['d@club-foot.fr', 'e@inexistant.fr'])
+        self.assertEqual(statuses, {'d@club-foot.fr': 'mx', 'e@inexistant.fr': 'nxdomain'})
+        self.assertEqual(resolver.queries, 0)
+        self.assertEqual(validator.stats['hits'], 2)
+        self.assertGreater(queries, 0)
+
+    def test_negative_entries_expire(self):
+        self.validator().check_domains(['club-foot.fr', 'inexistant.fr'])
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("UPDATE domaines SET date_maj = datetime('now', 'localtime', '-2 hours')")
+            conn.commit()
+
+        validator = self.validator(ttl_hours=24, negative_ttl_hours=1)
+        self.assertEqual(validator.lookup('club-foot.fr'), 'mx')
+        self.assertIsNone(validator.lookup('inexistant.fr'))
+
+    def test_errors_are_neither_cached_nor_rejected(self):
+        resolver = FailingResolver(RECORDS)
+        validator = self.validator(resolver)
+        kept, rejected = validator.filter_contacts([{'email': 'contact@club-foot.fr'}])
+        self.assertEqual((len(kept), rejected), (1, []))
+        self.assertEqual(validator.stats['erreurs'], 1)
+        self.assertIsNone(validator.lookup('club-foot.fr'))
+
+        validator.check_domains(['club-foot.fr'])
+        self.assertEqual(resolver.queries, 2)
+
+    def test_system_resolver_without_address_is_an_error(self):
+        # getaddrinfo ne distingue pas un domaine inexistant d'un domaine à MX sans adresse
+        async def getaddrinfo(*args, **kwargs):
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+        validator = self.validator(SystemResolver())
+        with mock.patch.object(asyncio.BaseEventLoop, 'getaddrinfo', getaddrinfo):
+            statuses = validator.check_domains(['mx-sans-adresse.fr'])
+        self.assertEqual(statuses, {'mx-sans-adresse.fr': 'erreur'})
+        self.assertEqual(validator.stats['rejetes'], 0)
+
+    def test_email_domain(self):
+        self.assertEqual(email_domain(' Contact@Club-Foot.FR. '), 'club-foot.fr')
+        self.assertEqual(email_domain('nan'), '')
+        self.assertEqual(email_domain(None), '')
+
+    def test_concurrent_lookups(self):
+        resolver = StubResolver({f'club{i}.fr': {'mx': [f'mx.club{i}.fr']} for i in range(20)}, delay=0.05)
+        validator = self.validator(resolver, concurrency=20)
+        started = time.perf_counter()
+        statuses = validator.check_domains(f'club{i}.fr' for i in range(20))
+        elapsed = time.perf_counter() - started
+        self.assertEqual(set(statuses.values()), {'mx'})
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
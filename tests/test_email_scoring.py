@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from smart_contact_finder import SmartContactFinder
+from utils.email_scoring import EmailScorer
+
+CANDIDATES = ['contact@bourgenbresse.fr', 'info@mairie-oyonnax.fr', 'asso.foot@club-football.asso.fr',
+              'jean.dupont@orange.fr', 'secretaire@cc-nantua.fr', 'club@agglo.net', 'accueil@culture.com',
+              'sans-arobase']
+PAGES = ['', 'Club de Football de Bourg: entraînements, sport le mercredi', 'Amicale des pecheurs']
+
+
+class EmailScorerTest(unittest.TestCase):
+
+    def test_batch_matches_reference_scoring(self):
+        scorer = EmailScorer('smart')
+        for nom, ville in (('Club de Football de Bourg', 'Bourg-en-Bresse'), ('Amicale des Pecheurs', 'Oyonnax')):
+            for page in PAGES:
+                # score_email_reference n'utilise pas l'état du finder
+                reference = [SmartContactFinder.score_email_reference(None, email, nom, ville, page)
+                             for email in CANDIDATES]
+                batched = scorer.score_batch(nom, ville, [(email, page) for email in CANDIDATES])
+                self.assertEqual(batched, reference, (nom, ville, page))
+
+    def test_best_ranks_and_filters(self):
+        scorer = EmailScorer('smart')
+        ranked = scorer.best('Club de Football', 'Bourg-en-Bresse',
+                             ['jean.dupont@gmail.com', 'contact@bourgenbresse.fr'], minimum=10)
+        self.assertEqual(ranked, [('contact@bourgenbresse.fr', 60)])
+
+    def test_first_rule_takes_first_match(self):
+        # Profil rna: '.asso.fr' vaut 15 (et non 15 + 5 pour '.fr'), plus 5 pour le mot 'asso'
+        scorer = EmailScorer('rna')
+        self.assertEqual(scorer.score('Zzz', 'Yyy', 'x@b.asso.fr'), 20)
+        self.assertEqual(scorer.score('Zzz', 'Yyy', 'x@b.fr'), 5)
+
+    def test_profiles_are_cached(self):
+        scorer = EmailScorer('modern')
+        self.assertIs(scorer.profile('Club', 'Bourg'), scorer.profile('Club', 'Bourg'))
+
+
+if __name__ == '__main__':
+    unittest.main()
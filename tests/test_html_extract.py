@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.html_extract import extract_page
+
+
+class ExtractPageTest(unittest.TestCase):
+
+    def test_email_split_by_inline_tags(self):
+        self.assertEqual(extract_page("<p><span>contact</span>@club-foot.fr</p>").emails, ['contact@club-foot.fr'])
+        self.assertEqual(extract_page("<p>contact@club-<b>foot</b>.fr</p>").emails, ['contact@club-foot.fr'])
+
+    def test_blocks_are_separated(self):
+        page = extract_page("<table><tr><td>info@club.fr</td><td>04 74 00 00 00</td></tr></table>")
+        self.assertEqual(page.emails, ['info@club.fr'])
+        self.assertEqual(len(page.phones), 1)
+        self.assertEqual(extract_page("<div>contact</div><div>@club.fr</div>").emails, [])
+
+    def test_text_order_with_nested_tags(self):
+        page = extract_page("<div>a<!-- note -->b<p><b>c</b>d</p>e<script>ignore</script>f</div>")
+        self.assertEqual(page.text.split(), ['ab', 'cd', 'ef'])
+
+    def test_encoded_mailto(self):
+        self.assertEqual(extract_page('<a href="mailto:contact%40club.fr?subject=x">Écrire</a>').emails,
+                         ['contact@club.fr'])
+
+    def test_links(self):
+        page = extract_page('<a href="/contact">Contact</a><a href="https://www.facebook.com/club">fb</a>')
+        self.assertEqual(page.hrefs, ['/contact', 'https://www.facebook.com/club'])
+        self.assertEqual(page.links, ['https://www.facebook.com/club'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.http_cache import HttpResponseCache, normalize_url, url_key
+
+
+class NormalizeUrlTest(unittest.TestCase):
+
+    def test_equivalent_urls_share_a_key(self):
+        self.assertEqual(normalize_url('HTTPS://Club-Foot.FR:443/contact?b=2&a=1&utm_source=x#haut'),
+                         'https://club-foot.fr/contact?a=1&b=2')
+        self.assertEqual(url_key('http://club-foot.fr'), url_key('http://club-foot.fr:80/'))
+        self.assertNotEqual(url_key('http://club-foot.fr:8080/'), url_key('http://club-foot.fr/'))
+
+
+class HttpResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cache(self, **kwargs):
+        return HttpResponseCache(cache_dir=self.tmp.name, **kwargs)
+
+    def age(self, cache, seconds):
+        with cache._lock:
+            cache._conn.execute("UPDATE responses SET stocke_le = stocke_le - ?", (seconds,))
+            cache._conn.commit()
+
+    def test_put_get(self):
+        cache = self.cache()
+        self.assertIsNone(cache.get('https://club-foot.fr/contact'))
+        cache.put('https://club-foot.fr/contact', 200, 'contact@club-foot.fr é')
+        self.assertEqual(cache.get('https://club-foot.fr/contact#bas'), (200, 'contact@club-foot.fr é'))
+        self.assertEqual((cache.stats['hits'], cache.stats['misses']), (1, 1))
+
+        # Index et corps relus par une nouvelle instance
+        self.assertEqual(self.cache().get('https://club-foot.fr/contact'), (200, 'contact@club-foot.fr é'))
+
+    def test_expired_entries_except_in_replay(self):
+        cache = self.cache(ttl_hours=1)
+        cache.put('https://club-foot.fr/', 200, 'page')
+        self.age(cache, 7200)
+        self.assertIsNone(cache.get('https://club-foot.fr/'))
+        self.assertEqual(cache.stats['expires'], 1)
+        self.assertEqual(self.cache(ttl_hours=1, replay=True).get('https://club-foot.fr/'), (200, 'page'))
+
+    def test_lru_eviction(self):
+        # Corps aléatoires de même taille compressée; le cache en contient deux et demi
+        cache = self.cache()
+        pages = {f'https://club{i}.fr/': os.urandom(20 * 1024).hex() for i in range(3)}
+        cache.put('https://club0.fr/', 200, pages['https://club0.fr/'])
+        cache.max_bytes = int(cache.total_bytes * 2.5)
+        cache.put('https://club1.fr/', 200, pages['https://club1.fr/'])
+        time.sleep(0.01)
+        cache.get('https://club0.fr/')
+        cache.put('https://club2.fr/', 200, pages['https://club2.fr/'])
+
+        self.assertEqual(cache.stats['evinces'], 1)
+        self.assertIsNone(cache.get('https://club1.fr/'))
+        self.assertIsNotNone(cache.get('https://club0.fr/'))
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+
+    def test_delete(self):
+        cache = self.cache()
+        cache.put('https://club-foot.fr/', 200, 'captcha')
+        size = cache.total_bytes
+        self.assertTrue(cache.delete('https://club-foot.fr/'))
+        self.assertFalse(cache.delete('https://club-foot.fr/'))
+        self.assertIsNone(cache.get('https://club-foot.fr/'))
+        self.assertEqual(cache.total_bytes, 0)
+        self.assertGreater(size, 0)
+
+    def test_missing_body_is_a_miss(self):
+        cache = self.cache()
+        cache.put('https://club-foot.fr/', 200, 'page')
+        os.remove(cache._body_path(url_key('https://club-foot.fr/')))
+        self.assertIsNone(cache.get('https://club-foot.fr/'))
+
+
+if __name__ == '__main__':
+    unittest.main()
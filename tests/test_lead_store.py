@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import closing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.lead_store import RNA_CONTACT_ETAPES, LeadStore
+
+
+def association(nom, ville='Bourg-en-Bresse'):
+    return {'nom': nom, 'ville': ville}
+
+
+class ResolutionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'leads.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def resolutions(self, store, names):
+        pending, resolved = store.partition_resolved([association(nom) for nom in names])
+        return [a['nom'] for a in pending], {a['nom']: r['statut'] for a, r in resolved}
+
+    def test_association_email_is_definitive(self):
+        # TTL nul: tout ce qui expire est immédiatement à rechercher
+        store = LeadStore(self.db_path, negative_ttl_days=0)
+        store.record_search(association('Club A'), 'smart_finder', 'found', 'google',
+                            {'email': 'contact@club-a.fr'})
+        pending, resolved = self.resolutions(store, ['Club A'])
+        self.assertEqual(pending, [])
+        self.assertEqual(resolved, {'Club A': 'found'})
+
+    def test_partial_contacts_expire(self):
+        store = LeadStore(self.db_path, negative_ttl_days=0)
+        store.record_search(association('Site seul'), 'rna_contact_scraper', 'found', 'google',
+                            {'site_web': 'https://site-seul.fr'})
+        store.record_search(association('Mairie'), 'modern_finder', 'found', 'fallback',
+                            {'email': 'mairie@commune.fr', 'contact_type': 'Mairie'})
+        store.record_search(association('Rien'), 'smart_finder', 'not_found')
+        pending, resolved = self.resolutions(store, ['Site seul', 'Mairie', 'Rien'])
+        self.assertEqual(pending, ['Site seul', 'Mairie', 'Rien'])
+        self.assertEqual(resolved, {})
+
+    def test_partial_contacts_within_ttl(self):
+        store = LeadStore(self.db_path)
+        store.record_search(association('Mairie'), 'modern_finder', 'found', 'fallback',
+                            {'email': 'mairie@commune.fr', 'contact_type': 'Mairie'})
+        pending, resolved = self.resolutions(store, ['Mairie'])
+        self.assertEqual(resolved, {'Mairie': 'partial'})
+
+    def test_partial_never_replaces_found(self):
+        store = LeadStore(self.db_path, negative_ttl_days=0)
+        store.record_search(association('Club A'), 'smart_finder', 'found', 'google',
+                            {'email': 'contact@club-a.fr'})
+        store.record_search(association('Club A'), 'modern_finder', 'found', 'fallback',
+                            {'email': 'mairie@commune.fr', 'contact_type': 'Mairie'})
+        store.record_search(association('Club A'), 'bulk_finder', 'not_found')
+        _, resolved = store.partition_resolved([association('Club A')])
+        self.assertEqual(resolved[0][1]['statut'], 'found')
+        self.assertEqual(resolved[0][1]['email'], 'contact@club-a.fr')
+
+    def test_found_upgrades_partial(self):
+        store = LeadStore(self.db_path)
+        store.record_search(association('Club A'), 'rna_contact_scraper', 'found', 'google',
+                            {'site_web': 'https://club-a.fr'})
+        store.record_search(association('Club A'), 'smart_finder', 'found', 'google',
+                            {'email': 'contact@club-a.fr'})
+        _, resolved = self.resolutions(store, ['Club A'])
+        self.assertEqual(resolved, {'Club A': 'found'})
+
+    def test_legacy_partial_found_is_demoted(self):
+        store = LeadStore(self.db_path, negative_ttl_days=0)
+        store.record_search(association('Site seul'), 'rna_contact_scraper', 'found', 'google',
+                            {'site_web': 'https://site-seul.fr'})
+        # Base d'une version précédente: site seul enregistré comme définitif
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("UPDATE resolutions SET statut = 'found', expire_le = NULL")
+            conn.commit()
+        store = LeadStore(self.db_path, negative_ttl_days=0)
+        pending, resolved = self.resolutions(store, ['Site seul'])
+        self.assertEqual(pending, ['Site seul'])
+
+
+class ContactQueriesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = LeadStore(os.path.join(self.tmp.name, 'leads.db'))
+        self.store.record_search(association('Club A'), 'rna_contact_scraper', 'found', 'google',
+                                 {'email': 'contact@club-a.fr'})
+        self.store.record_search(association('Club B'), 'modern_finder', 'found', 'fallback',
+                                 {'email': 'mairie@commune.fr', 'contact_type': 'Mairie'})
+        self.store.record_search(association('Club C'), 'smart_finder', 'found', 'google',
+                                 {'email': 'info@club-c.fr'})
+        self.store.record_search(association('Club D'), 'rna_processor', 'found', 'google',
+                                 {'email': 'bureau@club-d.fr', 'phone': '', 'website': ''})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_all_stages_by_default(self):
+        self.assertEqual(len(self.store.email_contacts()), 4)
+        self.assertEqual(len(self.store.associations_with_contacts()), 4)
+
+    def test_rna_stage_only(self):
+        emails = self.store.email_contacts(etapes=RNA_CONTACT_ETAPES, contact_types=('Association',))
+        self.assertEqual(sorted(emails['email']), ['bureau@club-d.fr', 'contact@club-a.fr'])
+        rows = self.store.associations_with_contacts(etapes=RNA_CONTACT_ETAPES, contact_types=('Association',))
+        self.assertEqual(sorted(rows['email_principal']), ['bureau@club-d.fr', 'contact@club-a.fr'])
+
+    def test_contact_type_filter(self):
+        emails = self.store.email_contacts(contact_types=('Association',))
+        self.assertEqual(sorted(emails['email']), ['bureau@club-d.fr', 'contact@club-a.fr', 'info@club-c.fr'])
+
+
+if __name__ == "__main__":
+    unittest.main()
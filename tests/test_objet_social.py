@@ -0,0 +1,30 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.objet_social import ObjetSocialNomenclature
+
+
+class NomenclatureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.nomenclature = ObjetSocialNomenclature()
+
+    def test_environment_theme_is_not_hunting(self):
+        for code in ('024000', '024045', '24999'):
+            categories = self.nomenclature.categories(code)
+            self.assertEqual(categories['secteur_nom'], 'Environnement')
+            self.assertNotEqual(categories['type_association'], 'CHASSE')
+
+    def test_hunting_and_fishing_codes(self):
+        for code in ('013000', '013005', '13999'):
+            self.assertEqual(self.nomenclature.categories(code)['type_association'], 'CHASSE')
+
+    def test_theme_fallback_and_second_code(self):
+        mapped = self.nomenclature.map_codes(['011035', '011999', '', 'abc'], ['', '', '006000', ''])
+        self.assertEqual(mapped['secteur_nom'].tolist(), ['Sports/Boules', 'Sports', 'Culture/Arts', 'Autre'])
+
+
+if __name__ == "__main__":
+    unittest.main()
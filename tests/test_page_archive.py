@@ -0,0 +1,63 @@
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.page_archive import PageArchive, PageRecorder, archive_is_intact
+
+
+class PageArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.jsonl.gz')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, urls):
+        recorder = PageRecorder(self.path)
+        for url in urls:
+            recorder.record(url, {'User-Agent': 'test'}, 200, {}, f"page {url}")
+        recorder.close()
+
+    def crash_during_run(self, urls):
+        # Lancement interrompu: membre gzip écrit en partie seulement
+        member = gzip.compress(''.join(f'{{"url": "{url}", "status_code": 200, "body": "x"}}\n'
+                                       for url in urls).encode('utf-8'))
+        with open(self.path, 'ab') as f:
+            f.write(member[:len(member) // 2])
+
+    def test_runs_append_to_the_same_archive(self):
+        self.record(['https://club-a.fr/', 'https://club-b.fr/'])
+        self.record(['https://club-a.fr/contact'])
+        archive = PageArchive(self.path)
+        self.assertEqual(len(archive), 3)
+        self.assertEqual(archive.get('https://club-a.fr/contact')['body'], "page https://club-a.fr/contact")
+
+    def test_run_after_crash_keeps_all_readable_pages(self):
+        self.record(['https://club-a.fr/', 'https://club-b.fr/'])
+        self.crash_during_run([f'https://perdu{i}.fr/' for i in range(50)])
+        self.assertFalse(archive_is_intact(self.path))
+
+        # Le lancement suivant répare l'archive avant d'y ajouter ses pages
+        self.record(['https://club-c.fr/'])
+        self.assertTrue(archive_is_intact(self.path))
+        archive = PageArchive(self.path)
+        for url in ('https://club-a.fr/', 'https://club-b.fr/', 'https://club-c.fr/'):
+            self.assertIsNotNone(archive.get(url))
+        # Les pages entièrement décompressées du membre tronqué sont conservées
+        self.assertLess(len(archive), 53)
+
+    def test_truncated_archive_is_readable_up_to_the_crash(self):
+        self.record(['https://club-a.fr/'])
+        self.crash_during_run(['https://perdu.fr/'])
+        archive = PageArchive(self.path)
+        self.assertEqual(len(archive), 1)
+        self.assertIsNone(archive.get('https://perdu.fr/'))
+
+
+if __name__ == "__main__":
+    unittest.main()
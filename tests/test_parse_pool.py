@@ -0,0 +1,48 @@
+import io
+import os
+import sys
+import time
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.contact_patterns import find_emails
+from utils.parse_pool import ParsePool
+
+
+def report_of(pool, busy, blocked, elapsed=10.0):
+    """Rapport d'un pool dont l'activité est simulée (secondes d'occupation par worker)"""
+    pool._started = time.perf_counter() - elapsed
+    pool.stats.update({'pages': 100, 'lots': 10, 'bloque_s': blocked})
+    pool.worker_busy = {1000 + i: seconds for i, seconds in enumerate(busy)}
+    output = io.StringIO()
+    with redirect_stdout(output):
+        pool.report()
+    return output.getvalue()
+
+
+class ParsePoolTest(unittest.TestCase):
+
+    def test_inline_map(self):
+        pool = ParsePool(workers=0)
+        pages = ["contact@club-a.fr", "rien ici", "info@club-b.fr"]
+        self.assertEqual(list(pool.map(find_emails, pages)), [find_emails(page) for page in pages])
+        self.assertEqual(pool.stats['pages'], 3)
+
+    def test_busy_workers_are_cpu_bound(self):
+        output = report_of(ParsePool(workers=2), busy=[9.0, 8.5], blocked=0.0)
+        self.assertIn("Limité par le CPU", output)
+
+    def test_full_queue_with_idle_workers_is_ipc_overhead(self):
+        # File pleine mais workers à 11%: ajouter des processus n'aiderait pas
+        output = report_of(ParsePool(workers=2), busy=[1.1, 1.1], blocked=5.0)
+        self.assertNotIn("Limité par le CPU", output)
+        self.assertIn("échanges entre processus", output)
+
+    def test_idle_workers_are_network_bound(self):
+        output = report_of(ParsePool(workers=2), busy=[1.0, 1.0], blocked=0.0)
+        self.assertIn("Limité par le réseau", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.query_planner import QueryPlanner
+
+QUERIES = [('nom_ville', '"Club" Bourg'), ('nom_email', '"Club" email'), ('nom_contact', '"Club" contact')]
+
+
+class QueryPlannerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'query_stats.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def planner(self, **kwargs):
+        return QueryPlanner('smart_finder', db_path=self.db_path, **kwargs)
+
+    def train(self, planner, winner, rounds=50, secteur=''):
+        for _ in range(rounds):
+            planner.update(secteur, [template for template, _ in QUERIES], winner)
+
+    def test_default_order_without_stats(self):
+        plan = self.planner().plan(QUERIES)
+        self.assertEqual([template for template, _ in plan], ['nom_ville', 'nom_email', 'nom_contact'])
+
+    def test_learned_order_and_early_stop(self):
+        planner = self.planner()
+        self.train(planner, 'nom_contact')
+
+        plan = planner.plan(QUERIES)
+        tried = []
+        for template, query in plan:
+            tried.append(template)
+            plan.record(template, ['contact@club.fr'] if template == 'nom_contact' else [])
+        # Le meilleur modèle trouve l'email: les autres trouvent rarement mieux
+        self.assertEqual(tried, ['nom_contact'])
+        self.assertEqual(plan.finish('Contact@club.fr'), 'nom_contact')
+
+    def test_fixed_order_is_kept(self):
+        planner = self.planner(adaptive=False)
+        self.train(planner, 'nom_contact')
+        plan = planner.plan(QUERIES, limit=2)
+        self.assertEqual([template for template, _ in plan], ['nom_ville', 'nom_email'])
+
+    def test_stats_are_persisted_per_sector(self):
+        self.train(self.planner(), 'nom_email', secteur='Sport')
+        planner = self.planner()
+        self.assertGreater(planner.hit_rate('Sport', 'nom_email'), planner.hit_rate('Sport', 'nom_ville'))
+        # Secteur sans historique: le taux global sert d'a priori
+        self.assertAlmostEqual(planner.hit_rate('Culture', 'nom_email'), planner.hit_rate('', 'nom_email'))
+        self.assertEqual(planner.run_stats['associations'], 0)
+
+    def test_finish_without_email(self):
+        planner = self.planner()
+        plan = planner.plan(QUERIES)
+        for template, _ in plan:
+            plan.record(template, [])
+        self.assertIsNone(plan.finish())
+        self.assertEqual(planner.run_stats, {'associations': 1, 'requetes': 3, 'trouvees': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import unittest
+from email.utils import formatdate
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import RATE_BACKOFF_MAX_FACTOR, RATE_RETRY_AFTER_MAX_S
+from utils.rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2.0, burst=2)
+        now = bucket.updated
+        self.assertEqual(bucket.reserve(now), 0.0)
+        self.assertEqual(bucket.reserve(now), 0.0)
+        # Seau vide: 2 jetons/s, le troisième attend 0,5s, le quatrième 1s
+        self.assertAlmostEqual(bucket.reserve(now), 0.5)
+        self.assertAlmostEqual(bucket.reserve(now), 1.0)
+
+    def test_idle_host_never_waits(self):
+        bucket = TokenBucket(rate=1.0, burst=1)
+        now = bucket.updated
+        bucket.reserve(now)
+        self.assertEqual(bucket.reserve(now + 10), 0.0)
+
+    def test_unlimited(self):
+        bucket = TokenBucket(rate=0)
+        self.assertEqual([bucket.reserve() for _ in range(5)], [0.0] * 5)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def limiter(self):
+        return RateLimiter(host_limits={'lent.fr': {'rate': 4.0, 'burst': 1}},
+                           default_limit={'rate': 0, 'burst': 1})
+
+    def test_throttle_halves_rate_and_success_recovers(self):
+        limiter = self.limiter()
+        self.assertTrue(limiter.feedback('lent.fr', status_code=429, retry_after=0))
+        self.assertAlmostEqual(limiter.current_rate('lent.fr'), 2.0)
+        self.assertTrue(limiter.feedback('lent.fr', error='Read timed out', retry_after=0))
+        self.assertAlmostEqual(limiter.current_rate('lent.fr'), 1.0)
+
+        for _ in range(100):
+            self.assertFalse(limiter.feedback('lent.fr', status_code=200))
+        self.assertAlmostEqual(limiter.current_rate('lent.fr'), 4.0)
+
+    def test_backoff_is_capped(self):
+        limiter = self.limiter()
+        for _ in range(20):
+            limiter.feedback('lent.fr', status_code=503, retry_after=0)
+        self.assertAlmostEqual(limiter.current_rate('lent.fr'), 4.0 / RATE_BACKOFF_MAX_FACTOR)
+
+    def test_retry_after_blocks_host(self):
+        limiter = self.limiter()
+        limiter.feedback('autre.fr', status_code=429, retry_after=30)
+        self.assertGreater(limiter.reserve('autre.fr'), 29)
+        # Les autres hôtes ne sont pas suspendus
+        self.assertEqual(limiter.reserve('libre.fr'), 0.0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after(' 1.5 '), 1.5)
+        self.assertEqual(parse_retry_after('-3'), 0.0)
+        self.assertIsNone(parse_retry_after('nan'))
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('demain'))
+        delay = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+        self.assertTrue(55 <= delay <= 60)
+
+    def test_retry_after_is_capped(self):
+        self.assertEqual(parse_retry_after('86400'), RATE_RETRY_AFTER_MAX_S)
+        self.assertEqual(parse_retry_after('inf'), RATE_RETRY_AFTER_MAX_S)
+        self.assertEqual(parse_retry_after(formatdate(time.time() + 86400, usegmt=True)), RATE_RETRY_AFTER_MAX_S)
+        self.assertEqual(parse_retry_after('120', max_delay=30), 30)
+
+        limiter = RateLimiter(host_limits={}, default_limit={'rate': 1.0, 'burst': 1})
+        limiter.feedback('lent.fr', status_code=429, retry_after=86400)
+        self.assertLessEqual(limiter.reserve('lent.fr'), RATE_RETRY_AFTER_MAX_S)
+
+
+if __name__ == '__main__':
+    unittest.main()
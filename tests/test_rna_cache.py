@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.rna_cache import RnaTableCache
+
+RNA_CSV = "id,titre,libcom\nW1,CLUB A,BOURG\n"
+
+
+class RnaTableCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RnaTableCache(cache_dir=os.path.join(self.tmp.name, 'cache'))
+        if not self.cache.enabled:
+            self.skipTest("pyarrow absent")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content=RNA_CSV):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.cache.cache_dir) if name.endswith('.feather'))
+
+    def test_sources_of_same_departement_coexist(self):
+        first = self.write('rna_a_dpt_01.csv')
+        second = self.write('rna_b_dpt_01.csv', RNA_CSV + "W2,CLUB B,OYONNAX\n")
+        self.cache.load_raw(first)
+        self.cache.load_raw(second)
+        self.assertEqual(len(self.entries()), 2)
+        # Relectures servies par le cache: aucune entrée réécrite ni supprimée
+        before = self.entries()
+        self.assertEqual(len(self.cache.load_raw(first)), 1)
+        self.assertEqual(len(self.cache.load_raw(second)), 2)
+        self.assertEqual(self.entries(), before)
+
+    def test_updated_source_replaces_its_entry(self):
+        first = self.write('rna_a_dpt_01.csv')
+        other = self.write('rna_b_dpt_01.csv')
+        self.cache.load_raw(first)
+        self.cache.load_raw(other)
+        self.write('rna_a_dpt_01.csv', RNA_CSV + "W2,CLUB B,OYONNAX\n")
+        self.assertEqual(len(self.cache.load_raw(first)), 2)
+        self.assertEqual(len(self.entries()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
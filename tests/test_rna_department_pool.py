@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.rna_department_pool import RnaDepartmentPool
+from scrapers.rna_processor import RnaAssociationProcessor
+
+
+def rna_rows(count, code_insee, code_postal, ville):
+    return [{
+        'id': f'W{code_postal}{i:04d}', 'titre': f'CLUB SPORTIF NUMERO {i}', 'objet': 'pratique du sport',
+        'adr1': '1 rue de la Mairie', 'adrs_codeinsee': code_insee, 'adrs_codepostal': code_postal,
+        'libcom': ville, 'objet_social1': '011000', 'objet_social2': '', 'date_publi': '2020-01-01',
+        'nature': 'D',
+    } for i in range(count)]
+
+
+class RnaDepartmentPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        # Bases et caches (chemins relatifs data/...) créés dans un dossier temporaire
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.source = os.path.join(self.tmp.name, 'source')
+        os.makedirs(self.source)
+        pd.DataFrame(rna_rows(20, '01053', '01000', 'Bourg-en-Bresse')).to_csv(
+            os.path.join(self.source, 'rna_import_dpt_01.csv'), index=False)
+        pd.DataFrame(rna_rows(30, '69123', '69001', 'Lyon')).to_csv(
+            os.path.join(self.source, 'rna_import_dpt_69.csv'), index=False)
+        self.searches = []
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def fake_search(self, processor, associations, max_searches=50):
+        self.searches.append((os.getpid(), associations[0]['departement'], max_searches))
+        for assoc in associations[:max_searches]:
+            assoc.update({'email_principal': f"contact@{assoc['rna_id'].lower()}.fr", 'statut_recherche': 'found'})
+        return associations
+
+    def test_clean_in_workers_then_search_in_parent(self):
+        pool = RnaDepartmentPool(data_dir=self.tmp.name, workers=2)
+        with mock.patch.object(RnaAssociationProcessor, 'search_association_contacts',
+                               lambda processor, *args: self.fake_search(processor, *args)):
+            summary = pool.process_departments(self.source, departements=None, search_contacts=True,
+                                               max_searches=5)
+
+        self.assertEqual(sorted(self.searches), [(os.getpid(), '01', 5), (os.getpid(), '69', 5)])
+        self.assertEqual(summary['statistiques']['Total associations'], 50)
+        self.assertEqual(summary['statistiques']['Avec email'], 10)
+        self.assertEqual(summary['par_departement']['69']['Recherches effectuées'], 5)
+
+        # Empreintes des deux fichiers dans l'index partagé du cache
+        with open(os.path.join('data', 'cache', 'rna', 'hash_index.json'), encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_clean_only(self):
+        summary = RnaDepartmentPool(data_dir=self.tmp.name, workers=2).process_departments(
+            self.source, departements=None)
+        self.assertEqual(summary['par_departement']['01']['Total associations'], 20)
+        self.assertEqual(summary['statistiques']['Recherches effectuées'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
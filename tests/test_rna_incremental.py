@@ -0,0 +1,118 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.rna_incremental import RnaIncrementalIngestor
+from utils.rna_state import STATUT_ACTIVE, STATUT_EN_ATTENTE
+
+# Lu comme RnaTableCache.load_raw: dtype=str, cellules vides -> NaN
+SNAPSHOT_CSV = """id,titre,position,date_disso,date_maj,date_publi
+W1,CLUB A,A,,2024-01-01,2020-01-01
+W2,CLUB B,,0001-01-01,2024-01-01,2020-01-01
+W3,CLUB C,D,,2024-01-01,2020-01-01
+W4,CLUB D,,2023-06-30,2024-01-01,2020-01-01
+"""
+
+
+class SnapshotVersionsTest(unittest.TestCase):
+
+    def setUp(self):
+        # Bases et caches (chemins relatifs data/...) créés dans un dossier temporaire
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.ingestor = RnaIncrementalIngestor(data_dir=self.tmp.name)
+        self.raw = pd.read_csv(io.StringIO(SNAPSHOT_CSV), dtype=str)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_dissolution(self):
+        snapshot = self.ingestor.snapshot_versions(self.raw).set_index('rna_id')
+        self.assertFalse(snapshot.loc['W1', 'dissoute'])  # position A, date_disso vide (NaN)
+        self.assertFalse(snapshot.loc['W2', 'dissoute'])  # date sentinelle 0001-01-01
+        self.assertTrue(snapshot.loc['W3', 'dissoute'])  # position D
+        self.assertTrue(snapshot.loc['W4', 'dissoute'])  # pas de position, date de dissolution
+
+    def test_active_associations_are_processed(self):
+        snapshot = self.ingestor.snapshot_versions(self.raw)
+        to_process, to_dissolve, removed = self.ingestor.compute_delta(
+            snapshot, self.ingestor.state.load('01'))
+        self.assertEqual(sorted(snapshot['rna_id'][to_process]), ['W1', 'W2'])
+        self.assertEqual(sorted(snapshot['rna_id'][to_dissolve]), ['W3', 'W4'])
+        self.assertEqual(removed, [])
+
+
+DELTA_CSV = """id,titre,position,date_disso,date_maj,date_publi,adrs_codeinsee,adrs_codepostal,libcom
+W1,CLUB SPORTIF ALPHA,A,,2024-01-01,2020-01-01,01053,01000,Bourg-en-Bresse
+W2,CLUB SPORTIF BETA,A,,2024-01-01,2020-01-01,01053,01000,Bourg-en-Bresse
+W3,CLUB SPORTIF GAMMA,A,,2024-01-01,2020-01-01,01053,01000,Bourg-en-Bresse
+"""
+
+
+class IngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.ingestor = RnaIncrementalIngestor(data_dir=self.tmp.name)
+        self.searched = []
+        self.ingestor.processor.search_association_contacts = self.fake_search
+        self.path = os.path.join(self.tmp.name, 'rna_import_20250701_dpt_01.csv')
+        self.write_snapshot(DELTA_CSV)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write_snapshot(self, content):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def fake_search(self, associations, max_searches=50):
+        # Comme search_association_contacts: au-delà de max_searches, statut 'pending' inchangé
+        for assoc in associations[:max_searches]:
+            self.searched.append(assoc['rna_id'])
+            assoc.update({'email': f"contact@{assoc['rna_id'].lower()}.fr", 'phone': '', 'website': '',
+                          'statut_recherche': 'found'})
+        return associations
+
+    def states(self):
+        return dict(self.ingestor.state.load('01')[['rna_id', 'statut']].values)
+
+    def current(self):
+        path = os.path.join(self.tmp.name, 'rna_associations_current_dpt01.csv')
+        return pd.read_csv(path, dtype=str, keep_default_na=False).set_index('rna_id')
+
+    def test_unsearched_rows_are_retried(self):
+        self.ingestor.ingest(self.path, max_searches=2)
+        self.assertEqual(self.searched, ['W1', 'W2'])
+        self.assertEqual(self.states(), {'W1': STATUT_ACTIVE, 'W2': STATUT_ACTIVE, 'W3': STATUT_EN_ATTENTE})
+
+        # Instantané inchangé: seule l'association non recherchée est reprise
+        self.ingestor.ingest(self.path, max_searches=2)
+        self.assertEqual(self.searched, ['W1', 'W2', 'W3'])
+        self.assertEqual(set(self.states().values()), {STATUT_ACTIVE})
+
+    def test_changed_association_keeps_its_contacts(self):
+        self.ingestor.ingest(self.path, max_searches=3)
+        self.assertEqual(self.current().loc['W1', 'email'], 'contact@w1.fr')
+
+        # W1 modifiée, recherche non lancée: la nouvelle version garde l'email trouvé
+        self.write_snapshot(DELTA_CSV.replace('W1,CLUB SPORTIF ALPHA,A,,2024-01-01', 'W1,CLUB SPORTIF ALPHA,A,,2024-06-01'))
+        self.ingestor.ingest(self.path, search_contacts=False)
+        current = self.current()
+        self.assertEqual(current.loc['W1', 'email'], 'contact@w1.fr')
+        self.assertEqual(current.loc['W1', 'statut_recherche'], 'found')
+        self.assertEqual(len(current), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
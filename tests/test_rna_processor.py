@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scrapers.rna_processor import RnaAssociationProcessor
+
+
+def rna_rows(count, code_insee, code_postal, ville, start=0):
+    return [{
+        'id': f'W{start + i:09d}', 'titre': f'CLUB SPORTIF NUMERO {start + i}', 'objet': 'pratique du sport',
+        'adr1': '1 rue de la Mairie', 'adrs_codeinsee': code_insee, 'adrs_codepostal': code_postal,
+        'libcom': ville, 'objet_social1': '011000', 'objet_social2': '', 'date_publi': '2020-01-01',
+        'nature': 'D',
+    } for i in range(count)]
+
+
+class StreamingDepartementTest(unittest.TestCase):
+
+    def setUp(self):
+        # Bases et caches (chemins relatifs data/...) créés dans un dossier temporaire
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.processor = RnaAssociationProcessor()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write_csv(self, name, rows):
+        path = os.path.join(self.tmp.name, name)
+        pd.DataFrame(rows).to_csv(path, index=False)
+        return path
+
+    def test_national_file_takes_departement_from_each_row(self):
+        path = self.write_csv('rna_import_national.csv',
+                              rna_rows(1000, '01053', '01000', 'Bourg-en-Bresse') +
+                              rna_rows(1000, '75056', '75001', 'Paris', start=1000))
+        streamed = pd.concat(self.processor.stream_rna_frames(path, chunksize=300), ignore_index=True)
+        counts = streamed['departement'].astype(str).value_counts().to_dict()
+        self.assertEqual(counts, {'01': 1000, '75': 1000})
+        self.assertEqual(set(streamed.loc[streamed['ville'] == 'Paris', 'source'].astype(str)),
+                         {'RNA_Officiel_Dpt75'})
+
+        # Même résultat que le chemin par le cache
+        cached = self.processor.cache.load_cleaned(path, self.processor)
+        self.assertEqual(list(streamed['departement'].astype(str)), list(cached['departement'].astype(str)))
+
+    def test_departement_file_keeps_its_departement(self):
+        path = self.write_csv('rna_import_20250701_dpt_01.csv', rna_rows(10, '01053', '01000', 'Bourg-en-Bresse'))
+        streamed = pd.concat(self.processor.stream_rna_frames(path), ignore_index=True)
+        self.assertEqual(set(streamed['departement'].astype(str)), {'01'})
+
+
+if __name__ == "__main__":
+    unittest.main()
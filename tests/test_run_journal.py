@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.run_journal import RunJournal
+
+
+class RunJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = RunJournal('test_stage', journal_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_retries_errors(self):
+        self.journal.start_run({'start_index': 0})
+        self.journal.record({'id': 'W1'}, 'found', {'email': 'contact@club-a.fr'})
+        self.journal.record({'id': 'W2'}, 'not_found')
+        self.journal.record({'id': 'W3'}, 'error')
+        params, done, found = self.journal.resume()
+        self.assertEqual(params, {'start_index': 0})
+        self.assertEqual(done, {'W1', 'W2'})
+        self.assertEqual(found, [{'email': 'contact@club-a.fr'}])
+
+    def test_error_then_success(self):
+        self.journal.start_run({})
+        self.journal.record({'id': 'W1'}, 'error')
+        self.journal.record({'id': 'W1'}, 'found', {'email': 'contact@club-a.fr'})
+        _, done, _ = self.journal.resume()
+        self.assertEqual(done, {'W1'})
+
+    def test_truncated_last_line(self):
+        self.journal.start_run({})
+        self.journal.record({'id': 'W1'}, 'not_found')
+        with open(self.journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "association", "cle": "W2"')
+        _, done, _ = self.journal.resume()
+        self.assertEqual(done, {'W1'})
+
+    def test_only_last_run(self):
+        self.journal.start_run({'start_index': 0})
+        self.journal.record({'id': 'W1'}, 'not_found')
+        self.journal.start_run({'start_index': 10})
+        params, done, _ = self.journal.resume()
+        self.assertEqual(params, {'start_index': 10})
+        self.assertEqual(done, set())
+
+
+    def test_torn_last_line(self):
+        self.journal.start_run({'start_index': 0})
+        self.journal.record({'id': 'W1'}, 'found', {'email': 'contact@club-a.fr'})
+        # Arrêt brutal pendant l'écriture: dernière ligne sans fin de ligne
+        with open(self.journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "association", "cle": "W2", "sta')
+
+        journal = RunJournal('test_stage', journal_dir=self.tmp.name)
+        journal.record({'id': 'W3'}, 'not_found')
+        journal.record({'id': 'W4'}, 'found', {'email': 'contact@club-d.fr'})
+        params, done, found = journal.resume()
+        self.assertEqual(params, {'start_index': 0})
+        self.assertEqual(done, {'W1', 'W3', 'W4'})
+        self.assertEqual(found, [{'email': 'contact@club-a.fr'}, {'email': 'contact@club-d.fr'}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.async_search import SearchResponse
+from utils.parse_pool import ParsePool
+from utils.site_crawler import SiteCrawler
+
+PAGES = {
+    'https://club-foot.fr/robots.txt': "User-agent: *\nDisallow: /prive",
+    'https://club-foot.fr/': '<a href="/contact">Contact</a><a href="/prive/contact">Bureau</a>',
+    'https://club-foot.fr/contact': "<p>Écrire à <span>contact</span>@club-foot.fr</p>",
+    'https://club-foot.fr/prive/contact': "<p>bureau@club-foot.fr</p>",
+}
+
+
+class FakeEngine:
+    """Moteur hors ligne: pages servies depuis un dict, URLs demandées gardées"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requested.append(url)
+        if url not in self.pages:
+            return SearchResponse(url, 404)
+        return SearchResponse(url, 200, self.pages[url])
+
+    def get_many(self, urls, headers=None, timeout=None):
+        return [self.get(url, headers, timeout) for url in urls]
+
+
+class SiteCrawlerTest(unittest.TestCase):
+
+    def test_contact_page_and_robots(self):
+        engine = FakeEngine(PAGES)
+        result = SiteCrawler(engine, ParsePool(workers=0)).crawl('https://club-foot.fr/')
+        self.assertEqual(result.emails, ['contact@club-foot.fr'])
+        self.assertNotIn('https://club-foot.fr/prive/contact', engine.requested)
+
+    def test_engine_given_at_call_time(self):
+        # Moteur du finder remplacé après construction (rejeu hors ligne)
+        initial, replay = FakeEngine({}), FakeEngine(PAGES)
+        crawler = SiteCrawler(initial, ParsePool(workers=0))
+        result = crawler.crawl('https://club-foot.fr/', engine=replay)
+        self.assertEqual(initial.requested, [])
+        self.assertEqual(result.emails, ['contact@club-foot.fr'])
+
+
+if __name__ == "__main__":
+    unittest.main()
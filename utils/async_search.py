@@ -0,0 +1,317 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from config.settings import SEARCH_DEFAULT_HOST_LIMIT, SEARCH_HOST_LIMITS, SEARCH_MAX_IN_FLIGHT, SEARCH_MAX_RETRIES
+from utils.http_cache import get_http_cache
+from utils.page_archive import get_page_recorder, get_replay_archive
+from utils.rate_limiter import THROTTLE_STATUSES, RateLimiter, get_rate_limiter, parse_retry_after
+from utils.search_backends import is_block_page
+
+
+def is_cacheable(status_code, text):
+    """Réponse à garder en cache: 200 hors page de blocage (captcha servi en 200)"""
+    return status_code == 200 and not is_block_page(text)
+
+
+class SearchResponse:
+    """Réponse HTTP minimale (mêmes attributs que requests.Response utilisés par les finders)"""
+
+    def __init__(self, url, status_code=0, text='', error='', from_cache=False, retry_after=None, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.error = error
+        self.from_cache = from_cache
+        self.retry_after = retry_after
+        self.headers = headers or {}
+
+
+class HostLimiter:
+    """Politesse pour un hôte: requêtes simultanées, débit délégué au RateLimiter partagé"""
+
+    def __init__(self, host, rate_limiter, concurrency):
+        self.host = host
+        self.rate_limiter = rate_limiter
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def acquire(self):
+        await self.semaphore.acquire()
+        delay = self.rate_limiter.reserve(self.host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def release(self):
+        self.semaphore.release()
+
+
+class AsyncSearchEngine:
+    """Moteur de recherche asyncio: plusieurs associations en vol, limites par hôte
+
+    Chaque association est traitée par une fonction `worker(item)`:
+    - coroutine: elle appelle `await engine.fetch(url)`;
+    - fonction classique: exécutée dans un thread, elle appelle `engine.get(url)`
+      (remplaçant direct de `session.get`), la requête repassant par la boucle
+      asyncio pour respecter les limites de l'hôte.
+
+    Le débit total dépend du nombre d'hôtes distincts (chacun a son propre
+    seau à jetons), plus des délais `time.sleep` entre requêtes. Un 429/503
+    ralentit l'hôte (RateLimiter) puis la requête est retentée. Hors de
+    `run`, engine.get applique le même débit de façon bloquante.
+
+    cacheable(status_code, texte) décide des réponses gardées dans le cache
+    disque; une entrée qui ne le satisfait plus est retirée à la lecture.
+
+    recorder (PageRecorder) enregistre chaque page obtenue; archive
+    (PageArchive) sert les pages enregistrées sans réseau ni politesse.
+    Par défaut: variables PAGE_ARCHIVE_RECORD / PAGE_ARCHIVE_REPLAY.
+    """
+
+    def __init__(self, host_limits=None, default_limit=None, max_in_flight=SEARCH_MAX_IN_FLIGHT, timeout=15,
+                 cache=None, use_cache=True, rate_limiter=None, max_retries=SEARCH_MAX_RETRIES,
+                 recorder=None, archive=None, cacheable=is_cacheable):
+        self.host_limits = dict(SEARCH_HOST_LIMITS if host_limits is None else host_limits)
+        # Débit par hôte partagé par tous les moteurs du processus, sauf limites propres
+        if rate_limiter is None:
+            custom = host_limits is not None or default_limit is not None
+            rate_limiter = RateLimiter(host_limits, default_limit) if custom else get_rate_limiter()
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        # Cache disque partagé: un hit ne consomme ni créneau de politesse ni réseau
+        self.cache = (cache or get_http_cache()) if use_cache else None
+        self.cacheable = cacheable
+        self.default_limit = dict(default_limit or SEARCH_DEFAULT_HOST_LIMIT)
+        # False: ni enregistrement ni rejeu, même si les variables d'environnement sont posées
+        self.recorder = get_page_recorder() if recorder is None else (None if recorder is False else recorder)
+        self.archive = get_replay_archive() if archive is None else (None if archive is False else archive)
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.stats = {}
+        self._limiters = {}
+        self._loop = None
+        self._io_pool = None
+        self._local = threading.local()
+
+    @staticmethod
+    def host_key(url):
+        """Hôte (avec port) d'une URL: une limite par netloc"""
+        return urlsplit(url).netloc.lower()
+
+    def _limiter(self, host):
+        if host not in self._limiters:
+            limit = self.host_limits.get(host, self.default_limit)
+            self._limiters[host] = HostLimiter(host, self.rate_limiter, limit.get('concurrency', 1))
+        return self._limiters[host]
+
+    def _session(self):
+        # requests.Session n'est pas partagée entre threads
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _blocking_get(self, url, headers, timeout):
+        try:
+            response = self._session().get(url, headers=headers, timeout=timeout)
+        except Exception as e:
+            return SearchResponse(url, error=str(e))
+        if self.cache is not None and self.cacheable(response.status_code, response.text):
+            self.cache.put(url, response.status_code, response.text)
+        return SearchResponse(url, response.status_code, response.text,
+                              retry_after=parse_retry_after(response.headers.get('Retry-After')),
+                              headers=dict(response.headers))
+
+    def _cached(self, url):
+        """Réponse du cache, erreur en mode replay si absente, sinon None (à télécharger)"""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(url)
+        if cached is not None and not self.cacheable(*cached):
+            # Page de blocage stockée par une version précédente: retéléchargée
+            self.cache.delete(url)
+            cached = None
+        if cached is not None:
+            return SearchResponse(url, cached[0], cached[1], from_cache=True)
+        if self.cache.replay:
+            return SearchResponse(url, error="absent du cache (mode replay)", from_cache=True)
+        return None
+
+    def _replayed(self, url):
+        """Page de l'archive rejouée (erreur si absente): jamais de réseau"""
+        page = self.archive.get(url)
+        self._host_stats(self.host_key(url))['cache'] += 1
+        if page is None:
+            return SearchResponse(url, error="absent de l'archive (rejeu)", from_cache=True)
+        return SearchResponse(url, page['status_code'], page['body'], from_cache=True,
+                              headers=page.get('response_headers'))
+
+    def _recorded(self, url, headers, response):
+        """Enregistrer la page obtenue (réseau ou cache) dans l'archive en cours"""
+        if self.recorder is not None and not response.error:
+            self.recorder.record(url, headers, response.status_code, response.headers, response.text)
+        return response
+
+    def _host_stats(self, host):
+        if host not in self.stats:
+            self.stats[host] = {'requetes': 0, 'cache': 0, 'erreurs': 0, 'ralentissements': 0,
+                                'attente_s': 0.0, 'requete_s': 0.0}
+        return self.stats[host]
+
+    def _record(self, host, response, waited, fetched):
+        """Statistiques et retour au limiteur; True si la requête doit être retentée"""
+        stats = self._host_stats(host)
+        stats['requetes'] += 1
+        stats['attente_s'] += waited
+        stats['requete_s'] += fetched
+        if response.error or response.status_code >= 400:
+            stats['erreurs'] += 1
+        throttled = self.rate_limiter.feedback(host, response.status_code, response.error, response.retry_after)
+        if throttled:
+            stats['ralentissements'] += 1
+        # Nouvelle tentative sur 429/503 seulement: un timeout ralentit l'hôte sans être rejoué
+        return throttled and response.status_code in THROTTLE_STATUSES
+
+    async def fetch(self, url, headers=None, timeout=None):
+        """GET asynchrone sous les limites de l'hôte (jamais d'exception: voir SearchResponse.error)"""
+        if self.archive is not None:
+            return self._replayed(url)
+        host = self.host_key(url)
+        loop = asyncio.get_running_loop()
+
+        if self.cache is not None:
+            cached = await loop.run_in_executor(self._io_pool, self._cached, url)
+            if cached is not None:
+                self._host_stats(host)['cache'] += 1
+                return self._recorded(url, headers, cached)
+
+        limiter = self._limiter(host)
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            await limiter.acquire()
+            acquired = time.perf_counter()
+            try:
+                response = await loop.run_in_executor(
+                    self._io_pool, self._blocking_get, url, headers, timeout or self.timeout
+                )
+            finally:
+                limiter.release()
+            if not self._record(host, response, acquired - started, time.perf_counter() - acquired):
+                break
+        return self._recorded(url, headers, response)
+
+    def _get_limited(self, url, headers, timeout):
+        """GET bloquant hors de `run`: même cache, même débit et mêmes nouvelles tentatives"""
+        if self.archive is not None:
+            return self._replayed(url)
+        cached = self._cached(url)
+        host = self.host_key(url)
+        if cached is not None:
+            self._host_stats(host)['cache'] += 1
+            return self._recorded(url, headers, cached)
+
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            self.rate_limiter.wait(host)
+            acquired = time.perf_counter()
+            response = self._blocking_get(url, headers, timeout)
+            if not self._record(host, response, acquired - started, time.perf_counter() - acquired):
+                break
+        return self._recorded(url, headers, response)
+
+    def get(self, url, headers=None, timeout=None):
+        """GET bloquant depuis un worker (thread) de `run`, ou isolé hors de `run`"""
+        if self._loop is not None and self._loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self.fetch(url, headers, timeout), self._loop)
+            return future.result()
+        return self._get_limited(url, headers, timeout or self.timeout)
+
+    def get_many(self, urls, headers=None, timeout=None):
+        """GET simultanés depuis un worker de `run` (limites de chaque hôte respectées), réponses dans l'ordre"""
+        if self._loop is not None and self._loop.is_running():
+            async def fetch_all():
+                return await asyncio.gather(*(self.fetch(url, headers, timeout) for url in urls))
+            return asyncio.run_coroutine_threadsafe(fetch_all(), self._loop).result()
+        return [self._get_limited(url, headers, timeout or self.timeout) for url in urls]
+
+    async def _run(self, items, worker, on_result, should_stop):
+        self._loop = asyncio.get_running_loop()
+        self._limiters = {}
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        results = {}
+        tasks = []
+        is_coroutine = asyncio.iscoroutinefunction(worker)
+
+        with ThreadPoolExecutor(self.max_in_flight) as worker_pool, \
+                ThreadPoolExecutor(self.max_in_flight) as io_pool:
+            self._io_pool = io_pool
+
+            async def process(index, item):
+                try:
+                    if is_coroutine:
+                        result = await worker(item)
+                    else:
+                        result = await self._loop.run_in_executor(worker_pool, worker, item)
+                except Exception as e:
+                    print(f"    ❌ Erreur: {e}")
+                    result = None
+                try:
+                    results[index] = result
+                    if on_result:
+                        on_result(index, item, result)
+                except Exception as e:
+                    # Un enregistrement en échec n'interrompt pas les autres associations
+                    print(f"    ❌ Erreur enregistrement: {e}")
+                finally:
+                    in_flight.release()
+
+            for index, item in enumerate(items):
+                await in_flight.acquire()
+                if should_stop and should_stop():
+                    in_flight.release()
+                    break
+                tasks.append(asyncio.create_task(process(index, item)))
+
+            await asyncio.gather(*tasks)
+
+        self._loop = None
+        self._io_pool = None
+        return [results[index] for index in sorted(results)]
+
+    def run(self, items, worker, on_result=None, should_stop=None):
+        """Traiter `items` avec au plus `max_in_flight` associations en vol
+
+        on_result(index, item, result) est appelé dans la boucle (un seul thread)
+        à chaque fin de traitement: enregistrements et affichages sans verrou;
+        une exception y est affichée sans interrompre les autres éléments.
+        should_stop() est consulté avant de lancer chaque nouvel élément.
+        Retourne les résultats dans l'ordre des éléments lancés.
+        """
+        self.stats = {}
+        started = time.perf_counter()
+        results = asyncio.run(self._run(items, worker, on_result, should_stop))
+        self.elapsed = time.perf_counter() - started
+        return results
+
+    def report(self):
+        """Afficher requêtes, erreurs et temps d'attente de politesse contre temps de requête, puis le cache"""
+        if self.cache is not None:
+            self.cache.report()
+        for archive in (self.recorder, self.archive):
+            if archive is not None:
+                archive.report()
+        if not self.stats:
+            return
+        total = sum(s['requetes'] for s in self.stats.values())
+        waited = sum(s['attente_s'] for s in self.stats.values())
+        fetched = sum(s['requete_s'] for s in self.stats.values())
+        elapsed = getattr(self, 'elapsed', 0.0)
+        print(f"\n🌐 REQUÊTES PAR HÔTE ({total} en {elapsed:.1f}s; cumul attente {waited:.1f}s, requêtes {fetched:.1f}s):")
+        for host, s in sorted(self.stats.items(), key=lambda x: x[1]['requetes'], reverse=True):
+            mean_fetch = s['requete_s'] / s['requetes'] if s['requetes'] else 0.0
+            print(f"  • {host}: {s['requetes']} requêtes, {s['cache']} depuis le cache, {s['erreurs']} erreurs, "
+                  f"{s['ralentissements']} ralentissements (débit {self.rate_limiter.current_rate(host):.2f}/s), "
+                  f"attente {s['attente_s']:.1f}s, {mean_fetch * 1000:.0f} ms/requête")
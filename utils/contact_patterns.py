@@ -0,0 +1,128 @@
+import re
+from urllib.parse import unquote
+
+# Motifs compilés une fois pour tous les extracteurs
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+EMAIL_FULL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+MAILTO_RE = re.compile(r'mailto:([^"\'?\s<>]+)', re.IGNORECASE)
+
+# Adresses masquées: "contact [at] club (dot) fr", "contact&#64;club.fr"
+# Motifs ancrés sur le crochet (un \s* en tête serait tenté à chaque position):
+# les espaces autour sont retirés par _join_around
+OBFUSCATED_AT_RE = re.compile(r'[\[\(\{]\s*(?:at|arobase|@)\s*[\]\)\}]', re.IGNORECASE)
+OBFUSCATED_DOT_RE = re.compile(r'[\[\(\{]\s*(?:dot|point)\s*[\]\)\}]', re.IGNORECASE)
+AT_ENTITIES = ('&#64;', '&#x40;', '&#X40;', '&commat;')
+# Préfiltre des formes masquées: recherches de sous-chaînes, bien moins chères qu'un motif
+OBFUSCATION_HINTS = ('[at]', '(at)', '{at}', '[AT]', '(AT)', '[ at ]', '( at )', '[arobase]', '(arobase)', '[@]', '(@)')
+
+# Dans l'ordre de préférence: le premier motif qui trouve l'emporte
+PHONE_RES = [
+    re.compile(r'0[1-9](?:[.\s-]?\d{2}){4}'),
+    re.compile(r'\+33[.\s-]?[1-9](?:[.\s-]?\d{2}){4}'),
+    re.compile(r'(?:Tel|Tél|Téléphone|Phone)[\s:]*0[1-9](?:[.\s-]?\d{2}){4}'),
+]
+DIGIT_RUN_RE = re.compile(r'\d\d')
+NON_DIGIT_RE = re.compile(r'[^\d]')
+PHONE_CLEAN_RE = re.compile(r'[^\d+]')
+
+WEBSITE_RE = re.compile(r'https?://[^\s<>"]+(?:\.fr|\.org|\.com|\.net)')
+SOCIAL_RES = {
+    'facebook': re.compile(r'https://(?:www\.)?facebook\.com/[^/\s"<>&?]+'),
+    'instagram': re.compile(r'https://(?:www\.)?instagram\.com/[^/\s"<>&?]+'),
+    'twitter': re.compile(r'https://(?:www\.)?(?:twitter|x)\.com/[^/\s"<>&?]+'),
+    'linkedin': re.compile(r'https://(?:[a-z]+\.)?linkedin\.com/(?:company|in)/[^/\s"<>&?]+'),
+}
+# Préfiltre par réseau: sous-chaîne obligatoire
+SOCIAL_HINTS = {
+    'facebook': ('facebook.com',), 'instagram': ('instagram.com',),
+    'twitter': ('twitter.com', 'x.com'), 'linkedin': ('linkedin.com',),
+}
+
+
+def _join_around(pattern, separator, text):
+    """Remplacer chaque occurrence du motif par separator, espaces voisins compris"""
+    pieces = pattern.split(text)
+    if len(pieces) == 1:
+        return text, 0
+    middle = [piece.strip() for piece in pieces[1:-1]]
+    return separator.join([pieces[0].rstrip()] + middle + [pieces[-1].lstrip()]), len(pieces) - 1
+
+
+def deobfuscate_emails(text):
+    """Rétablir '@' et '.' des adresses masquées ([at], (dot), entités HTML)
+
+    Chaque forme n'est traitée que si une sous-chaîne caractéristique est présente.
+    """
+    if '&' in text:
+        for entity in AT_ENTITIES:
+            if entity in text:
+                text = text.replace(entity, '@')
+        if '&#46;' in text:
+            text = text.replace('&#46;', '.')
+    if any(hint in text for hint in OBFUSCATION_HINTS):
+        text, replaced = _join_around(OBFUSCATED_AT_RE, '@', text)
+        if replaced:
+            text = _join_around(OBFUSCATED_DOT_RE, '.', text)[0]
+    return text
+
+
+def find_emails(text, obfuscated=True):
+    """Emails du texte, dans l'ordre (doublons compris, comme re.findall)
+
+    Préfiltre: sans '@' ni forme masquée, la page n'est pas parcourue par
+    le motif email. Les liens mailto: (encodés %40) sont décodés.
+    """
+    if not text:
+        return []
+    if obfuscated:
+        text = deobfuscate_emails(text)
+    if '@' not in text:
+        if '%40' not in text:
+            return []
+        return [email for email in (unquote(m) for m in MAILTO_RE.findall(text)) if EMAIL_FULL_RE.match(email)]
+
+    emails = EMAIL_RE.findall(text)
+    if '%40' in text:
+        emails += [email for email in (unquote(m) for m in MAILTO_RE.findall(text)) if EMAIL_FULL_RE.match(email)]
+    return emails
+
+
+def is_email(value):
+    """Adresse email complète (validation de format)"""
+    return bool(value) and EMAIL_FULL_RE.match(value) is not None
+
+
+def find_phones(text):
+    """Téléphones français du texte, nettoyés (chiffres et +), motifs dans l'ordre de préférence
+
+    Préfiltre: sans deux chiffres consécutifs, aucun motif n'est essayé.
+    """
+    if not text or not DIGIT_RUN_RE.search(text):
+        return []
+    phones = []
+    for pattern in PHONE_RES:
+        for match in pattern.findall(text):
+            phone = PHONE_CLEAN_RE.sub('', match)
+            if len(phone) >= 10 and phone not in phones:
+                phones.append(phone)
+    return phones
+
+
+def find_social(texts, networks=SOCIAL_RES):
+    """Première URL de chaque réseau social trouvée dans les textes (dans l'ordre)"""
+    social = {}
+    for name, pattern in networks.items():
+        hints = SOCIAL_HINTS.get(name, ())
+        for text in texts:
+            if hints and not any(hint in text for hint in hints):
+                continue
+            match = pattern.search(text)
+            if match:
+                social[name] = match.group()
+                break
+    return social
+
+
+def find_facebook(text):
+    """Première page Facebook du texte ou du HTML brut, '' si aucune"""
+    return find_social([text], {'facebook': SOCIAL_RES['facebook']}).get('facebook', '')
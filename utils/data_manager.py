@@ -4,6 +4,8 @@ import os
 from datetime import datetime
 import json
 
+from utils.objet_social import get_nomenclature
+
 class DataManager:
     def __init__(self, data_dir="data"):
         self.data_dir = data_dir
@@ -47,6 +49,21 @@ class DataManager:
         except Exception as e:
             print(f"Erreur lors de la sauvegarde: {e}")
     
+    def append_frame_to_csv(self, df, filename):
+        """Ajouter un DataFrame à un CSV (colonnes triées comme save_to_csv)"""
+        filepath = os.path.join(self.data_dir, filename)
+
+        if df is None or df.empty:
+            return
+
+        write_header = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+
+        try:
+            df[sorted(df.columns)].to_csv(filepath, mode='a', header=write_header,
+                                          index=False, encoding='utf-8')
+        except Exception as e:
+            print(f"Erreur lors de l'ajout: {e}")
+
     def load_from_csv(self, filename):
         """Charger les données depuis un CSV"""
         filepath = os.path.join(self.data_dir, filename)
@@ -146,7 +163,14 @@ class DataManager:
         return outreach_data
     
     def detect_sector(self, association):
-        """Détecter le secteur principal d'une association"""
+        """Détecter le secteur principal d'une association (nomenclature, à défaut mots-clés)"""
+        secteur = get_nomenclature().categories(
+            association.get('secteur_code', association.get('objet_social1')),
+            association.get('objet_social2')
+        )['secteur']
+        if secteur:
+            return secteur
+        
         text = (association.get('name', '') + ' ' + 
                association.get('description', '')).lower()
         
@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from config.settings import (DNS_CACHE_TTL_HOURS, DNS_CONCURRENCY, DNS_NAMESERVERS, DNS_NEGATIVE_TTL_HOURS, DNS_PORT,
+                             DNS_TIMEOUT_S)
+
+try:
+    import dns.asyncresolver
+    import dns.resolver
+except ImportError:
+    dns = None
+
+# Statuts d'un domaine: le courrier est-il livrable?
+# - mx: enregistrements MX; a: pas de MX mais une adresse (MX implicite, RFC 5321);
+# - null_mx: MX "." (le domaine refuse tout courrier, RFC 7505); sans_mx: ni MX ni adresse;
+# - nxdomain: domaine inexistant (souvent un email tronqué ou collé à du texte);
+# - erreur: délai dépassé ou serveur DNS en échec, domaine ni validé ni rejeté;
+# - invalide: email vide ou sans domaine (erreur de syntaxe, aucune résolution DNS).
+DELIVERABLE_STATUSES = ('mx', 'a')
+UNDELIVERABLE_STATUSES = ('null_mx', 'sans_mx', 'nxdomain')
+
+
+class DomainNotFound(Exception):
+    """Le domaine n'existe pas (NXDOMAIN)"""
+
+
+class DnsResolver:
+    """Résolution MX puis A/AAAA avec dnspython (serveurs du système, ou nameservers/port donnés)"""
+
+    def __init__(self, nameservers=DNS_NAMESERVERS, port=DNS_PORT, timeout=DNS_TIMEOUT_S):
+        self.resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+        if nameservers:
+            self.resolver.nameservers = list(nameservers)
+        self.resolver.port = port
+        self.resolver.lifetime = timeout
+
+    async def _query(self, domain, rdtype):
+        try:
+            answer = await self.resolver.resolve(domain, rdtype)
+        except dns.resolver.NXDOMAIN:
+            raise DomainNotFound(domain)
+        except dns.resolver.NoAnswer:
+            return []
+        return [str(record) for record in answer]
+
+    async def mx(self, domain):
+        """Serveurs de messagerie du domaine ('.' pour un MX nul)"""
+        return [record.split()[-1].rstrip('.') or '.' for record in await self._query(domain, 'MX')]
+
+    async def addresses(self, domain):
+        """Adresses IPv4 puis IPv6 du domaine"""
+        return await self._query(domain, 'A') or await self._query(domain, 'AAAA')
+
+
+class SystemResolver:
+    """Repli sans dnspython: getaddrinfo du système, adresses seulement
+
+    Les MX ne sont pas consultables et getaddrinfo ne distingue pas un
+    domaine inexistant d'un domaine à MX sans adresse: un domaine sans
+    adresse reste en 'erreur' (ni validé ni rejeté), jamais en nxdomain.
+    """
+
+    def __init__(self, timeout=DNS_TIMEOUT_S):
+        self.timeout = timeout
+
+    async def mx(self, domain):
+        return []
+
+    async def addresses(self, domain):
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(domain, None, type=socket.SOCK_STREAM)
+        return [info[4][0] for info in infos]
+
+
+class StubResolver:
+    """Résolveur en mémoire pour les essais hors ligne
+
+    records: domaine -> {'mx': [...], 'a': [...]}, None pour un domaine
+    inexistant; un domaine absent est inexistant. delay simule la latence DNS.
+    """
+
+    def __init__(self, records, delay=0.0):
+        self.records = {domain.lower(): entry for domain, entry in records.items()}
+        self.delay = delay
+        self.queries = 0
+
+    async def _entry(self, domain):
+        self.queries += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        entry = self.records.get(domain)
+        if entry is None:
+            raise DomainNotFound(domain)
+        return entry
+
+    async def mx(self, domain):
+        return list((await self._entry(domain)).get('mx', []))
+
+    async def addresses(self, domain):
+        return list((await self._entry(domain)).get('a', []))
+
+
+def default_resolver():
+    """dnspython si installé, sinon getaddrinfo du système"""
+    return DnsResolver() if dns is not None else SystemResolver()
+
+
+def email_domain(email):
+    """Domaine d'un email, en minuscules ('' si absent)"""
+    local, at, domain = str(email or '').strip().lower().rpartition('@')
+    return domain.rstrip('.') if at and local else ''
+
+
+class DomainValidator:
+    """Validation DNS des domaines des emails trouvés, avant export ou envoi
+
+    Chaque domaine distinct n'est résolu qu'une fois: MX, à défaut A/AAAA,
+    toutes les résolutions d'un lot en parallèle (DNS_CONCURRENCY). Les
+    résultats sont gardés en base (DNS_CACHE_TTL_HOURS, échecs
+    DNS_NEGATIVE_TTL_HOURS); une erreur DNS passagère n'est jamais gardée
+    et ne fait pas rejeter l'email.
+    """
+
+    def __init__(self, resolver=None, db_path="data/domain_cache.db", ttl_hours=DNS_CACHE_TTL_HOURS,
+                 negative_ttl_hours=DNS_NEGATIVE_TTL_HOURS, concurrency=DNS_CONCURRENCY, timeout=DNS_TIMEOUT_S):
+        self.resolver = resolver or default_resolver()
+        self.db_path = db_path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.stats = {'hits': 0, 'resolus': 0, 'erreurs': 0, 'rejetes': 0, 'invalides': 0}
+        self._lock = threading.Lock()
+        self.init_database()
+        self._entries = self._load_entries()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """Initialiser la base de données SQLite"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS domaines (
+                    domaine TEXT PRIMARY KEY,
+                    statut TEXT NOT NULL,
+                    mx TEXT DEFAULT '',
+                    date_maj TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def _load_entries(self):
+        with closing(self._connect()) as conn:
+            return {row['domaine']: dict(row) for row in conn.execute("SELECT * FROM domaines")}
+
+    def lookup(self, domain):
+        """Statut du domaine en cache, None si inconnu ou expiré"""
+        entry = self._entries.get(domain)
+        if entry is None:
+            return None
+        ttl = self.ttl if entry['statut'] in DELIVERABLE_STATUSES else self.negative_ttl
+        if datetime.now() - datetime.strptime(entry['date_maj'], '%Y-%m-%d %H:%M:%S') > ttl:
+            return None
+        return entry['statut']
+
+    async def _resolve(self, domain, semaphore):
+        """(statut, serveurs MX) d'un domaine"""
+        async with semaphore:
+            try:
+                mx = await asyncio.wait_for(self.resolver.mx(domain), self.timeout)
+                if mx:
+                    return ('null_mx', []) if mx == ['.'] else ('mx', mx)
+                addresses = await asyncio.wait_for(self.resolver.addresses(domain), self.timeout)
+                return ('a', []) if addresses else ('sans_mx', [])
+            except DomainNotFound:
+                return 'nxdomain', []
+            except Exception:
+                return 'erreur', []
+
+    async def resolve_domains(self, domains):
+        """Résoudre des domaines en parallèle: {domaine: (statut, serveurs MX)}"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        domains = list(domains)
+        results = await asyncio.gather(*(self._resolve(domain, semaphore) for domain in domains))
+        return dict(zip(domains, results))
+
+    def _record(self, results):
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        entries = [{'domaine': domain, 'statut': status, 'mx': ' '.join(mx), 'date_maj': now}
+                   for domain, (status, mx) in results.items() if status != 'erreur']
+        with self._lock:
+            with closing(self._connect()) as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO domaines (domaine, statut, mx, date_maj)
+                    VALUES (:domaine, :statut, :mx, :date_maj)
+                ''', entries)
+                conn.commit()
+            self._entries.update({entry['domaine']: entry for entry in entries})
+
+    def check_domains(self, domains):
+        """Statut de chaque domaine: cache d'abord, domaines restants résolus en un lot"""
+        statuses = {}
+        missing = []
+        for domain in dict.fromkeys(domain for domain in domains if domain):
+            status = self.lookup(domain)
+            if status is None:
+                missing.append(domain)
+            else:
+                statuses[domain] = status
+        with self._lock:
+            self.stats['hits'] += len(statuses)
+
+        if missing:
+            results = asyncio.run(self.resolve_domains(missing))
+            self._record(results)
+            statuses.update({domain: status for domain, (status, _) in results.items()})
+            with self._lock:
+                self.stats['resolus'] += len(missing)
+                self.stats['erreurs'] += sum(1 for status, _ in results.values() if status == 'erreur')
+        return statuses
+
+    def check_emails(self, emails):
+        """Statut du domaine de chaque email: {email: statut}, 'invalide' sans domaine"""
+        emails = list(emails)
+        statuses = self.check_domains(email_domain(email) for email in emails)
+        statuses = {email: statuses.get(email_domain(email), 'invalide') for email in emails}
+        with self._lock:
+            self.stats['rejetes'] += sum(1 for status in statuses.values() if status in UNDELIVERABLE_STATUSES)
+            self.stats['invalides'] += sum(1 for status in statuses.values() if status == 'invalide')
+        return statuses
+
+    def filter_contacts(self, contacts, key='email'):
+        """(contacts livrables, contacts rejetés): domaines sans courrier avéré et emails invalides rejetés"""
+        statuses = self.check_emails(str(contact.get(key, '')) for contact in contacts)
+        kept, rejected = [], []
+        for contact in contacts:
+            status = statuses[str(contact.get(key, ''))]
+            (rejected if status in UNDELIVERABLE_STATUSES or status == 'invalide' else kept).append(contact)
+        return kept, rejected
+
+    def report(self):
+        """Afficher résolutions, cache et domaines rejetés"""
+        stats = self.stats
+        if not stats['hits'] and not stats['resolus'] and not stats['invalides']:
+            return
+        mode = type(self.resolver).__name__
+        print(f"\n🌐 VALIDATION DNS ({mode}): {stats['resolus']} domaines résolus, {stats['hits']} depuis le cache, "
+              f"{stats['erreurs']} erreurs, {stats['rejetes']} emails rejetés, {stats['invalides']} emails invalides")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation DNS (MX) des domaines d'emails")
+    parser.add_argument('emails', nargs='+', help="emails ou domaines à vérifier")
+    parser.add_argument('--db', default="data/domain_cache.db")
+    parser.add_argument('--nameserver', action='append', help="serveur DNS à interroger (ex. résolveur local de test)")
+    parser.add_argument('--port', type=int, default=DNS_PORT)
+    args = parser.parse_args()
+
+    resolver = None
+    if args.nameserver:
+        if dns is None:
+            parser.error("--nameserver nécessite dnspython")
+        resolver = DnsResolver(nameservers=args.nameserver, port=args.port)
+    validator = DomainValidator(resolver, db_path=args.db)
+    domains = [email_domain(email) if '@' in email else email.strip().lower() for email in args.emails]
+    for domain, status in validator.check_domains(domains).items():
+        icon = '✅' if status in DELIVERABLE_STATUSES else ('⚠️' if status == 'erreur' else '❌')
+        print(f"  {icon} {domain}: {status}")
+    validator.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+
+# Profils d'association gardés en mémoire par scorer
+PROFILE_CACHE_SIZE = 1024
+
+# Règles de scoring des emails candidats, déclarées comme données (un profil par finder).
+# Chaque règle:
+# - field: partie examinée ('email', 'domain', 'local' ou 'context', le texte de la page);
+# - kind: 'any' (points si un motif est présent), 'each' (points par motif présent)
+#   ou 'first' (couples (motif, points), le premier présent l'emporte);
+# - patterns: sous-chaînes; entre accolades, variables de l'association
+#   ({name_words}, {name_head_words}, {commune_dash}, {commune_compact}, {commune_nodash});
+# - points; en option match ('contains' ou 'endswith') et min_len (motifs plus courts ignorés).
+SCORING_PROFILES = {
+    # SmartContactFinder.score_email (le texte de la page compte)
+    'smart': [
+        {'field': 'domain', 'kind': 'any', 'patterns': ('{commune_compact}',), 'points': 25},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('mairie',), 'points': 20},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('.fr',), 'match': 'endswith', 'points': 15},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('cc-', 'communaute', 'agglo'), 'points': 15},
+        {'field': 'local', 'kind': 'any', 'patterns': ('contact', 'info', 'secretaire', 'president'), 'points': 20},
+        {'field': 'local', 'kind': 'any', 'patterns': ('asso', 'association', 'club'), 'points': 15},
+        {'field': 'context', 'kind': 'any', 'patterns': ('{name_words}',), 'points': 10},
+        {'field': 'context', 'kind': 'any', 'patterns': ('chasse', 'peche', 'sport', 'culture'), 'points': 5},
+    ],
+    # SmartContactFinderClean.score_email
+    'clean': [
+        {'field': 'domain', 'kind': 'any', 'patterns': ('mairie', 'ville', 'commune', 'cc-', '{commune_dash}'), 'points': 30},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('asso', 'association', 'club'), 'points': 25},
+        {'field': 'email', 'kind': 'each', 'patterns': ('{name_words}',), 'points': 20},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('{commune_compact}',), 'points': 15},
+        {'field': 'email', 'kind': 'any', 'patterns': ('contact', 'info', 'secretaire', 'president'), 'points': 10},
+    ],
+    # ModernAssociationFinder.score_email
+    'modern': [
+        {'field': 'domain', 'kind': 'any', 'patterns': ('mairie', 'ville', 'commune', 'cc-', '{commune_dash}'), 'points': 40},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('asso', 'association', 'club', 'org'), 'points': 35},
+        {'field': 'domain', 'kind': 'first', 'match': 'endswith',
+         'patterns': (('.fr', 20), ('.org', 20), ('.net', 20), ('.com', 15))},
+        {'field': 'email', 'kind': 'each', 'patterns': ('{name_words}',), 'points': 25},
+        {'field': 'domain', 'kind': 'any', 'patterns': ('{commune_compact}',), 'points': 20},
+        {'field': 'email', 'kind': 'each', 'patterns': ('contact', 'info', 'secretaire', 'president', 'bureau'), 'points': 15},
+    ],
+    # RnaContactScraper._extract_best_email (emails d'une page de résultats)
+    'rna': [
+        {'field': 'email', 'kind': 'each', 'patterns': ('{name_head_words}',), 'points': 10},
+        {'field': 'email', 'kind': 'any', 'patterns': ('{commune_nodash}',), 'min_len': 5, 'points': 8},
+        {'field': 'email', 'kind': 'first', 'patterns': (('.asso.fr', 15), ('.org', 10), ('.fr', 5))},
+        {'field': 'email', 'kind': 'any', 'patterns': ('association', 'asso', 'club', 'amicale'), 'points': 5},
+        {'field': 'email', 'kind': 'any', 'patterns': ('contact@gmail', 'info@gmail', 'webmaster', 'noreply'), 'points': -20},
+    ],
+}
+
+
+class AssociationProfile:
+    """Mots du nom et variantes de la commune, calculés une fois par association"""
+
+    def __init__(self, nom, ville):
+        nom_lower = (nom or '').lower()
+        ville_lower = (ville or '').lower()
+        self.variables = {
+            'name_words': [word for word in nom_lower.split() if len(word) > 3],
+            'name_head_words': [word for word in nom_lower.split()[:3] if len(word) > 3],
+            'commune_dash': [ville_lower.replace(' ', '-')],
+            'commune_compact': [ville_lower.replace('-', '').replace(' ', '')],
+            'commune_nodash': [ville_lower.replace('-', '')],
+        }
+        self.rules = []
+        self.context_rules = []
+
+    def expand(self, patterns, min_len=0):
+        """Motifs concrets: variables remplacées par leurs valeurs (vides et trop courts ignorés)"""
+        expanded = []
+        for pattern in patterns:
+            values = self.variables[pattern[1:-1]] if pattern.startswith('{') else [pattern]
+            expanded.extend(value for value in values if value and len(value) >= min_len)
+        return tuple(expanded)
+
+    def compile(self, rules):
+        """Règles propres à l'association: (champ, type, motifs, points, fin de chaîne)"""
+        for rule in rules:
+            endswith = rule.get('match') == 'endswith'
+            if rule['kind'] == 'first':
+                patterns = tuple((pattern, points) for pattern, points in rule['patterns'])
+                points = 0
+            else:
+                patterns = self.expand(rule['patterns'], rule.get('min_len', 0))
+                points = rule['points']
+            if not patterns:
+                continue
+            compiled = (rule['field'], rule['kind'], patterns, points, endswith)
+            (self.context_rules if rule['field'] == 'context' else self.rules).append(compiled)
+        return self
+
+
+def _apply(rule, value):
+    _, kind, patterns, points, endswith = rule
+    if kind == 'first':
+        for pattern, first_points in patterns:
+            if (value.endswith(pattern) if endswith else pattern in value):
+                return first_points
+        return 0
+    if endswith:
+        hits = sum(1 for pattern in patterns if value.endswith(pattern))
+    else:
+        hits = sum(1 for pattern in patterns if pattern in value)
+    if kind == 'any':
+        return points if hits else 0
+    return points * hits
+
+
+class EmailScorer:
+    """Scoring par lots: profil de l'association précalculé, texte de chaque page analysé une fois
+
+    score_batch() reçoit tous les candidats (email, contexte) d'une ou
+    plusieurs pages: les règles sur le texte de page sont évaluées une fois
+    par page (et non une fois par email), puis chaque email ne parcourt que
+    des sous-chaînes courtes.
+    """
+
+    def __init__(self, profile='smart'):
+        self.profile_name = profile
+        self.rules = SCORING_PROFILES[profile]
+        self._profiles = OrderedDict()
+        # Appelé depuis les threads du moteur de recherche
+        self._lock = threading.Lock()
+
+    def profile(self, nom, ville):
+        """Profil compilé de l'association (mots du nom, variantes de la commune, règles)"""
+        key = (nom, ville)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = AssociationProfile(nom, ville).compile(self.rules)
+                if len(self._profiles) > PROFILE_CACHE_SIZE:
+                    self._profiles.popitem(last=False)
+        return profile
+
+    def score_batch(self, nom, ville, candidates):
+        """Scores des candidats: emails seuls ou couples (email, contexte), dans l'ordre reçu"""
+        profile = self.profile(nom, ville)
+        context_scores = {}
+        scores = []
+        for candidate in candidates:
+            email, context = candidate if isinstance(candidate, tuple) else (candidate, None)
+            email_lower = email.lower()
+            local, _, domain = email_lower.partition('@')
+            fields = {'email': email_lower, 'domain': domain, 'local': local}
+            score = sum(_apply(rule, fields[rule[0]]) for rule in profile.rules)
+
+            if context and profile.context_rules:
+                # Un texte de page n'est mis en minuscules et parcouru qu'une fois par lot
+                key = id(context)
+                if key not in context_scores:
+                    context_lower = context.lower()
+                    context_scores[key] = sum(_apply(rule, context_lower) for rule in profile.context_rules)
+                score += context_scores[key]
+            scores.append(score)
+        return scores
+
+    def score(self, nom, ville, email, context=None):
+        """Score d'un seul email (préférer score_batch pour plusieurs candidats)"""
+        return self.score_batch(nom, ville, [(email, context)])[0]
+
+    def best(self, nom, ville, candidates, minimum=None):
+        """Candidats classés par score décroissant: [(email, score)], au-dessus de minimum"""
+        emails = [candidate[0] if isinstance(candidate, tuple) else candidate for candidate in candidates]
+        scored = [(email, score) for email, score in zip(emails, self.score_batch(nom, ville, candidates))
+                  if minimum is None or score > minimum]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
@@ -0,0 +1,87 @@
+from urllib.parse import unquote
+
+import lxml.html
+from lxml import etree
+
+from utils.contact_patterns import find_emails, find_phones, find_social, is_email
+
+# Le texte de ces balises n'est pas du contenu (pas d'email ni de téléphone à y chercher)
+SKIPPED_TEXT_TAGS = {'script', 'style', 'noscript', 'template'}
+
+# Balises de bloc: séparées de leurs voisines; le texte des balises en ligne
+# (span, b, a...) est accolé comme dans le rendu (contact<b>@</b>club.fr)
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'head', 'header', 'hr',
+    'html', 'li', 'main', 'nav', 'ol', 'option', 'p', 'pre', 'section', 'table', 'td', 'th', 'title', 'tr', 'ul',
+}
+
+
+class PageExtract:
+    """Contenu utile d'une page: texte, emails, téléphones, liens (sortants et tous), réseaux sociaux"""
+
+    def __init__(self, text='', emails=None, phones=None, links=None, social=None, hrefs=None):
+        self.text = text
+        self.emails = emails or []
+        self.phones = phones or []
+        self.links = links or []
+        self.social = social or {}
+        self.hrefs = hrefs or []
+
+
+def extract_page(html):
+    """Analyser une page une seule fois (lxml) et tout collecter en un parcours de l'arbre
+
+    Emails: texte (hors scripts et styles, formes masquées comprises; texte
+    des balises en ligne accolé, blocs séparés) et liens mailto (décodés).
+    Liens: href http(s) dans l'ordre de la page (hrefs: tous, relatifs
+    compris). Réseaux sociaux: première URL de chaque réseau trouvée dans les liens (y compris
+    les redirections des moteurs, /url?q=...) ou le texte.
+    """
+    if not html or not html.strip():
+        return PageExtract()
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:
+        # Chaîne avec déclaration d'encodage XML: lxml exige des octets
+        root = lxml.html.fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        return PageExtract()
+
+    parts = []
+    hrefs = []
+    mailto = []
+    # Parcours en profondeur: texte d'une balise, ses enfants, puis le texte qui la suit
+    stack = [(root, False)]
+    while stack:
+        element, closing = stack.pop()
+        tag = element.tag
+        if closing:
+            if tag in BLOCK_TAGS:
+                parts.append('\n')
+            if element.tail:
+                parts.append(element.tail)
+            continue
+        if not isinstance(tag, str):
+            # Commentaires et instructions: seul le texte qui suit compte
+            if element.tail:
+                parts.append(element.tail)
+            continue
+        if tag == 'a':
+            href = (element.get('href') or '').strip()
+            if href.lower().startswith('mailto:'):
+                mailto.append(unquote(href[7:].split('?')[0]).strip())
+            elif href:
+                hrefs.append(href)
+        if tag in BLOCK_TAGS:
+            parts.append('\n')
+        if element.text and tag not in SKIPPED_TEXT_TAGS:
+            parts.append(element.text)
+        stack.append((element, True))
+        stack.extend((child, False) for child in reversed(element))
+
+    text = ''.join(parts)
+    emails = list(dict.fromkeys(find_emails(text) + [m for m in mailto if is_email(m)]))
+    links = [href for href in hrefs if href.startswith('http')]
+
+    return PageExtract(text, emails, find_phones(text), links, find_social(hrefs + [text]), hrefs)
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config.settings import HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB, HTTP_CACHE_TTL_HOURS
+
+# Paramètres sans effet sur le contenu de la page
+IGNORED_QUERY_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def normalize_url(url):
+    """URL canonique: schéma/hôte en minuscules, port par défaut, paramètres triés, sans fragment"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(IGNORED_QUERY_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+def url_key(url):
+    """Clé de cache: sha256 de l'URL normalisée"""
+    return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+
+class HttpResponseCache:
+    """Cache disque des réponses HTTP partagé par tous les scrapers
+
+    Corps compressés (zlib) dans data/http_cache/<2 car.>/<clé>.z, index
+    SQLite (taille, date de stockage, dernier accès) pour l'expiration (TTL)
+    et l'éviction LRU au-delà de la taille maximale.
+
+    Mode replay: les entrées expirées sont servies et un absent du cache
+    n'est jamais téléchargé (relances, débogage, changement d'extracteur).
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl_hours=HTTP_CACHE_TTL_HOURS,
+                 max_mb=HTTP_CACHE_MAX_MB, replay=None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.replay = os.environ.get('HTTP_CACHE_REPLAY') == '1' if replay is None else replay
+        self.db_path = os.path.join(cache_dir, 'index.db')
+        self.stats = {'hits': 0, 'misses': 0, 'expires': 0, 'stockes': 0, 'evinces': 0, 'octets_servis': 0}
+
+        # Appelé depuis les threads du moteur: une connexion protégée par un verrou
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                cle TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                taille INTEGER NOT NULL,
+                stocke_le REAL NOT NULL,
+                dernier_acces REAL NOT NULL
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_acces ON responses (dernier_acces)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(taille), 0) FROM responses").fetchone()[0]
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.z")
+
+    def get(self, url):
+        """(status_code, texte) en cache, ou None (absent ou expiré)"""
+        key = url_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, stocke_le FROM responses WHERE cle = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            status_code, stored_at = row
+            if not self.replay and now - stored_at > self.ttl:
+                self.stats['expires'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute("UPDATE responses SET dernier_acces = ? WHERE cle = ?", (now, key))
+            self._conn.commit()
+
+        try:
+            with open(self._body_path(key), 'rb') as f:
+                body = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            # Fichier supprimé ou tronqué: l'entrée est ignorée puis réécrite
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self.stats['hits'] += 1
+            self.stats['octets_servis'] += len(body)
+        return status_code, body.decode('utf-8')
+
+    def put(self, url, status_code, text):
+        """Stocker une réponse (compressée) puis évincer les moins récemment lues si besoin"""
+        key = url_key(url)
+        data = zlib.compress(text.encode('utf-8'), 6)
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Écriture atomique: un lecteur concurrent ne voit jamais un fichier partiel
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT taille FROM responses WHERE cle = ?", (key,)).fetchone()
+            self._conn.execute('''
+                INSERT INTO responses (cle, url, status_code, taille, stocke_le, dernier_acces)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cle) DO UPDATE SET
+                    url = excluded.url, status_code = excluded.status_code, taille = excluded.taille,
+                    stocke_le = excluded.stocke_le, dernier_acces = excluded.dernier_acces
+            ''', (key, normalize_url(url), status_code, len(data), now, now))
+            self.total_bytes += len(data) - (previous[0] if previous else 0)
+            self.stats['stockes'] += 1
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def delete(self, url):
+        """Retirer une réponse du cache (page de blocage servie en 200, par exemple)"""
+        key = url_key(url)
+        with self._lock:
+            row = self._conn.execute("SELECT taille FROM responses WHERE cle = ?", (key,)).fetchone()
+            if row is None:
+                return False
+            self._remove(key, row[0])
+            self._conn.commit()
+        return True
+
+    def cached_urls(self, limit=None):
+        """URLs des réponses 200 en cache, les plus récentes d'abord (corpus de pages enregistrées)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM responses WHERE status_code = 200 ORDER BY stocke_le DESC LIMIT ?",
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _evict(self):
+        """Supprimer les entrées les moins récemment lues jusqu'à 90% de la taille maximale"""
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT cle, taille FROM responses ORDER BY dernier_acces").fetchall()
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self._remove(key, size)
+            self.stats['evinces'] += 1
+
+    def _remove(self, key, size):
+        """Supprimer une entrée et son corps (verrou tenu par l'appelant)"""
+        self._conn.execute("DELETE FROM responses WHERE cle = ?", (key,))
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+        self.total_bytes -= size
+
+    def report(self):
+        """Afficher hits/misses de l'exécution et occupation du cache"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        if not lookups and not self.stats['stockes']:
+            return
+        hit_rate = self.stats['hits'] / lookups * 100 if lookups else 0.0
+        mode = " (replay)" if self.replay else ""
+        print(f"\n💾 CACHE HTTP{mode}: {self.stats['hits']} hits / {self.stats['misses']} misses ({hit_rate:.1f}%)")
+        print(f"  • Expirés: {self.stats['expires']}, stockés: {self.stats['stockes']}, évincés: {self.stats['evinces']}")
+        print(f"  • Servis depuis le disque: {self.stats['octets_servis'] / 1024:.0f} Ko")
+        print(f"  • Occupation: {self.total_bytes / 1024 / 1024:.1f} / {self.max_bytes / 1024 / 1024:.0f} Mo ({self.cache_dir})")
+
+
+_default_cache = None
+
+
+def get_http_cache():
+    """Cache par défaut, ouvert une seule fois par processus"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HttpResponseCache()
+    return _default_cache
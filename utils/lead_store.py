@@ -0,0 +1,458 @@
+import glob
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from config.settings import RESOLUTION_NEGATIVE_TTL_DAYS
+
+# Colonnes association communes aux différentes étapes
+ASSOCIATION_COLUMNS = [
+    'rna_id', 'nom', 'ville', 'code_postal', 'adresse', 'objet', 'secteur_code',
+    'secteur_nom', 'segment_campagne', 'departement', 'date_publication', 'source'
+]
+
+# Fichiers produits par les étapes avant la base (importés une seule fois)
+LEGACY_CONTACT_PATTERNS = [
+    "data/rna_with_contacts_*.csv",
+    "data/smart_contacts_*.csv",
+    "data/modern_contacts_*.csv",
+    "data/rna_emails_clean_*.csv",
+]
+
+# Étapes de la chaîne RNA (processeur RNA, scraper de contacts et ses anciens fichiers
+# rna_with_contacts_*): les fichiers de campagne RNA ne reprennent que leurs contacts
+RNA_CONTACT_ETAPES = ('rna_processor', 'rna_contact_scraper', 'rna_with_contacts')
+
+# Seul un email de l'association elle-même clôt définitivement la recherche;
+# un site, un téléphone ou un email de mairie seuls ('partial') expirent comme un échec
+DEFINITIVE_CONTACT_TYPES = ('', 'Association')
+
+
+def association_key(nom, ville):
+    """Clé de déduplication nom + ville (minuscules, espaces normalisés)"""
+    def normalize(value):
+        value = '' if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value)
+        return re.sub(r'\s+', ' ', value.lower()).strip()
+    return f"{normalize(nom)}_{normalize(ville)}"
+
+
+def _text(value):
+    """Valeur texte pour la base ('' pour None / NaN / 'nan')"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    value = str(value).strip()
+    return '' if value == 'nan' else value
+
+
+class LeadStore:
+    """Base SQLite unique des associations, tentatives de recherche et contacts
+
+    Remplace l'échange de fichiers CSV horodatés entre étapes: chaque étape
+    enregistre ses résultats au fil de l'eau, les consolidateurs interrogent
+    la base (requêtes indexées) au lieu de relire tous les fichiers.
+    """
+
+    def __init__(self, db_path="data/leads.db", negative_ttl_days=RESOLUTION_NEGATIVE_TTL_DAYS):
+        self.db_path = db_path
+        self.negative_ttl = timedelta(days=negative_ttl_days)
+        self.init_database()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """Initialiser la base de données SQLite"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        with closing(self._connect()) as conn:
+            # WAL: lectures pendant qu'une étape écrit (workers, consolidateurs)
+            conn.execute("PRAGMA journal_mode=WAL")
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS associations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cle TEXT UNIQUE NOT NULL,
+                    rna_id TEXT DEFAULT '',
+                    nom TEXT NOT NULL,
+                    ville TEXT DEFAULT '',
+                    code_postal TEXT DEFAULT '',
+                    adresse TEXT DEFAULT '',
+                    objet TEXT DEFAULT '',
+                    secteur_code TEXT DEFAULT '',
+                    secteur_nom TEXT DEFAULT '',
+                    segment_campagne TEXT DEFAULT '',
+                    departement TEXT DEFAULT '',
+                    date_publication TEXT DEFAULT '',
+                    source TEXT DEFAULT '',
+                    statut_recherche TEXT DEFAULT 'pending',
+                    date_maj TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS search_attempts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    association_id INTEGER NOT NULL,
+                    etape TEXT NOT NULL,
+                    methode TEXT DEFAULT '',
+                    statut TEXT NOT NULL,
+                    date_tentative TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (association_id) REFERENCES associations (id)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    association_id INTEGER NOT NULL,
+                    email TEXT DEFAULT '',
+                    telephone TEXT DEFAULT '',
+                    site_web TEXT DEFAULT '',
+                    facebook TEXT DEFAULT '',
+                    contact_type TEXT DEFAULT 'Association',
+                    etape TEXT DEFAULT '',
+                    methode TEXT DEFAULT '',
+                    date_extraction TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (association_id, email, telephone, site_web),
+                    FOREIGN KEY (association_id) REFERENCES associations (id)
+                )
+            ''')
+
+            # Résultat courant par association, consulté par tous les finders avant
+            # toute requête: un email de l'association est définitif, le reste expire
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS resolutions (
+                    association_id INTEGER PRIMARY KEY,
+                    statut TEXT NOT NULL,
+                    email TEXT DEFAULT '',
+                    telephone TEXT DEFAULT '',
+                    site_web TEXT DEFAULT '',
+                    contact_type TEXT DEFAULT '',
+                    etape TEXT DEFAULT '',
+                    methode TEXT DEFAULT '',
+                    date_resolution TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expire_le TIMESTAMP,
+                    FOREIGN KEY (association_id) REFERENCES associations (id)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    chemin TEXT PRIMARY KEY,
+                    mtime_ns INTEGER,
+                    lignes INTEGER,
+                    date_import TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Base antérieure au cache de résolution: reprise des contacts et échecs connus
+            if cursor.execute("SELECT COUNT(*) FROM resolutions").fetchone()[0] == 0:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO resolutions (association_id, statut, email, telephone, site_web,
+                                                       contact_type, etape, methode, date_resolution, expire_le)
+                    SELECT association_id, 'found', email, telephone, site_web, contact_type, etape, methode,
+                           date_extraction, NULL
+                    FROM contacts WHERE id IN (SELECT MAX(id) FROM contacts GROUP BY association_id)
+                ''')
+                cursor.execute('''
+                    INSERT OR IGNORE INTO resolutions (association_id, statut, date_resolution, expire_le)
+                    SELECT id, 'not_found', date_maj, datetime(date_maj, ?)
+                    FROM associations WHERE statut_recherche = 'not_found'
+                ''', (f"+{self.negative_ttl.days} days",))
+
+            # Contacts partiels (site, téléphone, email de mairie) enregistrés comme définitifs
+            # par les versions précédentes: ils expirent comme un échec
+            cursor.execute(f'''
+                UPDATE resolutions SET statut = 'partial', expire_le = datetime(date_resolution, ?)
+                WHERE statut = 'found'
+                  AND (email = '' OR contact_type NOT IN ({', '.join('?' * len(DEFINITIVE_CONTACT_TYPES))}))
+            ''', (f"+{self.negative_ttl.days} days", *DEFINITIVE_CONTACT_TYPES))
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_associations_rna_id ON associations (rna_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_attempts_association ON search_attempts (association_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_association ON contacts (association_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email)")
+
+            conn.commit()
+
+    # ----- Écriture -----
+
+    def _upsert_association(self, cursor, association):
+        """Insérer ou compléter une association, retourne son id"""
+        values = {column: _text(association.get(column)) for column in ASSOCIATION_COLUMNS}
+        # Formats des finders: titre / nom_association, libcom, adr1, date_publi
+        values['nom'] = values['nom'] or _text(association.get('nom_association')) or _text(association.get('titre'))
+        values['ville'] = values['ville'] or _text(association.get('libcom'))
+        values['adresse'] = values['adresse'] or _text(association.get('adr1'))
+        values['code_postal'] = values['code_postal'] or _text(association.get('adrs_codepostal'))
+        values['rna_id'] = values['rna_id'] or _text(association.get('id'))
+        values['date_publication'] = (values['date_publication'] or _text(association.get('date_publi'))
+                                      or _text(association.get('date_creation')))
+        values['secteur_nom'] = values['secteur_nom'] or _text(association.get('secteur'))
+
+        cle = association_key(values['nom'], values['ville'])
+        columns = ', '.join(['cle'] + ASSOCIATION_COLUMNS)
+        placeholders = ', '.join('?' * (len(ASSOCIATION_COLUMNS) + 1))
+        # Valeurs déjà connues conservées, champs vides complétés
+        updates = ', '.join(
+            f"{column} = CASE WHEN {column} = '' THEN excluded.{column} ELSE {column} END"
+            for column in ASSOCIATION_COLUMNS
+        )
+
+        cursor.execute(f'''
+            INSERT INTO associations ({columns}) VALUES ({placeholders})
+            ON CONFLICT (cle) DO UPDATE SET {updates}, date_maj = CURRENT_TIMESTAMP
+        ''', [cle] + [values[column] for column in ASSOCIATION_COLUMNS])
+
+        return cursor.execute("SELECT id FROM associations WHERE cle = ?", (cle,)).fetchone()[0]
+
+    def save_associations(self, associations):
+        """Enregistrer un lot d'associations (liste de dicts ou DataFrame)"""
+        if isinstance(associations, pd.DataFrame):
+            associations = associations.to_dict('records')
+
+        with closing(self._connect()) as conn:
+            cursor = conn.cursor()
+            for association in associations:
+                self._upsert_association(cursor, association)
+            conn.commit()
+
+        return len(associations)
+
+    def record_search(self, association, etape, statut, methode='', contacts=None):
+        """Enregistrer une tentative de recherche et les contacts trouvés
+
+        contacts: dict (email / email_principal, telephone / phone,
+        site_web / website, facebook, contact_type), None si rien trouvé.
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.cursor()
+            association_id = self._upsert_association(cursor, association)
+
+            cursor.execute(
+                "INSERT INTO search_attempts (association_id, etape, methode, statut) VALUES (?, ?, ?, ?)",
+                (association_id, etape, methode, statut)
+            )
+            cursor.execute(
+                "UPDATE associations SET statut_recherche = ? WHERE id = ? AND statut_recherche != 'found'",
+                (statut, association_id)
+            )
+
+            contact = None
+            if contacts:
+                contact = {
+                    'email': _text(contacts.get('email') or contacts.get('email_principal')).lower(),
+                    'telephone': _text(contacts.get('telephone') or contacts.get('phone')),
+                    'site_web': _text(contacts.get('site_web') or contacts.get('website')),
+                    'facebook': _text(contacts.get('facebook')),
+                }
+                if any(contact.values()):
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO contacts
+                            (association_id, email, telephone, site_web, facebook, contact_type, etape, methode, date_extraction)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        association_id, contact['email'], contact['telephone'], contact['site_web'],
+                        contact['facebook'], _text(contacts.get('contact_type')) or 'Association', etape,
+                        methode, _text(contacts.get('date_extraction')) or datetime.now().strftime('%Y-%m-%d %H:%M')
+                    ))
+
+            self._record_resolution(cursor, association_id, etape, statut, methode, contact,
+                                    _text((contacts or {}).get('contact_type')))
+
+            conn.commit()
+            return association_id
+
+    def _record_resolution(self, cursor, association_id, etape, statut, methode, contact, contact_type):
+        """Mettre à jour le cache de résolution
+
+        'found' (définitif) pour un email de l'association; 'partial' (expire
+        comme un échec) pour un site, un téléphone ou un email de mairie seuls.
+        Un résultat moins complet n'écrase jamais un contact définitif.
+        """
+        now = datetime.now()
+        if statut == 'found' and contact and any(contact.values()):
+            definitive = bool(contact['email']) and contact_type in DEFINITIVE_CONTACT_TYPES
+            cursor.execute('''
+                INSERT INTO resolutions (association_id, statut, email, telephone, site_web, contact_type,
+                                         etape, methode, date_resolution, expire_le)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (association_id) DO UPDATE SET
+                    statut = excluded.statut, email = excluded.email, telephone = excluded.telephone,
+                    site_web = excluded.site_web, contact_type = excluded.contact_type, etape = excluded.etape,
+                    methode = excluded.methode, date_resolution = excluded.date_resolution,
+                    expire_le = excluded.expire_le
+                WHERE resolutions.statut != 'found' OR excluded.statut = 'found'
+            ''', (association_id, 'found' if definitive else 'partial', contact['email'], contact['telephone'],
+                  contact['site_web'], contact_type or 'Association', etape, methode,
+                  now.strftime('%Y-%m-%d %H:%M:%S'),
+                  None if definitive else (now + self.negative_ttl).strftime('%Y-%m-%d %H:%M:%S')))
+        else:
+            cursor.execute('''
+                INSERT INTO resolutions (association_id, statut, etape, methode, date_resolution, expire_le)
+                VALUES (?, 'not_found', ?, ?, ?, ?)
+                ON CONFLICT (association_id) DO UPDATE SET
+                    etape = excluded.etape, methode = excluded.methode,
+                    date_resolution = excluded.date_resolution, expire_le = excluded.expire_le
+                WHERE resolutions.statut != 'found'
+            ''', (association_id, etape, methode, now.strftime('%Y-%m-%d %H:%M:%S'),
+                  (now + self.negative_ttl).strftime('%Y-%m-%d %H:%M:%S')))
+
+    def record_contact(self, contact, etape):
+        """Enregistrer un contact au format des finders (nom_association, ville, email...)"""
+        return self.record_search(contact, etape, 'found', _text(contact.get('search_method')), contact)
+
+    def import_legacy_files(self, patterns=LEGACY_CONTACT_PATTERNS):
+        """Importer une fois les CSV de contacts produits avant la base
+
+        Un fichier n'est relu que s'il a été modifié depuis son import.
+        """
+        imported = 0
+        with closing(self._connect()) as conn:
+            known = {row['chemin']: row['mtime_ns'] for row in conn.execute("SELECT chemin, mtime_ns FROM imported_files")}
+
+        for pattern in patterns:
+            for path in sorted(glob.glob(pattern)):
+                mtime_ns = os.stat(path).st_mtime_ns
+                if known.get(path) == mtime_ns:
+                    continue
+
+                try:
+                    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+                except Exception as e:
+                    print(f"  ❌ Erreur {path}: {e}")
+                    continue
+
+                etape = re.sub(r'(_temp)?(_\d+)*\.csv$', '', os.path.basename(path))
+                for row in df.to_dict('records'):
+                    methode = row.get('search_method') or ', '.join(
+                        re.findall(r"'([^']+)'", row.get('contacts_sources', ''))
+                    )
+                    found = row.get('email') or row.get('email_principal') or row.get('site_web')
+                    self.record_search(row, etape, 'found' if found else 'not_found', methode, row if found else None)
+
+                with closing(self._connect()) as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO imported_files (chemin, mtime_ns, lignes) VALUES (?, ?, ?)",
+                        (path, mtime_ns, len(df))
+                    )
+                    conn.commit()
+
+                print(f"  📥 {os.path.basename(path)}: {len(df)} lignes importées")
+                imported += 1
+
+        return imported
+
+    # ----- Requêtes -----
+
+    def partition_resolved(self, associations):
+        """Séparer les associations à rechercher de celles déjà résolues
+
+        Recherche par RNA id, sinon par nom + commune normalisés. Les échecs
+        et contacts partiels dont l'expiration est passée sont à rechercher
+        de nouveau.
+        Retourne (a_rechercher, [(association, resolution), ...]).
+        """
+        if isinstance(associations, pd.DataFrame):
+            associations = associations.to_dict('records')
+
+        keys = []
+        for association in associations:
+            rna_id = _text(association.get('rna_id')) or _text(association.get('id'))
+            nom = (_text(association.get('nom')) or _text(association.get('nom_association'))
+                   or _text(association.get('titre')))
+            ville = _text(association.get('ville')) or _text(association.get('libcom'))
+            keys.append((rna_id, association_key(nom, ville)))
+
+        by_rna_id, by_cle = {}, {}
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with closing(self._connect()) as conn:
+            for column, values, target in (
+                ('rna_id', sorted({k[0] for k in keys if k[0]}), by_rna_id),
+                ('cle', sorted({k[1] for k in keys}), by_cle),
+            ):
+                # Requêtes IN par paquets (limite de variables SQLite)
+                for start in range(0, len(values), 500):
+                    chunk = values[start:start + 500]
+                    rows = conn.execute(f'''
+                        SELECT a.{column} AS valeur, r.*
+                        FROM resolutions r JOIN associations a ON a.id = r.association_id
+                        WHERE a.{column} IN ({', '.join('?' * len(chunk))})
+                          AND (r.expire_le IS NULL OR r.expire_le > ?)
+                    ''', chunk + [now]).fetchall()
+                    for row in rows:
+                        target[row['valeur']] = dict(row)
+
+        pending, resolved = [], []
+        for association, (rna_id, cle) in zip(associations, keys):
+            resolution = by_rna_id.get(rna_id) if rna_id else None
+            resolution = resolution or by_cle.get(cle)
+            if resolution:
+                resolved.append((association, resolution))
+            else:
+                pending.append(association)
+        return pending, resolved
+
+    @staticmethod
+    def _contact_filter(etapes=None, contact_types=None, alias='c'):
+        """Condition SQL (et paramètres nommés) restreignant les contacts à des étapes / types"""
+        conditions, params = [], {}
+        for column, values, prefix in (('etape', etapes, 'etape'), ('contact_type', contact_types, 'type')):
+            if values is None:
+                continue
+            names = [f"{prefix}{i}" for i in range(len(values))]
+            params.update(zip(names, values))
+            placeholders = ', '.join(f":{name}" for name in names) or "NULL"
+            conditions.append(f"{alias}.{column} IN ({placeholders})")
+        return ''.join(f" AND {condition}" for condition in conditions), params
+
+    def associations_with_contacts(self, etapes=None, contact_types=None):
+        """Associations ayant au moins un contact, avec leur contact le plus récent
+
+        etapes / contact_types: contacts retenus (None: toutes les étapes, tous les types).
+        """
+        where, params = self._contact_filter(etapes, contact_types)
+        query = f'''
+            SELECT a.*,
+                (SELECT email FROM contacts c WHERE c.association_id = a.id AND c.email != ''{where}
+                 ORDER BY c.id DESC LIMIT 1) AS email_principal,
+                (SELECT telephone FROM contacts c WHERE c.association_id = a.id AND c.telephone != ''{where}
+                 ORDER BY c.id DESC LIMIT 1) AS telephone,
+                (SELECT site_web FROM contacts c WHERE c.association_id = a.id AND c.site_web != ''{where}
+                 ORDER BY c.id DESC LIMIT 1) AS site_web,
+                (SELECT facebook FROM contacts c WHERE c.association_id = a.id AND c.facebook != ''{where}
+                 ORDER BY c.id DESC LIMIT 1) AS facebook,
+                (SELECT group_concat(DISTINCT c.methode) FROM contacts c WHERE c.association_id = a.id
+                 AND c.methode != ''{where}) AS contacts_sources
+            FROM associations a
+            WHERE EXISTS (SELECT 1 FROM contacts c WHERE c.association_id = a.id{where})
+            ORDER BY a.id
+        '''
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=params).fillna('')
+
+    def email_contacts(self, etapes=None, contact_types=None):
+        """Un contact par email (premier trouvé), avec les informations de l'association
+
+        etapes / contact_types: contacts retenus (None: toutes les étapes, tous les types).
+        """
+        where, params = self._contact_filter(etapes, contact_types, alias='contacts')
+        query = f'''
+            SELECT a.nom AS nom_association, a.ville, c.email, a.objet, a.adresse, a.code_postal,
+                   c.contact_type, a.date_publication AS date_creation, a.source,
+                   c.methode AS search_method, c.date_extraction, a.secteur_nom AS secteur,
+                   c.telephone, c.site_web, a.departement, a.secteur_code, a.rna_id, c.etape
+            FROM contacts c
+            JOIN associations a ON a.id = c.association_id
+            WHERE c.id IN (SELECT MIN(id) FROM contacts WHERE email != ''{where} GROUP BY email)
+            ORDER BY c.id
+        '''
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query, conn, params=params).fillna('')
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from config.settings import RESOLUTION_NEGATIVE_TTL_DAYS
+
+# Type de service de l'Annuaire de l'administration retenu pour une commune
+MAIRIE_SERVICE_TYPE = 'mairie'
+
+
+def commune_key(code_insee, ville=''):
+    """Code INSEE sur 5 caractères, sinon nom de commune normalisé (préfixe 'nom:')"""
+    code = str(code_insee or '').strip().upper()
+    if code and code != 'NAN':
+        return code.zfill(5)
+    ville = unicodedata.normalize('NFKD', str(ville or '')).encode('ascii', 'ignore').decode()
+    ville = re.sub(r'[^a-z0-9]+', ' ', ville.lower()).strip()
+    return f"nom:{ville}" if ville else ''
+
+
+def _json_field(value):
+    """Champs de l'export open data: liste, ou chaîne JSON selon la version du fichier"""
+    if isinstance(value, str) and value[:1] in '[{':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _first_text(value, key='valeur'):
+    value = _json_field(value)
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get(key, '')
+    return '' if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value).strip()
+
+
+class MairieIndex:
+    """Index commune (code INSEE) -> email et site de la mairie
+
+    Rempli une seule fois par commune: en masse depuis l'export open data de
+    l'Annuaire de l'administration (load_annuaire), sinon par la recherche
+    de repli des finders. Chargé en mémoire: consultation en O(1).
+    Une commune sans email trouvé est recherchée de nouveau après expiration.
+    """
+
+    def __init__(self, db_path="data/mairie_index.db", negative_ttl_days=RESOLUTION_NEGATIVE_TTL_DAYS):
+        self.db_path = db_path
+        self.negative_ttl = timedelta(days=negative_ttl_days)
+        self.stats = {'hits': 0, 'recherches': 0}
+        self._lock = threading.Lock()
+        self._commune_locks = {}
+        self.init_database()
+        self._entries = self._load_entries()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """Initialiser la base de données SQLite"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS mairies (
+                    commune TEXT PRIMARY KEY,
+                    nom_commune TEXT DEFAULT '',
+                    email TEXT DEFAULT '',
+                    site_web TEXT DEFAULT '',
+                    source TEXT DEFAULT '',
+                    date_maj TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def _load_entries(self):
+        with closing(self._connect()) as conn:
+            return {row['commune']: dict(row) for row in conn.execute("SELECT * FROM mairies")}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, code_insee, ville=''):
+        """Entrée de la commune (dict email, site_web, source, date_maj), None si inconnue ou expirée"""
+        entry = self._entries.get(commune_key(code_insee, ville))
+        if entry is None:
+            return None
+        if not entry['email'] and not entry['site_web']:
+            # Échec de recherche: retenté après expiration
+            if datetime.now() - datetime.strptime(entry['date_maj'], '%Y-%m-%d %H:%M:%S') > self.negative_ttl:
+                return None
+        return entry
+
+    def record(self, code_insee, ville, email='', site_web='', source='recherche'):
+        """Enregistrer la mairie d'une commune (email vide: aucun résultat)"""
+        key = commune_key(code_insee, ville)
+        if not key:
+            return None
+        entry = {
+            'commune': key, 'nom_commune': str(ville or ''), 'email': (email or '').lower(),
+            'site_web': site_web or '', 'source': source,
+            'date_maj': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        with self._lock:
+            with closing(self._connect()) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO mairies (commune, nom_commune, email, site_web, source, date_maj)
+                    VALUES (:commune, :nom_commune, :email, :site_web, :source, :date_maj)
+                ''', entry)
+                conn.commit()
+            self._entries[key] = entry
+        return entry
+
+    def get_or_search(self, code_insee, ville, search):
+        """Entrée de la commune, `search()` -> (email, site_web) appelé au plus une fois par commune
+
+        Un verrou par commune: deux associations de la même commune traitées
+        en parallèle ne déclenchent qu'une recherche.
+        """
+        key = commune_key(code_insee, ville)
+        with self._lock:
+            commune_lock = self._commune_locks.setdefault(key, threading.Lock())
+
+        with commune_lock:
+            entry = self.lookup(code_insee, ville)
+            if entry is not None:
+                with self._lock:
+                    self.stats['hits'] += 1
+                return entry
+
+            with self._lock:
+                self.stats['recherches'] += 1
+            email, site_web = search()
+            return self.record(code_insee, ville, email or '', site_web or '') or {'email': email or '', 'site_web': site_web or ''}
+
+    def load_annuaire(self, path):
+        """Précharger les mairies depuis l'export de l'Annuaire de l'administration
+
+        Formats acceptés: JSON (liste d'objets ou {"service": [...]}) ou CSV
+        (séparateur ';'). Champs utilisés: pivot (type_service_local,
+        code_insee_commune), adresse_courriel, site_internet, nom.
+        """
+        if path.endswith('.csv'):
+            records = pd.read_csv(path, sep=';', dtype=str, keep_default_na=False).to_dict('records')
+        else:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            records = data.get('service', []) if isinstance(data, dict) else data
+
+        rows = {}
+        for record in records:
+            pivots = _json_field(record.get('pivot')) or []
+            if isinstance(pivots, dict):
+                pivots = [pivots]
+            codes = [
+                code
+                for pivot in pivots if isinstance(pivot, dict) and pivot.get('type_service_local') == MAIRIE_SERVICE_TYPE
+                for code in (_json_field(pivot.get('code_insee_commune')) or [])
+            ]
+            if not codes:
+                continue
+
+            email = _first_text(record.get('adresse_courriel')).lower()
+            site_web = _first_text(record.get('site_internet'))
+            nom = str(record.get('nom', '')).replace('Mairie - ', '').strip()
+            for code in codes:
+                key = commune_key(code)
+                # Plusieurs mairies pour un code (communes déléguées): la première avec email
+                if key in rows and rows[key]['email']:
+                    continue
+                rows[key] = {'commune': key, 'nom_commune': nom, 'email': email, 'site_web': site_web}
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        entries = [{**row, 'source': 'annuaire', 'date_maj': now} for row in rows.values()]
+        with self._lock:
+            with closing(self._connect()) as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO mairies (commune, nom_commune, email, site_web, source, date_maj)
+                    VALUES (:commune, :nom_commune, :email, :site_web, :source, :date_maj)
+                ''', entries)
+                conn.commit()
+            self._entries.update({entry['commune']: entry for entry in entries})
+
+        with_email = sum(1 for entry in entries if entry['email'])
+        print(f"🏛️ Annuaire: {len(entries)} mairies chargées ({with_email} avec email) depuis {path}")
+        return len(entries)
+
+    def report(self):
+        """Afficher l'utilisation de l'index pendant l'exécution"""
+        if self.stats['hits'] or self.stats['recherches']:
+            print(f"\n🏛️ INDEX MAIRIES: {self.stats['hits']} depuis l'index, "
+                  f"{self.stats['recherches']} recherches ({len(self)} communes connues)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Préchargement de l'index des mairies")
+    parser.add_argument('annuaire', help="export JSON ou CSV de l'Annuaire de l'administration")
+    parser.add_argument('--db', default="data/mairie_index.db")
+    args = parser.parse_args()
+
+    MairieIndex(args.db).load_annuaire(args.annuaire)
+
+
+if __name__ == "__main__":
+    main()
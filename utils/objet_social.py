@@ -0,0 +1,101 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_NOMENCLATURE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "objet_social_nomenclature.csv"
+)
+
+# Catégories dérivées, dans l'ordre des colonnes de la table
+CATEGORY_COLUMNS = ['secteur_nom', 'segment_campagne', 'type_association', 'secteur']
+
+# Valeurs pour un code absent de la nomenclature
+UNKNOWN_CATEGORIES = {'secteur_nom': 'Autre', 'segment_campagne': '', 'type_association': '', 'secteur': ''}
+
+
+class ObjetSocialNomenclature:
+    """Nomenclature des objets sociaux RNA chargée une fois en table de correspondance
+
+    Codes normalisés sans zéros de tête (011035 -> 11035). Un code absent de
+    la table est rattaché à son thème (11999 -> 11000). Les colonnes
+    objet_social1 puis objet_social2 sont essayées dans cet ordre.
+    """
+
+    def __init__(self, path=DEFAULT_NOMENCLATURE_PATH):
+        self.path = path
+        table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        table['code'] = self.normalize_codes(table['code'])
+        self.table = table.set_index('code')
+        self._categories = {
+            code: dict(zip(CATEGORY_COLUMNS, values))
+            for code, values in zip(self.table.index, self.table[CATEGORY_COLUMNS].values.tolist())
+        }
+
+        with open(path, 'rb') as f:
+            self.version = hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def normalize_code(code):
+        """'011035', '11035.0', ' 11035 ' -> '11035'"""
+        if code is None or (not isinstance(code, str) and pd.isna(code)):
+            return ''
+        code = str(code).strip()
+        if code.endswith('.0'):
+            code = code[:-2]
+        return code.lstrip('0') if code.isdigit() else ''
+
+    @classmethod
+    def normalize_codes(cls, codes):
+        codes = pd.Series(codes)
+        codes_index, uniques = pd.factorize(codes, use_na_sentinel=False)
+        normalized = np.array([cls.normalize_code(code) for code in uniques], dtype=object)
+        return pd.Series(normalized[codes_index], index=codes.index)
+
+    def categories(self, code, code2=''):
+        """Catégories d'une association (dict secteur_nom, segment_campagne...)"""
+        for candidate in (self.normalize_code(code), self.normalize_code(code2)):
+            if not candidate:
+                continue
+            if candidate in self._categories:
+                return self._categories[candidate]
+            theme = candidate[:-3] + '000' if len(candidate) > 3 else ''
+            if theme in self._categories:
+                return self._categories[theme]
+        return UNKNOWN_CATEGORIES
+
+    def map_codes(self, codes1, codes2=None):
+        """Catégories de toute une colonne: une résolution par couple de codes bruts distinct
+
+        Retourne un DataFrame aligné sur codes1 (colonnes CATEGORY_COLUMNS).
+        """
+        codes1 = pd.Series(codes1)
+        index1, uniques1 = pd.factorize(codes1, use_na_sentinel=False)
+        if codes2 is not None:
+            index2, uniques2 = pd.factorize(pd.Series(codes2), use_na_sentinel=False)
+        else:
+            index2, uniques2 = np.zeros(len(codes1), dtype=np.intp), np.array([''], dtype=object)
+
+        # Couple (code1, code2) encodé en un entier puis factorisé
+        pair_codes, unique_pairs = pd.factorize(index1 * len(uniques2) + index2)
+        resolved = pd.DataFrame(
+            [self.categories(uniques1[pair // len(uniques2)], uniques2[pair % len(uniques2)])
+             for pair in unique_pairs],
+            columns=CATEGORY_COLUMNS
+        )
+        return pd.DataFrame(
+            {column: resolved[column].values[pair_codes] for column in CATEGORY_COLUMNS},
+            index=codes1.index
+        )
+
+
+_default_nomenclature = None
+
+
+def get_nomenclature():
+    """Nomenclature par défaut, chargée une seule fois par processus"""
+    global _default_nomenclature
+    if _default_nomenclature is None:
+        _default_nomenclature = ObjetSocialNomenclature()
+    return _default_nomenclature
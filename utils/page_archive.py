@@ -0,0 +1,165 @@
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+
+from utils.http_cache import normalize_url, url_key
+
+# Variables d'environnement: enregistrer un lancement réel, ou le rejouer sans réseau
+RECORD_ENV = 'PAGE_ARCHIVE_RECORD'
+REPLAY_ENV = 'PAGE_ARCHIVE_REPLAY'
+# Pages écrites entre deux vidages: un arrêt brutal en perd au plus autant
+RECORD_FLUSH_EVERY = 50
+
+
+def read_pages(path):
+    """Pages d'une archive (générateur), jusqu'à la première donnée illisible
+
+    Un lancement interrompu laisse un membre gzip tronqué: la lecture
+    s'arrête là, les pages précédentes restent lisibles.
+    """
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Ligne tronquée (lancement interrompu)
+                    continue
+    except (EOFError, OSError, zlib.error):
+        return
+
+
+def archive_is_intact(path):
+    """L'archive se décompresse-t-elle jusqu'au bout (aucun membre tronqué)?"""
+    try:
+        with gzip.open(path, 'rb') as f:
+            while f.read(1024 * 1024):
+                pass
+    except (EOFError, OSError, zlib.error):
+        return False
+    return True
+
+
+class PageRecorder:
+    """Enregistreur des pages téléchargées pendant un lancement réel
+
+    Une ligne JSON par page (URL, en-têtes de requête et de réponse, statut,
+    corps, date) dans une archive gzip (.jsonl.gz). L'archive est ouverte en
+    ajout: plusieurs lancements peuvent compléter le même corpus. Une archive
+    laissée tronquée par un arrêt brutal est d'abord réécrite avec ses pages
+    lisibles: sinon le membre tronqué, suivi des ajouts, rendrait illisibles
+    toutes les pages des lancements suivants.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path) and not archive_is_intact(path):
+            self._repair()
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+
+    def _repair(self):
+        """Réécrire l'archive avec ses pages lisibles (écriture atomique)"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        kept = 0
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for page in read_pages(self.path):
+                f.write(json.dumps(page, ensure_ascii=False) + '\n')
+                kept += 1
+        os.replace(tmp_path, self.path)
+        print(f"📼 Archive tronquée réparée: {kept} pages conservées ({self.path})")
+
+    def record(self, url, request_headers, status_code, response_headers, text):
+        line = json.dumps({
+            'url': normalize_url(url),
+            'request_headers': dict(request_headers or {}),
+            'status_code': status_code,
+            'response_headers': dict(response_headers or {}),
+            'body': text,
+            'date': time.time(),
+        }, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self.count += 1
+            if self.count % RECORD_FLUSH_EVERY == 0:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def report(self):
+        if self.count:
+            print(f"\n📼 ARCHIVE: {self.count} pages enregistrées dans {self.path}")
+
+
+class PageArchive:
+    """Pages enregistrées par PageRecorder, servies sans réseau (transport de rejeu)
+
+    Recherche par URL normalisée (comme le cache HTTP); pour une URL
+    enregistrée plusieurs fois, la dernière version l'emporte.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        self.stats = {'servies': 0, 'absentes': 0, 'octets_servis': 0}
+        self._lock = threading.Lock()
+        # Archive non refermée: les pages vidées avant l'arrêt restent lisibles
+        for page in read_pages(path):
+            self.pages[url_key(page['url'])] = page
+
+    def __len__(self):
+        return len(self.pages)
+
+    def get(self, url):
+        """Page enregistrée (dict: url, status_code, response_headers, body...) ou None"""
+        page = self.pages.get(url_key(url))
+        with self._lock:
+            if page is None:
+                self.stats['absentes'] += 1
+            else:
+                self.stats['servies'] += 1
+                self.stats['octets_servis'] += len(page['body'])
+        return page
+
+    def report(self):
+        """Afficher pages servies et absentes de l'archive"""
+        requested = self.stats['servies'] + self.stats['absentes']
+        if not requested:
+            return
+        print(f"\n📼 REJEU ({self.path}): {self.stats['servies']}/{requested} pages servies, "
+              f"{self.stats['absentes']} absentes de l'archive, {self.stats['octets_servis'] / 1024:.0f} Ko")
+
+
+_default_recorder = None
+_default_archive = None
+
+
+def get_page_recorder():
+    """Enregistreur partagé si PAGE_ARCHIVE_RECORD désigne une archive, sinon None"""
+    global _default_recorder
+    path = os.environ.get(RECORD_ENV)
+    if path and _default_recorder is None:
+        _default_recorder = PageRecorder(path)
+        atexit.register(_default_recorder.close)
+    return _default_recorder
+
+
+def get_replay_archive():
+    """Archive rejouée si PAGE_ARCHIVE_REPLAY désigne une archive, sinon None"""
+    global _default_archive
+    path = os.environ.get(REPLAY_ENV)
+    if path and _default_archive is None:
+        _default_archive = PageArchive(path)
+    return _default_archive
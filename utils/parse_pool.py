@@ -0,0 +1,234 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from config.settings import PARSE_BATCH_SIZE, PARSE_BATCH_WAIT_S, PARSE_QUEUE_MAX, PARSE_WORKERS
+
+# Utilisation moyenne des workers au-delà de laquelle l'analyse est le goulot
+CPU_BOUND_UTILIZATION = 0.8
+
+
+def _start_context():
+    """Démarrage des workers sans fork du processus courant
+
+    Le pool démarre quand la boucle asyncio et les threads réseau tournent
+    déjà: un fork copierait des verrous tenus par ces threads (blocage des
+    workers). forkserver, à défaut spawn (Windows, macOS).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _parse_batch(batch):
+    """Exécuté dans un processus worker: (pid, secondes de calcul, [(succès, résultat)])"""
+    started = time.perf_counter()
+    results = []
+    for func, html in batch:
+        try:
+            results.append((True, func(html)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return os.getpid(), time.perf_counter() - started, results
+
+
+class ParsePool:
+    """Analyse HTML dans un pool de processus, hors des threads qui font le réseau
+
+    submit(func, html) dépose une page dans une file bornée (PARSE_QUEUE_MAX
+    pages: l'appelant attend si elle est pleine) et retourne un Future. Un
+    thread de répartition regroupe les pages par lots (PARSE_BATCH_SIZE, ou
+    ce qui est arrivé en PARSE_BATCH_WAIT_S) et au plus deux lots par worker
+    sont en cours: la mémoire reste bornée. Chaque résultat est rendu dès la
+    fin de son lot. func doit être une fonction de module (extract_page,
+    find_emails...). workers=0: analyse dans le thread appelant.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, batch_size=PARSE_BATCH_SIZE, queue_max=PARSE_QUEUE_MAX,
+                 batch_wait=PARSE_BATCH_WAIT_S):
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.stats = {'pages': 0, 'lots': 0, 'erreurs': 0, 'file_s': 0.0, 'bloque_s': 0.0}
+        self.worker_busy = {}
+        self._queue = queue.Queue(maxsize=max(1, queue_max))
+        self._slots = threading.Semaphore(max(1, workers) * 2)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._dispatcher = None
+        self._started = None
+
+    def _start(self):
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            self._started = time.perf_counter()
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=_start_context())
+            self._dispatcher = threading.Thread(target=self._dispatch, name='parse-pool', daemon=True)
+            self._dispatcher.start()
+
+    def submit(self, func, html):
+        """Déposer une page à analyser: Future de func(html)"""
+        future = Future()
+        if not self.workers:
+            self._run_inline(future, func, html)
+            return future
+
+        self._start()
+        started = time.perf_counter()
+        self._queue.put((func, html, future, started))
+        blocked = time.perf_counter() - started
+        with self._lock:
+            self.stats['bloque_s'] += blocked
+        return future
+
+    def run(self, func, html):
+        """Analyse bloquante (depuis un worker réseau): func(html) calculé dans un processus"""
+        return self.submit(func, html).result()
+
+    def map(self, func, pages):
+        """Analyser une suite de pages; les résultats sont rendus dans l'ordre des pages"""
+        futures = deque()
+        for html in pages:
+            futures.append(self.submit(func, html))
+            # Rendre ce qui est prêt au fil de l'eau (la file bornée freine la lecture des pages)
+            while futures and futures[0].done():
+                yield futures.popleft().result()
+        for future in futures:
+            yield future.result()
+
+    def _run_inline(self, future, func, html):
+        if self._started is None:
+            self._started = time.perf_counter()
+        pid, busy, [(ok, value)] = _parse_batch([(func, html)])
+        self._account(pid, busy, 1, 0.0, 0 if ok else 1)
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(RuntimeError(value))
+
+    def _next_batch(self):
+        """Lot suivant: bloque sur la première page, puis complète pendant batch_wait"""
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.perf_counter() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Fin demandée: ce lot part, puis on s'arrête
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._slots.acquire()
+            dispatched = time.perf_counter()
+            waited = sum(dispatched - item[3] for item in batch)
+            try:
+                future = self._executor.submit(_parse_batch, [(func, html) for func, html, _, _ in batch])
+            except Exception as e:
+                self._slots.release()
+                for _, _, result, _ in batch:
+                    result.set_exception(e)
+                continue
+            future.add_done_callback(lambda done, batch=batch, waited=waited: self._deliver(batch, waited, done))
+
+    def _deliver(self, batch, waited, done):
+        self._slots.release()
+        try:
+            pid, busy, results = done.result()
+        except Exception as e:
+            # Worker perdu (mémoire, signal): tout le lot échoue
+            self._account(None, 0.0, len(batch), waited, len(batch))
+            for _, _, result, _ in batch:
+                result.set_exception(e)
+            return
+        errors = sum(1 for ok, _ in results if not ok)
+        self._account(pid, busy, len(batch), waited, errors)
+        for (_, _, result, _), (ok, value) in zip(batch, results):
+            if ok:
+                result.set_result(value)
+            else:
+                result.set_exception(RuntimeError(value))
+
+    def _account(self, pid, busy, pages, waited, errors):
+        with self._lock:
+            self.stats['pages'] += pages
+            self.stats['lots'] += 1
+            self.stats['erreurs'] += errors
+            self.stats['file_s'] += waited
+            if pid is not None:
+                self.worker_busy[pid] = self.worker_busy.get(pid, 0.0) + busy
+
+    def utilization(self):
+        """Part du temps écoulé passée à analyser, par worker (pid -> 0..1)"""
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        with self._lock:
+            return {pid: busy / elapsed if elapsed else 0.0 for pid, busy in self.worker_busy.items()}
+
+    def close(self):
+        """Terminer les lots en cours et arrêter les processus"""
+        if self._dispatcher is not None:
+            self._queue.put(None)
+            self._dispatcher.join()
+            self._executor.shutdown(wait=True)
+            self._dispatcher = None
+            self._executor = None
+
+    def report(self):
+        """Afficher pages analysées, attente en file et utilisation par worker (réseau ou CPU?)"""
+        stats = self.stats
+        if not stats['pages']:
+            return
+        utilization = self.utilization()
+        workers = self.workers or 1
+        mean = sum(utilization.values()) / workers
+        mode = f"{self.workers} processus" if self.workers else "dans le thread appelant"
+        print(f"\n🧮 ANALYSE HTML ({mode}):")
+        print(f"  • {stats['pages']} pages en {stats['lots']} lots ({stats['pages'] / stats['lots']:.1f} pages/lot), "
+              f"{stats['erreurs']} erreurs")
+        print(f"  • Attente en file: {stats['file_s'] / stats['pages'] * 1000:.1f} ms/page; "
+              f"producteurs bloqués (file pleine): {stats['bloque_s']:.1f}s")
+        for index, (pid, share) in enumerate(sorted(utilization.items()), 1):
+            print(f"  • Worker {index} (pid {pid}): {share:.0%} occupé")
+        if not self.workers:
+            return
+        # Diagnostic sur l'occupation des workers seule: une file pleine avec des workers
+        # peu occupés traduit le coût des échanges entre processus, pas un manque de CPU
+        blocked_share = stats['bloque_s'] / max(time.perf_counter() - self._started, 1e-9)
+        if mean >= CPU_BOUND_UTILIZATION:
+            print(f"  ⚠️ Limité par le CPU ({mean:.0%} d'occupation moyenne): augmenter PARSE_WORKERS")
+        elif blocked_share > 0.1:
+            print(f"  ⚠️ Limité par les échanges entre processus ({mean:.0%} d'occupation moyenne, "
+                  f"file pleine {blocked_share:.0%} du temps): PARSE_WORKERS=0 analyse sur place")
+        else:
+            print(f"  ✅ Limité par le réseau ({mean:.0%} d'occupation moyenne des workers)")
+
+
+_default_pool = None
+
+
+def get_parse_pool():
+    """Pool d'analyse partagé par les finders d'un même processus (arrêté à la sortie)"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ParsePool()
+        atexit.register(_default_pool.close)
+    return _default_pool
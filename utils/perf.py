@@ -0,0 +1,108 @@
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente (RSS) du processus en Mo, None si indisponible"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+        if sys.platform == 'darwin':
+            return peak / (1024 * 1024)
+        return peak / 1024
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+class ThroughputMeter:
+    """Mesure du débit (lignes/seconde) et du pic mémoire d'un traitement"""
+
+    def __init__(self, label="traitement"):
+        self.label = label
+        self.rows = 0
+        self.kept = 0
+        self.chunks = 0
+        self.start = time.perf_counter()
+
+    def add(self, rows, kept=0):
+        """Comptabiliser un bloc traité"""
+        self.rows += rows
+        self.kept += kept
+        self.chunks += 1
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        """Résumé chiffré du traitement"""
+        peak = peak_rss_mb()
+        return {
+            'Lignes lues': self.rows,
+            'Lignes conservées': self.kept,
+            'Blocs': self.chunks,
+            'Durée': f"{self.elapsed:.2f}s",
+            'Débit': f"{self.rows_per_second:,.0f} lignes/s",
+            'Pic RSS': f"{peak:.1f} Mo" if peak is not None else "indisponible"
+        }
+
+    def report(self):
+        """Afficher le résumé"""
+        print(f"\n⚡ PERFORMANCES {self.label.upper()}:")
+        for key, value in self.summary().items():
+            print(f"  • {key}: {value}")
+
+
+def records_memory_bytes(records):
+    """Taille mémoire d'une liste de dicts, chaque objet partagé compté une fois"""
+    seen = set()
+    total = sys.getsizeof(records)
+
+    for record in records:
+        total += sys.getsizeof(record)
+        for item in record.items():
+            for value in item:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+
+    return total
+
+
+def frame_memory_bytes(df):
+    """Taille mémoire d'un DataFrame, chaînes partagées comptées une fois
+
+    memory_usage(deep=True) compte chaque cellule objet séparément, même
+    quand plusieurs lignes pointent vers la même chaîne.
+    """
+    total = int(df.index.memory_usage(deep=True))
+    seen = set()
+
+    for column in df.columns:
+        values = df[column]
+        if values.dtype != object:
+            total += int(values.memory_usage(deep=True, index=False))
+            continue
+
+        total += values.values.nbytes  # pointeurs
+        for value in values.values:
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+
+    return total
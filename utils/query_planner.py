@@ -0,0 +1,219 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+from config.settings import QUERY_HOPELESS_PROBABILITY, QUERY_SECTOR_PRIOR_WEIGHT, QUERY_STOP_PROBABILITY
+from utils.objet_social import get_nomenclature
+
+
+def association_sector(association):
+    """Secteur d'une association pour les statistiques de requêtes ('' si inconnu)"""
+    secteur = association.get('secteur_nom')
+    if not secteur:
+        secteur = get_nomenclature().categories(
+            association.get('secteur_code', association.get('objet_social1')),
+            association.get('objet_social2')
+        )['secteur_nom']
+    return '' if not isinstance(secteur, str) or secteur == 'Autre' else secteur
+
+
+class QueryPlan:
+    """Requêtes d'une association, ordonnées par taux de réussite historique
+
+    Itérer sur le plan donne des couples (modèle, requête); l'itération
+    s'arrête d'elle-même quand la probabilité qu'un modèle restant trouve
+    l'email gagnant passe sous le seuil. Appeler record() après chaque
+    requête puis finish() avec l'email retenu.
+    """
+
+    def __init__(self, planner, queries, secteur):
+        self.planner = planner
+        self.queries = queries
+        self.secteur = secteur
+        self.emails_by_template = {}
+
+    def __iter__(self):
+        for index, (template, query) in enumerate(self.queries):
+            if index and self.planner.adaptive and self._should_stop(index):
+                return
+            yield template, query
+
+    def _should_stop(self, index):
+        remaining = [template for template, _ in self.queries[index:]]
+        found = any(self.emails_by_template.values())
+        threshold = QUERY_STOP_PROBABILITY if found else QUERY_HOPELESS_PROBABILITY
+        return self.planner.success_probability(self.secteur, remaining) < threshold
+
+    def record(self, template, emails):
+        """Emails trouvés par la requête d'un modèle"""
+        self.emails_by_template[template] = [email.lower() for email in emails or []]
+
+    def finish(self, best_email=None):
+        """Fin de recherche: le modèle gagnant est le premier à avoir trouvé best_email"""
+        winner = None
+        if best_email:
+            winner = next((template for template, emails in self.emails_by_template.items()
+                           if best_email.lower() in emails), None)
+        self.planner.update(self.secteur, list(self.emails_by_template), winner)
+        return winner
+
+
+class QueryPlanner:
+    """Apprentissage du rendement des modèles de requêtes, par finder et par secteur
+
+    Pour chaque modèle: nombre d'essais et nombre de fois où il a trouvé
+    l'email retenu, globalement et par secteur (le taux global sert d'a
+    priori au taux du secteur). Les modèles sont essayés du meilleur taux
+    au moins bon. adaptive=False garde l'ordre fixe sans arrêt anticipé
+    (mesure de référence) tout en alimentant les statistiques.
+    """
+
+    def __init__(self, finder, db_path="data/query_stats.db", adaptive=True):
+        self.finder = finder
+        self.db_path = db_path
+        self.adaptive = adaptive
+        self.run_stats = {'associations': 0, 'requetes': 0, 'trouvees': 0}
+        self._lock = threading.Lock()
+        self.init_database()
+        self._stats = self._load_stats()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        """Initialiser la base de données SQLite"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS template_stats (
+                    finder TEXT NOT NULL,
+                    secteur TEXT NOT NULL,
+                    template TEXT NOT NULL,
+                    essais INTEGER DEFAULT 0,
+                    gagnants INTEGER DEFAULT 0,
+                    PRIMARY KEY (finder, secteur, template)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS query_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    finder TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    associations INTEGER,
+                    requetes INTEGER,
+                    trouvees INTEGER,
+                    date_run TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def _load_stats(self):
+        with closing(self._connect()) as conn:
+            return {
+                (row['secteur'], row['template']): [row['essais'], row['gagnants']]
+                for row in conn.execute("SELECT * FROM template_stats WHERE finder = ?", (self.finder,))
+            }
+
+    def hit_rate(self, secteur, template):
+        """Probabilité que le modèle trouve l'email retenu (lissée, a priori global)"""
+        tries, wins = self._stats.get(('', template), (0, 0))
+        global_rate = (wins + 1) / (tries + 2)
+        if not secteur:
+            return global_rate
+        tries, wins = self._stats.get((secteur, template), (0, 0))
+        return (wins + QUERY_SECTOR_PRIOR_WEIGHT * global_rate) / (tries + QUERY_SECTOR_PRIOR_WEIGHT)
+
+    def success_probability(self, secteur, templates):
+        """Probabilité qu'au moins un des modèles trouve l'email retenu"""
+        with self._lock:
+            miss = 1.0
+            for template in templates:
+                miss *= 1.0 - self.hit_rate(secteur, template)
+        return 1.0 - miss
+
+    def plan(self, queries, secteur='', limit=None):
+        """Plan de recherche depuis des couples (modèle, requête) dans l'ordre par défaut
+
+        limit: nombre maximal de requêtes, appliqué après le tri.
+        """
+        queries = list(queries)
+        if self.adaptive:
+            with self._lock:
+                # Tri stable: à taux égal, l'ordre par défaut est conservé
+                queries.sort(key=lambda item: -self.hit_rate(secteur, item[0]))
+        return QueryPlan(self, queries[:limit], secteur)
+
+    def update(self, secteur, templates, winner):
+        """Enregistrer les modèles essayés pour une association et le gagnant"""
+        rows = []
+        with self._lock:
+            for scope in {'', secteur}:
+                for template in templates:
+                    stats = self._stats.setdefault((scope, template), [0, 0])
+                    stats[0] += 1
+                    stats[1] += int(template == winner)
+                    rows.append((self.finder, scope, template, 1, int(template == winner)))
+            self.run_stats['associations'] += 1
+            self.run_stats['requetes'] += len(templates)
+            self.run_stats['trouvees'] += int(winner is not None)
+
+            with closing(self._connect()) as conn:
+                conn.executemany('''
+                    INSERT INTO template_stats (finder, secteur, template, essais, gagnants)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(finder, secteur, template) DO UPDATE SET
+                        essais = essais + excluded.essais,
+                        gagnants = gagnants + excluded.gagnants
+                ''', rows)
+                conn.commit()
+
+    def save_run(self):
+        """Enregistrer le nombre moyen de requêtes du lancement (comparaison avant/après)"""
+        if not self.run_stats['associations']:
+            return
+        with closing(self._connect()) as conn:
+            conn.execute('''
+                INSERT INTO query_runs (finder, mode, associations, requetes, trouvees)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (self.finder, 'adaptatif' if self.adaptive else 'fixe', self.run_stats['associations'],
+                  self.run_stats['requetes'], self.run_stats['trouvees']))
+            conn.commit()
+
+    def _mode_totals(self, conn, mode):
+        return conn.execute('''
+            SELECT COUNT(*) AS lancements, SUM(associations) AS associations,
+                   SUM(requetes) AS requetes, SUM(trouvees) AS trouvees
+            FROM query_runs WHERE finder = ? AND mode = ?
+        ''', (self.finder, mode)).fetchone()
+
+    def report(self):
+        """Requêtes par association et par contact trouvé: lancement, ordre fixe, ordre appris"""
+        run = self.run_stats
+        if not run['associations']:
+            return
+        print(f"\n📉 REQUÊTES PAR ASSOCIATION ({self.finder}):")
+        mode = 'adaptatif' if self.adaptive else 'fixe'
+        print(f"  • Ce lancement ({mode}): {run['requetes'] / run['associations']:.2f} requêtes/association, "
+              f"{run['requetes'] / max(run['trouvees'], 1):.2f} requêtes/contact trouvé")
+
+        with closing(self._connect()) as conn:
+            for label, mode in (("Avant (ordre fixe)", 'fixe'), ("Après (ordre appris)", 'adaptatif')):
+                totals = self._mode_totals(conn, mode)
+                if not totals['associations']:
+                    print(f"  • {label}: aucun lancement enregistré")
+                    continue
+                print(f"  • {label}: {totals['requetes'] / totals['associations']:.2f} requêtes/association, "
+                      f"{totals['requetes'] / max(totals['trouvees'], 1):.2f} requêtes/contact trouvé "
+                      f"({totals['lancements']} lancements, {totals['associations']} associations)")
+
+        with self._lock:
+            best = sorted(
+                ((template, stats) for (scope, template), stats in self._stats.items() if scope == ''),
+                key=lambda item: -self.hit_rate('', item[0])
+            )[:3]
+        for template, (tries, wins) in best:
+            print(f"    ↳ {template}: {wins}/{tries} gagnants")
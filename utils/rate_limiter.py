@@ -0,0 +1,144 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from config.settings import (RATE_BACKOFF_MAX_FACTOR, RATE_BACKOFF_MAX_S, RATE_RECOVERY_FACTOR,
+                             RATE_RETRY_AFTER_MAX_S, SEARCH_DEFAULT_HOST_LIMIT, SEARCH_HOST_LIMITS)
+
+# Statuts signalant un hôte surchargé ou qui nous limite
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value, max_delay=RATE_RETRY_AFTER_MAX_S):
+    """Délai en secondes d'un en-tête Retry-After (secondes, même décimales, ou date HTTP)
+
+    Borné à [0, max_delay]: un en-tête hostile ou erroné ne suspend pas un
+    hôte pendant des heures. None si absent ou illisible.
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    if delay != delay:
+        # NaN
+        return None
+    return min(max(0.0, delay), max_delay)
+
+
+class TokenBucket:
+    """Seau à jetons: `rate` jetons/s, au plus `burst` d'avance
+
+    Réservation: un jeton est pris tout de suite, le seau pouvant passer en
+    négatif; reserve() retourne le temps à attendre avant d'utiliser le
+    jeton. Un hôte inactif ne fait donc jamais attendre.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now=None):
+        now = time.monotonic() if now is None else now
+        if not self.rate:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class HostRateState:
+    """Seau d'un hôte et ralentissement courant (facteur appliqué au débit nominal)"""
+
+    def __init__(self, rate, burst):
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.factor = 1.0
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    """Limiteur de débit partagé: un seau à jetons par hôte, ralenti sur 429/503/timeout
+
+    Sur 429/503 ou timeout, le débit de l'hôte est divisé par deux (jusqu'à
+    RATE_BACKOFF_MAX_FACTOR) et l'hôte suspendu pendant le Retry-After, à
+    défaut un délai exponentiel. Chaque succès rapproche le débit de sa
+    valeur nominale (RATE_RECOVERY_FACTOR). Utilisable depuis des threads
+    (wait) comme depuis asyncio (reserve puis asyncio.sleep).
+    """
+
+    def __init__(self, host_limits=None, default_limit=None):
+        self.host_limits = dict(SEARCH_HOST_LIMITS if host_limits is None else host_limits)
+        self.default_limit = dict(default_limit or SEARCH_DEFAULT_HOST_LIMIT)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            limit = self.host_limits.get(host, self.default_limit)
+            state = self._hosts[host] = HostRateState(limit.get('rate', 0), limit.get('burst', 1))
+        return state
+
+    def reserve(self, host):
+        """Réserver une requête sur l'hôte: secondes à attendre avant de l'envoyer"""
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            delay = state.bucket.reserve(now)
+            return max(delay, state.blocked_until - now)
+
+    def wait(self, host):
+        """Attente bloquante (threads) avant une requête; retourne le temps attendu"""
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    @staticmethod
+    def is_throttled(status_code=0, error=''):
+        """429/503 ou timeout: l'hôte doit être ralenti"""
+        error = (error or '').lower()
+        return status_code in THROTTLE_STATUSES or 'timed out' in error or 'timeout' in error
+
+    def feedback(self, host, status_code=0, error='', retry_after=None):
+        """Résultat d'une requête: ajuste le débit; True si l'hôte demande de ralentir"""
+        throttled = self.is_throttled(status_code, error)
+        with self._lock:
+            state = self._state(host)
+            if throttled:
+                state.factor = min(state.factor * 2, RATE_BACKOFF_MAX_FACTOR)
+                pause = None if retry_after is None else min(retry_after, RATE_RETRY_AFTER_MAX_S)
+                if pause is None:
+                    # Délai exponentiel: intervalle nominal (1s si hôte illimité) x facteur
+                    pause = min(state.factor / (state.base_rate or 1.0), RATE_BACKOFF_MAX_S)
+                state.blocked_until = max(state.blocked_until, time.monotonic() + pause)
+            elif state.factor > 1.0:
+                state.factor = max(1.0, state.factor * RATE_RECOVERY_FACTOR)
+            if state.base_rate:
+                state.bucket.rate = state.base_rate / state.factor
+        return throttled
+
+    def current_rate(self, host):
+        """Débit actuel de l'hôte (requêtes/s), après ralentissements"""
+        with self._lock:
+            return self._state(host).bucket.rate
+
+
+_default_limiter = None
+
+
+def get_rate_limiter():
+    """Limiteur partagé par tous les moteurs et scrapers d'un même processus"""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = RateLimiter()
+    return _default_limiter
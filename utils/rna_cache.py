@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Version du format de lecture brute (paramètres read_csv)
+RAW_FORMAT_VERSION = "1"
+
+
+class RnaTableCache:
+    """Cache colonnaire (Arrow IPC / Feather) des tables RNA par département
+
+    Deux tables par département:
+    - raw: le fichier RNA parsé (toutes colonnes en texte)
+    - cleaned: le résultat de RnaAssociationProcessor.clean_rna_dataframe
+
+    Chaque entrée est indexée par l'empreinte SHA-256 du fichier source et par la
+    version du code qui l'a produite: un fichier RNA mis à jour ou un nettoyage
+    modifié invalide automatiquement l'entrée correspondante. Seules les
+    versions précédentes d'un même fichier source sont supprimées.
+    """
+
+    def __init__(self, cache_dir=os.path.join("data", "cache", "rna")):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "hash_index.json")
+        self.enabled = feather is not None
+        self._hash_index = None
+
+        if not self.enabled:
+            print("⚠️ pyarrow absent: cache RNA désactivé (lecture CSV à chaque appel)")
+
+    def file_hash(self, filepath):
+        """Empreinte SHA-256 du fichier (mémorisée tant que taille et date sont inchangées)"""
+        stat = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        index = self._load_hash_index()
+
+        entry = index.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+
+        index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+        self._save_hash_index()
+        return index[key]['sha256']
+
+    def load_raw(self, filepath, departement=None, columns=None):
+        """Table RNA brute (colonnes texte), parsée une seule fois par version du fichier"""
+        return self._load_or_build(
+            'raw', filepath, departement, RAW_FORMAT_VERSION,
+            lambda: pd.read_csv(filepath, encoding='utf-8', dtype=str),
+            columns=columns
+        )
+
+    def load_cleaned(self, filepath, processor, departement=None, columns=None):
+        """Table RNA nettoyée par processor.clean_rna_dataframe
+
+        Sans département explicite ni déductible du nom de fichier, le
+        département est calculé ligne par ligne (fichier national).
+        """
+        departement = departement or self._guess_departement(filepath)
+        clean_departement = None if departement == 'all' else departement
+        df = self._load_or_build(
+            'cleaned', filepath, departement, processor.cleaning_code_version(),
+            lambda: processor.clean_rna_dataframe(self.load_raw(filepath, departement), clean_departement),
+            columns=columns
+        )
+        if 'date_extraction' in df.columns:
+            df['date_extraction'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        return df
+
+    def _load_or_build(self, kind, filepath, departement, version, builder, columns=None):
+        """Lire l'entrée de cache ou la construire puis l'enregistrer"""
+        if not self.enabled:
+            df = builder()
+            return df[columns] if columns else df
+
+        departement = departement or self._guess_departement(filepath)
+        # Une série d'entrées par fichier source: deux fichiers du même département
+        # (ou deux fichiers nationaux 'all') ne s'évincent pas l'un l'autre
+        source = hashlib.sha256(os.path.abspath(filepath).encode('utf-8')).hexdigest()[:8]
+        prefix = f"{kind}_dpt{departement}_{source}_"
+        cache_path = os.path.join(
+            self.cache_dir, f"{prefix}{self.file_hash(filepath)[:16]}_{version[:12]}.feather"
+        )
+
+        if os.path.exists(cache_path):
+            try:
+                table = feather.read_table(cache_path, columns=columns, memory_map=True)
+                return table.to_pandas()
+            except Exception as e:
+                print(f"⚠️ Cache RNA illisible ({e}), reconstruction")
+
+        df = builder().reset_index(drop=True)
+        self._write(df, cache_path, prefix)
+        return df[columns] if columns else df
+
+    def _write(self, df, cache_path, prefix):
+        """Écriture atomique de l'entrée et suppression des versions périmées du même fichier source"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+
+        try:
+            # Non compressé: lecture par memory-map sans décompression
+            df.to_feather(tmp_path, compression='uncompressed')
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"⚠️ Écriture cache RNA impossible: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(prefix) and path != cache_path:
+                os.remove(path)
+
+    @staticmethod
+    def _guess_departement(filepath):
+        """Département déduit du nom de fichier (..._dpt_01.csv), 'all' sinon"""
+        match = re.search(r'dpt_?(\w{2,3})', os.path.basename(filepath))
+        return match.group(1) if match else 'all'
+
+    def _load_hash_index(self):
+        if self._hash_index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._hash_index = json.load(f)
+            except (OSError, ValueError):
+                self._hash_index = {}
+        return self._hash_index
+
+    def _save_hash_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Écriture atomique: plusieurs processus (workers) peuvent partager l'index
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._hash_index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
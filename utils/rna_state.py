@@ -0,0 +1,91 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+# Statuts RNA suivis d'un instantané à l'autre
+STATUT_ACTIVE = 'active'
+STATUT_DISSOUTE = 'dissoute'
+STATUT_RETIREE = 'retiree'
+# Nettoyée mais pas encore recherchée (limite max_searches, erreur): reprise au passage suivant
+STATUT_EN_ATTENTE = 'en_attente'
+
+
+class RnaIngestionState:
+    """Mémoire des associations RNA déjà ingérées (SQLite)
+
+    Une ligne par identifiant RNA et par périmètre (département ou 'all'):
+    dates de mise à jour et de publication vues au dernier traitement, statut.
+    """
+
+    def __init__(self, db_path="data/rna_ingestion.db"):
+        self.db_path = db_path
+        self.init_database()
+
+    def init_database(self):
+        """Initialiser la base de données SQLite"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rna_ingestion (
+                departement TEXT NOT NULL,
+                rna_id TEXT NOT NULL,
+                date_maj TEXT,
+                date_publi TEXT,
+                statut TEXT DEFAULT 'active',
+                premiere_vue TIMESTAMP,
+                derniere_vue TIMESTAMP,
+                PRIMARY KEY (departement, rna_id)
+            )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def load(self, departement):
+        """État connu d'un périmètre: DataFrame rna_id, date_maj, date_publi, statut"""
+        conn = sqlite3.connect(self.db_path)
+        df = pd.read_sql_query(
+            "SELECT rna_id, date_maj, date_publi, statut FROM rna_ingestion WHERE departement = ?",
+            conn, params=(departement,)
+        )
+        conn.close()
+        return df.fillna('')
+
+    def record(self, departement, snapshot, statuts):
+        """Enregistrer les versions traitées (snapshot: rna_id, date_maj, date_publi)
+
+        statuts: Series statut indexée comme snapshot. Appelé une fois le
+        traitement du delta terminé, pour qu'une interruption le rejoue.
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = zip(
+            [departement] * len(snapshot), snapshot['rna_id'], snapshot['date_maj'],
+            snapshot['date_publi'], statuts, [now] * len(snapshot), [now] * len(snapshot)
+        )
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany('''
+            INSERT INTO rna_ingestion (departement, rna_id, date_maj, date_publi, statut, premiere_vue, derniere_vue)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (departement, rna_id) DO UPDATE SET
+                date_maj = excluded.date_maj,
+                date_publi = excluded.date_publi,
+                statut = excluded.statut,
+                derniere_vue = excluded.derniere_vue
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+    def mark(self, departement, rna_ids, statut):
+        """Changer le statut d'identifiants existants (ex: retirés du RNA)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany(
+            "UPDATE rna_ingestion SET statut = ? WHERE departement = ? AND rna_id = ?",
+            [(statut, departement, rna_id) for rna_id in rna_ids]
+        )
+        conn.commit()
+        conn.close()
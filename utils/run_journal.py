@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from utils.lead_store import association_key
+
+
+def journal_key(association):
+    """Identifiant d'une association dans le journal: RNA id, sinon nom + ville normalisés"""
+    rna_id = association.get('rna_id') or association.get('id')
+    if isinstance(rna_id, str) and rna_id.strip():
+        return rna_id.strip()
+    nom = association.get('nom') or association.get('nom_association') or association.get('titre')
+    ville = association.get('ville') or association.get('libcom')
+    return association_key(nom, ville)
+
+
+class RunJournal:
+    """Journal JSONL d'une étape de recherche, en ajout seul
+
+    Une ligne {"type": "run"} par lancement (paramètres), puis une ligne par
+    association terminée. Chaque ajout est écrit et synchronisé sur disque
+    (O(1), pas de réécriture du fichier de résultats): après un arrêt brutal,
+    --resume reprend le dernier lancement en sautant les associations déjà
+    journalisées (sauf celles en erreur). Une dernière ligne tronquée par le
+    crash est ignorée, et terminée avant l'ajout suivant.
+    """
+
+    def __init__(self, stage, journal_dir="data/journals"):
+        self.stage = stage
+        self.path = os.path.join(journal_dir, f"{stage}.jsonl")
+        self._lock = threading.Lock()
+        self._tail_checked = False
+        os.makedirs(journal_dir, exist_ok=True)
+
+    def _append(self, record):
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                if not self._tail_checked:
+                    # Ligne tronquée par un crash: la terminer, sinon l'ajout y serait collé et perdu
+                    line = self._tail_separator() + line
+                    self._tail_checked = True
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _tail_separator(self):
+        """Saut de ligne à écrire avant le premier ajout si le fichier ne finit pas par un"""
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if not f.tell():
+                return b''
+            f.seek(-1, os.SEEK_END)
+            return b'' if f.read(1) == b'\n' else b'\n'
+
+    def start_run(self, params):
+        """Nouveau lancement: paramètres conservés pour --resume"""
+        self._append({'type': 'run', 'params': params, 'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+
+    def record(self, association, statut, result=None):
+        """Journaliser le résultat d'une association ('found' / 'not_found' / 'error')"""
+        self._append({
+            'type': 'association', 'cle': journal_key(association), 'statut': statut,
+            'result': result, 'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        })
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Ligne partielle (arrêt pendant l'écriture)
+                    continue
+        return records
+
+    def last_run(self):
+        """(paramètres, enregistrements) du dernier lancement, (None, []) sans journal"""
+        records = self._read()
+        starts = [i for i, record in enumerate(records) if record.get('type') == 'run']
+        if not starts:
+            return None, []
+        return records[starts[-1]]['params'], records[starts[-1] + 1:]
+
+    def resume(self):
+        """Paramètres du dernier lancement, clés déjà traitées et résultats trouvés
+
+        Les associations en erreur (timeout, blocage passager) ne comptent pas
+        comme traitées: elles sont retentées à la reprise.
+        """
+        params, records = self.last_run()
+        done = {record['cle'] for record in records if record.get('statut') != 'error'}
+        found = [record['result'] for record in records if record['statut'] == 'found' and record.get('result')]
+        if params is not None:
+            print(f"📒 Reprise {self.stage}: {len(done)} associations déjà traitées, {len(found)} trouvées ({self.path})")
+        return params, done, found
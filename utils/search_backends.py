@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import quote_plus
+
+from config.settings import (SEARCH_BACKEND_COOLDOWN_S, SEARCH_BACKEND_MAX_FAILURES, SEARCH_BACKEND_WINDOW,
+                             SEARCH_BACKENDS)
+
+# Pages de blocage (captcha, trafic inhabituel) servies avec un statut 200
+BLOCK_MARKERS = ('captcha', 'unusual traffic', 'trafic inhabituel', 'detected unusual')
+
+
+def is_block_page(text):
+    """Page de blocage (captcha, trafic inhabituel) d'après le début du HTML"""
+    head = (text or '')[:5000].lower()
+    return any(marker in head for marker in BLOCK_MARKERS)
+
+
+class SearchBackend:
+    """Moteur de recherche interrogeable par URL (Google, Bing, Qwant...)"""
+
+    def __init__(self, name, url_template, label=None):
+        self.name = name
+        self.url_template = url_template
+        self.label = label or name.title()
+
+    def build_url(self, query, max_results=10):
+        return self.url_template.format(query=quote_plus(query), max_results=max_results)
+
+
+BACKENDS = {backend.name: backend for backend in [
+    SearchBackend('google', "https://www.google.com/search?q={query}&num={max_results}"),
+    SearchBackend('bing', "https://www.bing.com/search?q={query}&count={max_results}"),
+    SearchBackend('qwant', "https://www.qwant.com/?q={query}&t=web&count={max_results}"),
+]}
+
+
+class BackendSelector:
+    """Choix du moteur par rendement observé (emails par seconde) sur une fenêtre glissante
+
+    Pour chaque moteur: emails extraits, latence, erreurs et blocages des
+    `window` dernières requêtes réseau (les réponses du cache ne comptent pas).
+    Un moteur encore peu essayé est prioritaire (exploration). Après
+    `max_failures` échecs consécutifs, un moteur est mis en pause, durée
+    doublée à chaque nouvelle série d'échecs: on cesse de payer les timeouts
+    d'un moteur mort. À la fin de la pause, il est réévalué.
+    """
+
+    def __init__(self, backends=None, window=SEARCH_BACKEND_WINDOW, min_samples=3,
+                 max_failures=SEARCH_BACKEND_MAX_FAILURES, cooldown=SEARCH_BACKEND_COOLDOWN_S, max_cooldown=1800.0):
+        backends = backends or [BACKENDS[name] for name in SEARCH_BACKENDS]
+        self.backends = {backend.name: backend for backend in backends}
+        self.window = window
+        self.min_samples = min_samples
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._outcomes = {name: deque(maxlen=window) for name in self.backends}
+        self._failures = {name: 0 for name in self.backends}
+        self._paused_until = {name: 0.0 for name in self.backends}
+        self._pauses = {name: 0 for name in self.backends}
+        self._totals = {name: {'requetes': 0, 'emails': 0, 'echecs': 0} for name in self.backends}
+
+    def _score(self, name):
+        outcomes = self._outcomes[name]
+        if len(outcomes) < self.min_samples:
+            return float('inf')
+        emails = sum(o[0] for o in outcomes)
+        latency = sum(o[1] for o in outcomes)
+        # Lissage: un moteur sans email garde un score faible mais non nul
+        return (emails + 0.1) / (latency + 1.0)
+
+    def ranked(self, exclude=()):
+        """Moteurs disponibles du meilleur au moins bon rendement attendu
+
+        Les moteurs en pause sont écartés, sauf si tous le sont: la recherche
+        continue alors sur ceux dont la pause se termine le plus tôt.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [name for name in self.backends if name not in exclude]
+            if any(self._paused_until[name] <= now for name in self.backends):
+                candidates = [name for name in candidates if self._paused_until[name] <= now]
+            return [self.backends[name] for name in sorted(
+                candidates,
+                key=lambda name: (max(self._paused_until[name], now), -self._score(name), len(self._outcomes[name]))
+            )]
+
+    def choose(self, exclude=()):
+        """Meilleur moteur hors `exclude`, None si aucun"""
+        ranked = self.ranked(exclude)
+        return ranked[0] if ranked else None
+
+    def record(self, name, emails, latency, failed=False):
+        """Enregistrer le résultat d'une requête réseau sur un moteur"""
+        with self._lock:
+            self._outcomes[name].append((emails, latency, failed))
+            totals = self._totals[name]
+            totals['requetes'] += 1
+            totals['emails'] += emails
+            if failed:
+                totals['echecs'] += 1
+                self._failures[name] += 1
+                if self._failures[name] >= self.max_failures:
+                    pause = min(self.cooldown * 2 ** self._pauses[name], self.max_cooldown)
+                    self._paused_until[name] = time.time() + pause
+                    self._pauses[name] += 1
+                    self._failures[name] = 0
+                    # Réessayé comme un moteur neuf à la fin de la pause
+                    self._outcomes[name].clear()
+                    print(f"        ⏸️ Moteur {name} mis en pause {pause:.0f}s (échecs répétés)")
+            else:
+                self._failures[name] = 0
+                self._pauses[name] = 0
+
+    @staticmethod
+    def is_failure(response):
+        """Erreur réseau, statut d'erreur ou page de blocage"""
+        if response.error or response.status_code != 200:
+            return True
+        return is_block_page(response.text)
+
+    def search(self, http, query, extract, headers=None, max_results=10, exclude=(), count=len, timeout=None):
+        """Requête sur le meilleur moteur: (moteur, extract(html)), (None, None) si aucun moteur
+
+        http: client exposant get(url, headers=...) (AsyncSearchEngine).
+        extract: html -> emails (ou contacts); None en cas d'échec ou de blocage.
+        count: nombre d'emails d'un résultat de extract, mesure du rendement.
+        """
+        backend = self.choose(exclude)
+        if backend is None:
+            return None, None
+
+        started = time.perf_counter()
+        response = http.get(backend.build_url(query, max_results), headers=headers, timeout=timeout)
+        latency = time.perf_counter() - started
+
+        failed = self.is_failure(response)
+        found = None if failed else extract(response.text)
+        if not getattr(response, 'from_cache', False):
+            self.record(backend.name, count(found) if found else 0, latency, failed)
+        return backend, found
+
+    def report(self):
+        """Afficher le rendement observé par moteur"""
+        with self._lock:
+            used = {name: totals for name, totals in self._totals.items() if totals['requetes']}
+            if not used:
+                return
+            print(f"\n🔀 MOTEURS DE RECHERCHE (rendement sur les {self.window} dernières requêtes):")
+            for name, totals in used.items():
+                outcomes = self._outcomes[name]
+                latency = sum(o[1] for o in outcomes) / len(outcomes) if outcomes else 0.0
+                score = self._score(name)
+                score_text = "exploration" if score == float('inf') else f"{score:.2f} emails/s"
+                paused = " ⏸️" if self._paused_until[name] > time.time() else ""
+                print(f"  • {name}: {totals['requetes']} requêtes, {totals['emails']} emails, "
+                      f"{totals['echecs']} échecs, {latency * 1000:.0f} ms, {score_text}{paused}")
+
+
+_default_selector = None
+
+
+def get_backend_selector():
+    """Sélecteur partagé par les finders d'un même processus"""
+    global _default_selector
+    if _default_selector is None:
+        _default_selector = BackendSelector()
+    return _default_selector
@@ -0,0 +1,195 @@
+import threading
+import time
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+from config.settings import (ROBOTS_CACHE_TTL_HOURS, SITE_CONTACT_HINTS, SITE_CONTACT_PATHS, SITE_CRAWL_MAX_PAGES,
+                             SITE_CRAWL_SKIP_HOSTS)
+from utils.html_extract import extract_page
+from utils.parse_pool import get_parse_pool
+
+# Jeton d'agent pour robots.txt: nos User-Agent de navigateur relèvent des règles génériques
+ROBOTS_USER_AGENT = '*'
+
+
+class RobotsCache:
+    """Règles robots.txt par site, téléchargées une fois (ROBOTS_CACHE_TTL_HOURS)
+
+    Comme le prévoit la RFC 9309: robots.txt absent (4xx) = tout est permis;
+    erreur serveur ou site injoignable = rien n'est permis. Le moteur peut
+    être donné à chaque appel (moteur du finder remplacé, rejeu).
+    """
+
+    def __init__(self, engine=None, ttl_hours=ROBOTS_CACHE_TTL_HOURS):
+        self.engine = engine
+        self.ttl = ttl_hours * 3600
+        self.stats = {'telecharges': 0, 'hits': 0, 'refus': 0}
+        self._rules = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, root, headers, engine):
+        response = engine.get(f"{root}/robots.txt", headers=headers)
+        parser = RobotFileParser()
+        if response.status_code == 200:
+            parser.parse(response.text.splitlines())
+        elif 400 <= response.status_code < 500:
+            parser.allow_all = True
+        else:
+            parser.disallow_all = True
+        return parser
+
+    def allowed(self, url, headers=None, engine=None):
+        """L'URL peut-elle être explorée selon le robots.txt de son site?"""
+        parts = urlsplit(url)
+        root = f"{parts.scheme}://{parts.netloc.lower()}"
+        now = time.time()
+        with self._lock:
+            cached = self._rules.get(root)
+        if cached is not None and cached[1] > now:
+            parser = cached[0]
+            with self._lock:
+                self.stats['hits'] += 1
+        else:
+            parser = self._fetch(root, headers, engine or self.engine)
+            with self._lock:
+                self._rules[root] = (parser, now + self.ttl)
+                self.stats['telecharges'] += 1
+
+        allowed = parser.can_fetch(ROBOTS_USER_AGENT, url)
+        if not allowed:
+            with self._lock:
+                self.stats['refus'] += 1
+        return allowed
+
+
+class SiteCrawlResult:
+    """Emails et téléphones trouvés sur un site, pages de contact d'abord"""
+
+    def __init__(self, emails=None, phones=None, pages=0, requests=0):
+        self.emails = emails or []
+        self.phones = phones or []
+        self.pages = pages
+        self.requests = requests
+
+
+class SiteCrawler:
+    """Exploration ciblée du site d'une association: accueil puis pages de contact probables
+
+    Au plus max_pages pages par site: l'accueil, puis en parallèle les liens
+    du même site dont l'adresse évoque un contact (contact, mentions
+    légales...), à défaut les chemins habituels. Le débit et
+    le parallélisme par domaine sont ceux du moteur (limites par hôte), le
+    robots.txt de chaque site est respecté et gardé en cache. Les pages
+    passent par l'extraction habituelle (extract_page, pool de processus).
+    crawl() reçoit le moteur courant du finder: un moteur remplacé après la
+    construction (rejeu hors ligne) est bien celui qui télécharge.
+    """
+
+    def __init__(self, engine=None, parser=None, robots=None, max_pages=SITE_CRAWL_MAX_PAGES,
+                 contact_paths=SITE_CONTACT_PATHS, skip_hosts=SITE_CRAWL_SKIP_HOSTS):
+        self.engine = engine
+        self.parser = parser or get_parse_pool()
+        self.robots = robots or RobotsCache(engine)
+        self.max_pages = max_pages
+        self.contact_paths = contact_paths
+        self.skip_hosts = skip_hosts
+        self.stats = {'sites': 0, 'requetes': 0, 'pages': 0, 'sites_avec_email': 0, 'ignores': 0}
+        self._lock = threading.Lock()
+
+    def should_crawl(self, url):
+        """Site propre à l'association (pas un annuaire ni un réseau social)"""
+        host = urlsplit(url).netloc.lower()
+        return url.startswith('http') and bool(host) and not any(skip in host for skip in self.skip_hosts)
+
+    @staticmethod
+    def _same_site(url, host):
+        return urlsplit(url).netloc.lower().removeprefix('www.') == host.removeprefix('www.')
+
+    def candidate_urls(self, start_url, links=()):
+        """Pages de contact probables: liens du site qui l'évoquent, à défaut chemins habituels"""
+        parts = urlsplit(start_url)
+        host = parts.netloc.lower()
+        root = urlunsplit((parts.scheme, parts.netloc, '/', '', ''))
+        start = start_url.rstrip('/')
+
+        hinted = []
+        for link in links:
+            url = urljoin(start_url, link).split('#')[0]
+            path = urlsplit(url).path.lower()
+            if self._same_site(url, host) and any(hint in path for hint in SITE_CONTACT_HINTS):
+                hinted.append(url)
+        # Chemins habituels devinés seulement si l'accueil ne mène à aucune page de contact
+        defaults = [] if hinted else [urljoin(root, path.lstrip('/')) for path in self.contact_paths]
+
+        candidates = []
+        seen = {start}
+        for url in hinted + defaults:
+            if url.rstrip('/') not in seen:
+                seen.add(url.rstrip('/'))
+                candidates.append(url)
+        return candidates
+
+    def _pages(self, responses):
+        """Extraction (pool de processus) des pages obtenues, dans l'ordre"""
+        futures = [self.parser.submit(extract_page, response.text) for response in responses
+                   if response.status_code == 200 and response.text]
+        pages = []
+        for future in futures:
+            try:
+                pages.append(future.result())
+            except Exception:
+                continue
+        return pages
+
+    def crawl(self, start_url, headers=None, engine=None):
+        """Explorer le site: SiteCrawlResult (emails des pages de contact d'abord)"""
+        engine = engine or self.engine
+        result = SiteCrawlResult()
+        if not self.should_crawl(start_url):
+            with self._lock:
+                self.stats['ignores'] += 1
+            return result
+        if not self.robots.allowed(start_url, headers, engine):
+            return result
+
+        home = engine.get(start_url, headers=headers)
+        result.requests += 1
+        if home.error or home.status_code >= 500:
+            # Site injoignable: inutile d'essayer ses autres pages
+            with self._lock:
+                self.stats['sites'] += 1
+                self.stats['requetes'] += result.requests
+            return result
+        home_pages = self._pages([home])
+        links = home_pages[0].hrefs if home_pages else []
+
+        urls = [url for url in self.candidate_urls(start_url, links)
+                if self.robots.allowed(url, headers, engine)][:max(self.max_pages - 1, 0)]
+        responses = engine.get_many(urls, headers=headers) if urls else []
+        result.requests += len(responses)
+
+        # Pages de contact avant l'accueil: leurs emails sont les plus fiables
+        pages = self._pages(responses) + home_pages
+        result.pages = len(pages)
+        for page in pages:
+            result.emails.extend(email for email in page.emails if email not in result.emails)
+            result.phones.extend(phone for phone in page.phones if phone not in result.phones)
+
+        with self._lock:
+            self.stats['sites'] += 1
+            self.stats['requetes'] += result.requests
+            self.stats['pages'] += result.pages
+            self.stats['sites_avec_email'] += int(bool(result.emails))
+        return result
+
+    def report(self):
+        """Afficher sites explorés, requêtes et rendement (emails par requête)"""
+        stats = self.stats
+        if not stats['sites'] and not stats['ignores']:
+            return
+        requests = max(stats['requetes'], 1)
+        print(f"\n🕸️ SITES D'ASSOCIATIONS: {stats['sites']} explorés, {stats['ignores']} ignorés (annuaires)")
+        print(f"  • {stats['requetes']} requêtes, {stats['pages']} pages, "
+              f"{stats['sites_avec_email']} sites avec email ({stats['sites_avec_email'] / requests:.2f} email/requête)")
+        print(f"  • robots.txt: {self.robots.stats['telecharges']} téléchargés, {self.robots.stats['hits']} en cache, "
+              f"{self.robots.stats['refus']} pages refusées")
@@ -0,0 +1,115 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Catalogue unique des mentions qui rendent un titre RNA inexploitable.
+# Chaque finder choisit ses mentions et leur position (n'importe où / en début).
+TITLE_RULES = {
+    'erreur': ['ERREUR', "ERREUR D'ENREGIST", 'ERREUR D'],
+    'renvoi': ['VOIR NUMERO', 'VOIR -', 'VOIR N°', 'VOIR NRO'],
+    'dissolution': ['DISSOL', 'DISSOLUTION', 'DISSOUTE', 'ASSOCIATION DISSOUTE'],
+    'fusion': ['FUSION'],
+    'transfert': ['TRANSFERT'],
+    'parenthese': ['('],
+}
+
+# Profils historiques des différents finders
+TITLE_PROFILES = {
+    # RnaAssociationProcessor.clean_rna_data
+    'rna': {
+        'contains': ['ERREUR', 'VOIR NUMERO', 'DISSOL'],
+        'prefixes': [],
+        'min_length': 5,
+        'max_special_ratio': None,
+    },
+    # ModernAssociationFinder.is_modern_association
+    'modern': {
+        'contains': ['ERREUR', 'VOIR NUMERO', 'VOIR -', 'VOIR N°', 'DISSOLUTION',
+                     'DISSOUTE', 'FUSION', 'TRANSFERT', 'ASSOCIATION DISSOUTE'],
+        'prefixes': [],
+        'min_length': 0,
+        'max_special_ratio': None,
+    },
+    # SmartContactFinderClean.is_valid_association
+    'clean': {
+        'contains': [],
+        'prefixes': ["ERREUR D'ENREGIST", 'VOIR NUMERO', 'VOIR -', 'VOIR N°', 'DISSOLUTION',
+                     'ASSOCIATION DISSOUTE', '(', 'ERREUR D', 'VOIR NRO', 'TRANSFERT', 'FUSION'],
+        'min_length': 3,
+        'max_special_ratio': 0.3,
+    },
+}
+
+# Caractères ni alphanumériques ni espace (équivalent de not isalnum() and != ' ')
+SPECIAL_CHAR_PATTERN = re.compile(r'[^\w ]|_')
+
+
+class TitleValidator:
+    """Validité des titres RNA: une regex compilée par profil, raison du rejet
+
+    Les mentions du profil sont regroupées en une seule expression à groupes
+    nommés (un groupe par raison); classify() traite une colonne entière en
+    n'évaluant chaque titre distinct qu'une fois.
+    """
+
+    def __init__(self, profile='rna'):
+        self.profile = profile
+        config = TITLE_PROFILES[profile]
+        self.min_length = config['min_length']
+        self.max_special_ratio = config['max_special_ratio']
+        self.pattern = self._compile(config['contains'], config['prefixes'])
+
+    @staticmethod
+    def _compile(contains, prefixes):
+        """Expression unique: (?P<raison>^(?:préfixes)|mentions)|..."""
+        groups = []
+        for reason, keywords in TITLE_RULES.items():
+            # Mentions les plus longues d'abord (ex: 'ERREUR D'ENREGIST' avant 'ERREUR D')
+            keywords = sorted(keywords, key=len, reverse=True)
+            alternatives = []
+            anchored = [re.escape(k) for k in keywords if k in prefixes]
+            if anchored:
+                alternatives.append('^(?:' + '|'.join(anchored) + ')')
+            alternatives += [re.escape(k) for k in keywords if k in contains]
+            if alternatives:
+                groups.append(f"(?P<{reason}>{'|'.join(alternatives)})")
+        return re.compile('|'.join(groups)) if groups else None
+
+    def reason(self, titre):
+        """Raison du rejet d'un titre ('' si le titre est valide)"""
+        if not isinstance(titre, str):
+            titre = '' if pd.isna(titre) else str(titre)
+        titre = titre.upper().strip()
+
+        if self.pattern is not None:
+            match = self.pattern.search(titre)
+            if match:
+                return match.lastgroup
+
+        if len(titre) < self.min_length:
+            return 'trop_court' if titre else 'vide'
+
+        if self.max_special_ratio is not None:
+            if len(SPECIAL_CHAR_PATTERN.findall(titre)) > len(titre) * self.max_special_ratio:
+                return 'caracteres_speciaux'
+
+        return ''
+
+    def is_valid(self, titre):
+        return self.reason(titre) == ''
+
+    def classify(self, titres):
+        """Raison du rejet pour toute une colonne ('' = valide)"""
+        codes, uniques = pd.factorize(titres, use_na_sentinel=False)
+        reasons = np.array([self.reason(titre) for titre in uniques], dtype=object)
+        return pd.Series(reasons[codes], index=titres.index)
+
+    def valid_mask(self, titres):
+        """Masque booléen des titres valides"""
+        return self.classify(titres) == ''
+
+    @staticmethod
+    def reason_counts(reasons):
+        """Nombre de titres rejetés par raison"""
+        return reasons[reasons != ''].value_counts().to_dict()